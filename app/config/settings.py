@@ -26,6 +26,7 @@ class Settings:
         self.PROCESSED_DIR = self.VIDEO_DIR / "processed"
         self.LOG_DIR = self.STORAGE_DIR / "logs"
         self.CREDENTIALS_DIR = self.STORAGE_DIR / "credentials"
+        self.STATE_DIR = self.STORAGE_DIR / "state"
         self.FFMPEG_DIR = self.BASE_DIR / "ffmpeg" / "bin"
         
         # FFmpeg Paths
@@ -35,16 +36,100 @@ class Settings:
         # Google API Settings
         self.GOOGLE_CREDS_PATH = self.CREDENTIALS_DIR / "google_creds.json"
         self.SPREADSHEET_ID = os.getenv("SPREADSHEET_ID")
+        # Spreadsheet writes are buffered and sent in batches
+        self.SHEETS_BATCH_SIZE = int(os.getenv("SHEETS_BATCH_SIZE", "100"))
+        self.SHEETS_FLUSH_INTERVAL = float(os.getenv("SHEETS_FLUSH_INTERVAL", "5"))
         self.DRIVE_FOLDER_ID = os.getenv("DRIVE_FOLDER_ID")
+        # Reuse identical files already in the folder, found via a cached index
+        self.DRIVE_DEDUPLICATE = os.getenv("DRIVE_DEDUPLICATE", "true").lower() == "true"
+        self.DRIVE_INDEX_REFRESH_INTERVAL = float(os.getenv("DRIVE_INDEX_REFRESH_INTERVAL", "300"))
         
         # YouTube Settings
         self.PLAYLIST_ID = os.getenv("PLAYLIST_ID")
+        # Reuse of extracted info for the download; stream URLs expire after a few hours
+        self.INFO_REUSE_TTL = int(os.getenv("INFO_REUSE_TTL", "3600"))
+        self.INFO_REUSE_MAX_ENTRIES = int(os.getenv("INFO_REUSE_MAX_ENTRIES", "256"))
+        
+        # Metadata Cache Settings (TTL of 0 disables the cache)
+        self.METADATA_CACHE_PATH = Path(os.getenv("METADATA_CACHE_PATH", str(self.STATE_DIR / "metadata_cache.db")))
+        self.METADATA_CACHE_TTL = int(os.getenv("METADATA_CACHE_TTL", "86400"))  # 1 day
+        self.METADATA_CACHE_MAX_ENTRIES = int(os.getenv("METADATA_CACHE_MAX_ENTRIES", "50000"))
+        self.METADATA_CACHE_MAX_BYTES = int(os.getenv("METADATA_CACHE_MAX_BYTES", "104857600"))  # 100MB
+        
+        # Local State Databases
+        self.JOB_DB_PATH = Path(os.getenv("JOB_DB_PATH", str(self.STATE_DIR / "jobs.db")))
+        self.LEDGER_DB_PATH = Path(os.getenv("LEDGER_DB_PATH", str(self.STATE_DIR / "ledger.db")))
+        self.RETENTION_DB_PATH = Path(os.getenv("RETENTION_DB_PATH", str(self.STATE_DIR / "retention.db")))
+        self.SHEETS_JOURNAL_PATH = Path(os.getenv("SHEETS_JOURNAL_PATH", str(self.STATE_DIR / "sheets_journal.jsonl")))
+        self.DRIVE_INDEX_PATH = Path(os.getenv("DRIVE_INDEX_PATH", str(self.STATE_DIR / "drive_index.db")))
+        
+        # Retention of kept files in PROCESSED_DIR (0 disables a limit; only files in Drive are evicted)
+        self.RETENTION_MAX_BYTES = int(os.getenv("RETENTION_MAX_BYTES", "0"))
+        self.RETENTION_MAX_AGE = int(os.getenv("RETENTION_MAX_AGE", "0"))
         
         # Processing Settings
         self.CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "52428800"))  # 50MB default
+        # Upload chunks adapt to measured throughput within these bounds (multiples of 256KB)
+        self.UPLOAD_CHUNK_MIN = int(os.getenv("UPLOAD_CHUNK_MIN", "1048576"))  # 1MB
+        self.UPLOAD_CHUNK_MAX = int(os.getenv("UPLOAD_CHUNK_MAX", "268435456"))  # 256MB
+        self.UPLOAD_CHUNK_TARGET_SECONDS = float(os.getenv("UPLOAD_CHUNK_TARGET_SECONDS", "10"))
         self.MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
         self.KEEP_FILES = os.getenv("KEEP_FILES", "true").lower() == "true"
         self.UPLOAD_TO_DRIVE = os.getenv("UPLOAD_TO_DRIVE", "true").lower() == "true"
+        self.MAX_CONCURRENT_VIDEOS = int(os.getenv("MAX_CONCURRENT_VIDEOS", "4"))
+        
+        # Temp files not belonging to an unfinished job are deleted after this many seconds
+        self.TEMP_FILE_MAX_AGE = int(os.getenv("TEMP_FILE_MAX_AGE", "172800"))  # 2 days
+        self.FAILED_JOB_TEMP_RETENTION = int(os.getenv("FAILED_JOB_TEMP_RETENTION", "604800"))  # 7 days
+        
+        # Shared Media Cache (directory on a mount shared by all workers; empty disables)
+        shared_cache_dir = os.getenv("SHARED_CACHE_DIR", "")
+        self.SHARED_CACHE_DIR = Path(shared_cache_dir) if shared_cache_dir else None
+        self.SHARED_CACHE_LOCK_STALE = int(os.getenv("SHARED_CACHE_LOCK_STALE", "600"))
+        self.SHARED_CACHE_POLL_INTERVAL = float(os.getenv("SHARED_CACHE_POLL_INTERVAL", "5"))
+        
+        # Disk Space Admission (downloads wait until their expected size fits)
+        self.DISK_MIN_FREE = int(os.getenv("DISK_MIN_FREE", "1073741824"))  # 1GB always left free
+        self.DISK_MERGE_MARGIN = float(os.getenv("DISK_MERGE_MARGIN", "1.0"))  # Extra temp space for merging, as a fraction
+        self.DISK_UNKNOWN_SIZE = int(os.getenv("DISK_UNKNOWN_SIZE", "2147483648"))  # 2GB reserved when size is unknown
+        self.DISK_POLL_INTERVAL = float(os.getenv("DISK_POLL_INTERVAL", "30"))
+        self.DISK_WAIT_TIMEOUT = float(os.getenv("DISK_WAIT_TIMEOUT", "3600"))  # 0 waits indefinitely
+        
+        # Download Engine Settings (parallel byte ranges / fragments per stream)
+        self.DOWNLOAD_CONNECTIONS = int(os.getenv("DOWNLOAD_CONNECTIONS", "4"))
+        self.DOWNLOAD_SEGMENT_SIZE = int(os.getenv("DOWNLOAD_SEGMENT_SIZE", "10485760"))  # 10MB
+        self.DOWNLOAD_FRAGMENT_CONCURRENCY = int(os.getenv("DOWNLOAD_FRAGMENT_CONCURRENCY", "4"))
+        
+        # Bandwidth Limits shared by all jobs (bytes per second, 0 for unlimited)
+        self.DOWNLOAD_RATE_LIMIT = float(os.getenv("DOWNLOAD_RATE_LIMIT", "0"))
+        self.UPLOAD_RATE_LIMIT = float(os.getenv("UPLOAD_RATE_LIMIT", "0"))
+        self.BANDWIDTH_BURST_SECONDS = float(os.getenv("BANDWIDTH_BURST_SECONDS", "1"))
+        
+        # Format Selection Settings (0 disables a limit)
+        self.FORMAT_MAX_HEIGHT = int(os.getenv("FORMAT_MAX_HEIGHT", "0"))
+        self.FORMAT_BANDWIDTH_BUDGET = float(os.getenv("FORMAT_BANDWIDTH_BUDGET", "0"))  # kbit/s
+        
+        # Output Container Settings (streams are copied; only MP4-incompatible codecs are re-encoded)
+        self.MP4_FASTSTART = os.getenv("MP4_FASTSTART", "true").lower() == "true"
+        self.TRANSCODE_PRESET = os.getenv("TRANSCODE_PRESET", "veryfast")
+        self.TRANSCODE_CRF = int(os.getenv("TRANSCODE_CRF", "20"))
+        self.TRANSCODE_AUDIO_BITRATE = os.getenv("TRANSCODE_AUDIO_BITRATE", "192k")
+        
+        # Pipeline Settings (per-stage worker counts and queue bounds)
+        self.PIPELINE_MODE = os.getenv("PIPELINE_MODE", "false").lower() == "true"
+        self.PIPELINE_INFO_WORKERS = int(os.getenv("PIPELINE_INFO_WORKERS", "2"))
+        self.PIPELINE_DOWNLOAD_WORKERS = int(os.getenv("PIPELINE_DOWNLOAD_WORKERS", "2"))
+        self.PIPELINE_UPLOAD_WORKERS = int(os.getenv("PIPELINE_UPLOAD_WORKERS", "2"))
+        self.PIPELINE_SHEET_WORKERS = int(os.getenv("PIPELINE_SHEET_WORKERS", "1"))
+        self.PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+        self.PIPELINE_STATS_INTERVAL = float(os.getenv("PIPELINE_STATS_INTERVAL", "30"))
+        
+        # Thread Pool Settings for blocking yt-dlp and Google API calls
+        self.METADATA_THREADS = int(os.getenv("METADATA_THREADS", "4"))
+        self.DOWNLOAD_THREADS = int(os.getenv("DOWNLOAD_THREADS", "4"))
+        self.DRIVE_THREADS = int(os.getenv("DRIVE_THREADS", "1"))  # Shared httplib2 transport is not thread-safe
+        self.SHEETS_THREADS = int(os.getenv("SHEETS_THREADS", "1"))
+        self.DRIVE_UPLOAD_CONCURRENCY = int(os.getenv("DRIVE_UPLOAD_CONCURRENCY", "4"))  # Each with its own HTTP client
         
         # Logging Settings
         self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -63,4 +148,5 @@ class Settings:
         self.PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
         self.LOG_DIR.mkdir(parents=True, exist_ok=True)
         self.CREDENTIALS_DIR.mkdir(parents=True, exist_ok=True)
+        self.STATE_DIR.mkdir(parents=True, exist_ok=True)
         self.FFMPEG_DIR.mkdir(parents=True, exist_ok=True) 
\ No newline at end of file
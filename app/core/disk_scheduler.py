@@ -0,0 +1,235 @@
+"""
+Disk space admission control for downloads.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import shutil
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+from app.config.settings import Settings
+from app.utils.exceptions import DownloadError
+from app.utils.helpers import format_size
+
+# Bytes needed keyed by device, with a directory on that device
+Needs = Dict[int, Tuple[Path, int]]
+
+class DiskSpaceScheduler:
+    """
+    Admits downloads only when their expected size fits on disk.
+    
+    Each download reserves its estimated size against the free space of
+    the filesystems holding TEMP_DIR and PROCESSED_DIR, minus what running
+    downloads still have to write: bytes a download has already written
+    are gone from the free space, so they no longer count against its
+    reservation. Downloads that do not fit wait in FIFO order until a
+    reservation is released or free space reappears, for at most
+    DISK_WAIT_TIMEOUT seconds.
+    """
+    
+    def __init__(self, settings: Settings):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            settings: Application settings
+        """
+        self.settings = settings
+        self.logger = logging.getLogger(__name__)
+        # Needs of every running download keyed by ticket, with its video ID
+        self._running: Dict[int, Tuple[str, Needs]] = {}
+        self._queue: Deque[int] = deque()
+        self._tickets = itertools.count()
+        self._cond: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _condition(self) -> asyncio.Condition:
+        """
+        Get the condition for the running event loop.
+        
+        Returns:
+            Condition guarding the reservations
+        """
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:
+            self._cond = asyncio.Condition()
+            self._loop = loop
+        return self._cond
+    
+    def _needs(self, size: int) -> Needs:
+        """
+        Work out how much space a download needs on each filesystem.
+        
+        The temp directory holds the downloaded streams and the merged
+        output at the same time; the processed directory receives the
+        final file once the streams are gone.
+        
+        Args:
+            size: Estimated size of the video in bytes
+            
+        Returns:
+            Bytes needed keyed by device, with a directory on that device
+        """
+        temp_dir = self.settings.TEMP_DIR
+        processed_dir = self.settings.PROCESSED_DIR
+        temp_need = int(size * (1 + self.settings.DISK_MERGE_MARGIN))
+        
+        needs = {os.stat(temp_dir).st_dev: (temp_dir, temp_need)}
+        processed_dev = os.stat(processed_dir).st_dev
+        if processed_dev not in needs:
+            needs[processed_dev] = (processed_dir, size)
+        return needs
+    
+    def _written(self, video_id: str, device: int) -> int:
+        """
+        Get the disk space a running download already occupies on a filesystem.
+        
+        Allocated blocks are counted rather than file sizes, so preallocated
+        sparse files only count what has actually been written.
+        
+        Args:
+            video_id: Video being downloaded
+            device: Filesystem device
+            
+        Returns:
+            Bytes allocated to the video's temp and output files
+        """
+        written = 0
+        for directory in {self.settings.TEMP_DIR, self.settings.PROCESSED_DIR}:
+            try:
+                if os.stat(directory).st_dev != device:
+                    continue
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if f"_{video_id}" not in entry.name:
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                blocks = getattr(stat, 'st_blocks', None)
+                written += blocks * 512 if blocks is not None else stat.st_size
+        return written
+    
+    def _outstanding(self, device: int) -> int:
+        """
+        Get the bytes running downloads have reserved but not yet written.
+        
+        Args:
+            device: Filesystem device
+            
+        Returns:
+            Outstanding reserved bytes on the device
+        """
+        outstanding = 0
+        for video_id, needs in self._running.values():
+            if device in needs:
+                outstanding += max(0, needs[device][1] - self._written(video_id, device))
+        return outstanding
+    
+    def _shortfall(self, needs: Needs) -> int:
+        """
+        Get how many bytes are missing for a reservation.
+        
+        Args:
+            needs: Result of _needs
+            
+        Returns:
+            Largest shortfall over the filesystems, or 0 if the reservation fits
+        """
+        shortfall = 0
+        for device, (directory, need) in needs.items():
+            available = shutil.disk_usage(directory).free - self._outstanding(device)
+            shortfall = max(shortfall, need + self.settings.DISK_MIN_FREE - available)
+        return shortfall
+    
+    @asynccontextmanager
+    async def reserve(self, video_id: str, size: int) -> AsyncIterator[None]:
+        """
+        Hold a disk space reservation for the duration of a download.
+        
+        Args:
+            video_id: Video being downloaded, for logging
+            size: Estimated size in bytes (0 if unknown)
+            
+        Yields:
+            Once the reservation has been admitted
+            
+        Raises:
+            DownloadError: If space did not become available within DISK_WAIT_TIMEOUT
+        """
+        size = size or self.settings.DISK_UNKNOWN_SIZE
+        self.settings.initialize_directories()
+        needs = self._needs(size)
+        cond = self._condition()
+        
+        ticket = next(self._tickets)
+        timeout = self.settings.DISK_WAIT_TIMEOUT
+        started = time.monotonic()
+        async with cond:
+            self._queue.append(ticket)
+            try:
+                waiting = False
+                alone_logged = False
+                while self._queue[0] != ticket or self._shortfall(needs) > 0:
+                    poll = self.settings.DISK_POLL_INTERVAL
+                    if timeout:
+                        remaining = timeout - (time.monotonic() - started)
+                        poll = min(poll, max(remaining, 0))
+                    if timeout and remaining <= 0:
+                        raise DownloadError(
+                            f"Not enough disk space for {video_id} after waiting {timeout:.0f}s: "
+                            f"needs {format_size(max(self._shortfall(needs), 0))} more"
+                        )
+                    if not waiting:
+                        waiting = True
+                        self.logger.info(
+                            f"Waiting for disk space to download {video_id} "
+                            f"({format_size(size)} expected, {len(self._queue) - 1} ahead)"
+                        )
+                    if self._queue[0] == ticket and not self._running and not alone_logged:
+                        # Nothing of ours will free space; eviction or other processes might
+                        alone_logged = True
+                        self.logger.warning(
+                            f"{video_id} needs {format_size(self._shortfall(needs))} more disk "
+                            f"space than is free, waiting for space to be freed"
+                        )
+                    try:
+                        await asyncio.wait_for(cond.wait(), poll)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._queue.remove(ticket)
+                cond.notify_all()
+                
+            self._running[ticket] = (video_id, needs)
+            
+        try:
+            yield
+        finally:
+            async with cond:
+                del self._running[ticket]
+                cond.notify_all()
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get current reservation statistics.
+        
+        Returns:
+            Dictionary with active downloads, queued downloads and reserved
+            bytes not yet written
+        """
+        devices = {device for _, needs in self._running.values() for device in needs}
+        return {
+            'active': len(self._running),
+            'waiting': len(self._queue),
+            'reserved': sum(self._outstanding(device) for device in devices)
+        }
@@ -3,31 +3,91 @@ YouTube video downloader module.
 """
 
 import logging
+import re
 import socket
 import shutil
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Iterable, List, Tuple
 from urllib.error import URLError
 
-import yt_dlp
 from yt_dlp.utils import DownloadError as YTDLError
 
 from app.config.settings import Settings
-from app.utils.exceptions import DownloadError, ConfigurationError
+from app.core.format_planner import FormatPlanner
+from app.core.metadata_cache import MetadataCache
+from app.core.ranged_downloader import RangedDownloader
+from app.core.remuxer import MediaRemuxer
+from app.core.shared_cache import SharedMediaCache
+from app.core.ydl_pool import YoutubeDLPool
+from app.utils.bandwidth import BandwidthGovernor, BandwidthShare
+from app.utils.exceptions import DownloadError, ConfigurationError, ValidationError
+from app.utils.executors import BlockingExecutor
 from app.utils.helpers import get_video_path, format_size, format_duration
+from app.utils.validators import validate_youtube_url
+
+# Video ID embedded in temporary file names by get_video_path
+_TEMP_VIDEO_ID = re.compile(r'_([A-Za-z0-9_-]{11})\.')
 
 class YouTubeDownloader:
     """Handles downloading videos from YouTube."""
     
-    def __init__(self, settings: Settings):
+    def __init__(
+        self,
+        settings: Settings,
+        executor: Optional[BlockingExecutor] = None,
+        bandwidth: Optional[BandwidthGovernor] = None
+    ):
         """
         Initialize the downloader.
         
         Args:
             settings: Application settings
+            executor: Shared pools for blocking yt-dlp calls
+            bandwidth: Shared download rate limit
         """
         self.settings = settings
         self.logger = logging.getLogger(__name__)
+        self.executor = executor or BlockingExecutor(settings)
+        self.bandwidth = bandwidth or BandwidthGovernor(settings)
+        
+        # Full info dicts from get_video_info, reused by download_video so a
+        # video is only extracted once. Keyed by video ID, oldest first.
+        self._extracted: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._extracted_lock = threading.Lock()
+        
+        # Normalized metadata persisted across runs (disabled when the TTL is 0)
+        self.metadata_cache = None
+        if settings.METADATA_CACHE_TTL > 0:
+            self.metadata_cache = MetadataCache(
+                settings.METADATA_CACHE_PATH,
+                ttl=settings.METADATA_CACHE_TTL,
+                max_entries=settings.METADATA_CACHE_MAX_ENTRIES,
+                max_bytes=settings.METADATA_CACHE_MAX_BYTES
+            )
+            
+        self.format_planner = FormatPlanner(settings)
+        self.ranged = RangedDownloader(
+            connections=settings.DOWNLOAD_CONNECTIONS,
+            segment_size=settings.DOWNLOAD_SEGMENT_SIZE,
+            retries=settings.MAX_RETRIES
+        )
+        self.remuxer = MediaRemuxer(settings)
+        
+        # Finished videos shared with other worker hosts (disabled without a directory)
+        self.shared_cache = None
+        if settings.SHARED_CACHE_DIR:
+            self.shared_cache = SharedMediaCache(
+                settings.SHARED_CACHE_DIR,
+                stale_after=settings.SHARED_CACHE_LOCK_STALE,
+                poll_interval=settings.SHARED_CACHE_POLL_INTERVAL
+            )
+        
+        # One reusable YoutubeDL per worker thread
+        self.ydl_pool = YoutubeDLPool(self._get_ydl_opts)
+        
         self._validate_ffmpeg()
         
     def _validate_ffmpeg(self) -> None:
@@ -70,16 +130,18 @@ class YouTubeDownloader:
             Dictionary of yt-dlp options
         """
         opts = {
-            'format': 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best',
-            'postprocessors': [{
-                'key': 'FFmpegVideoConvertor',
-                'preferedformat': 'mp4',
-            }],
-            'merge_output_format': 'mp4',
+            # Fallback only; downloads normally use the FormatPlanner's choice
+            'format': 'bestvideo*+bestaudio/best',
+            # Merge by stream copy; MKV takes codec pairs MP4 cannot
+            'merge_output_format': 'mp4/mkv',
             'quiet': True,
             'no_warnings': True,
             'outtmpl': '%(id)s.%(ext)s',
             'retries': self.settings.MAX_RETRIES,
+            # Continue .part files (and fragment progress) left by an interrupted run
+            'continuedl': True,
+            # Fragmented (DASH/HLS) formats: fetch fragments in parallel
+            'concurrent_fragment_downloads': self.settings.DOWNLOAD_FRAGMENT_CONCURRENCY,
             'socket_timeout': 30,
             'extract_flat': True,
             'ignoreerrors': True,
@@ -95,6 +157,38 @@ class YouTubeDownloader:
         """
         Get video metadata without downloading.
         
+        Args:
+            video_url: YouTube video URL
+            
+        Returns:
+            Dictionary containing video metadata
+            
+        Raises:
+            DownloadError: If metadata extraction fails
+        """
+        video_id = None
+        if self.metadata_cache:
+            try:
+                video_id = validate_youtube_url(video_url)
+            except ValidationError:
+                pass
+                
+        if video_id:
+            cached = await self.executor.run('metadata', self.metadata_cache.get, video_id)
+            if cached:
+                self.logger.debug(f"Metadata cache hit for {video_id}")
+                return cached
+                
+        metadata = await self.executor.run('metadata', self._extract_video_info, video_url)
+        
+        if self.metadata_cache:
+            await self.executor.run('metadata', self.metadata_cache.put, metadata['id'], metadata)
+        return metadata
+    
+    def _extract_video_info(self, video_url: str) -> Dict[str, Any]:
+        """
+        Blocking implementation of get_video_info.
+        
         Args:
             video_url: YouTube video URL
             
@@ -105,7 +199,7 @@ class YouTubeDownloader:
             DownloadError: If metadata extraction fails
         """
         try:
-            with yt_dlp.YoutubeDL(self._get_ydl_opts()) as ydl:
+            with self.ydl_pool.acquire() as ydl:
                 info = ydl.extract_info(video_url, download=False)
                 
                 if not info:
@@ -121,6 +215,8 @@ class YouTubeDownloader:
                 if info.get('age_limit', 0) > 0:
                     raise DownloadError("Age-restricted videos are not supported")
                 
+                self._remember_extraction(info)
+                
                 # Format metadata according to requirements
                 tags = ', '.join(info.get('tags', [])) if info.get('tags') else ''
                 category = info.get('categories', [''])[0] if info.get('categories') else ''
@@ -154,11 +250,157 @@ class YouTubeDownloader:
         except Exception as e:
             raise DownloadError(f"Failed to get video info: {str(e)}")
     
+    def _remember_extraction(self, info: Dict[str, Any]) -> None:
+        """
+        Keep a full info dict so the download can skip a second extraction.
+        
+        Args:
+            info: Info dict returned by YoutubeDL.extract_info
+        """
+        with self._extracted_lock:
+            self._extracted.pop(info['id'], None)
+            self._extracted[info['id']] = (time.monotonic(), info)
+            while len(self._extracted) > self.settings.INFO_REUSE_MAX_ENTRIES:
+                self._extracted.popitem(last=False)
+    
+    def _take_extraction(self, video_id: str, keep: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Remove and return a remembered info dict if its stream URLs are still fresh.
+        
+        Args:
+            video_id: YouTube video ID
+            keep: Leave the info dict in place for a later download
+            
+        Returns:
+            Info dict, or None if the video must be extracted again
+        """
+        with self._extracted_lock:
+            if keep:
+                entry = self._extracted.get(video_id)
+            else:
+                entry = self._extracted.pop(video_id, None)
+            
+        if not entry:
+            return None
+            
+        extracted_at, info = entry
+        if time.monotonic() - extracted_at > self.settings.INFO_REUSE_TTL:
+            self.logger.debug(f"Extracted info for {video_id} is stale, extracting again")
+            return None
+        return info
+    
+    async def plan_formats(self, video_url: str, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Choose the streams and container to download for a video.
+        
+        Args:
+            video_url: YouTube video URL
+            video_id: YouTube video ID
+            
+        Returns:
+            Format plan from FormatPlanner, or None to use the default selector
+            
+        Raises:
+            DownloadError: If the video has to be extracted again and that fails
+        """
+        return await self.executor.run('metadata', self._plan_formats, video_url, video_id)
+    
+    def _plan_formats(self, video_url: str, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Blocking implementation of plan_formats.
+        
+        Args:
+            video_url: YouTube video URL
+            video_id: YouTube video ID
+            
+        Returns:
+            Format plan, or None
+        """
+        info = self._take_extraction(video_id, keep=True)
+        if not info:
+            # Metadata came from the cache; extract once for both plan and download
+            self._extract_video_info(video_url)
+            info = self._take_extraction(video_id, keep=True)
+            
+        plan = self.format_planner.plan(info) if info else None
+        if plan:
+            self.logger.info(
+                f"Format plan for {video_id}: {plan['format']} "
+                f"({plan['height']}p{plan['fps'] or ''} {plan['vcodec']}/{plan['acodec']}, "
+                f"{plan['container']}, ~{format_size(plan['estimated_size'])})"
+            )
+        return plan
+    
+    async def get_playlist_entries(self, playlist_url: str) -> List[Dict[str, Any]]:
+        """
+        Expand a playlist into its video entries without resolving each video.
+        
+        Args:
+            playlist_url: YouTube playlist URL
+        
+        Returns:
+            List of entries with 'id', 'url', 'title' and 'available' keys
+        
+        Raises:
+            DownloadError: If playlist extraction fails
+        """
+        return await self.executor.run('metadata', self._extract_playlist_entries, playlist_url)
+    
+    def _extract_playlist_entries(self, playlist_url: str) -> List[Dict[str, Any]]:
+        """
+        Blocking implementation of get_playlist_entries.
+        
+        Args:
+            playlist_url: YouTube playlist URL
+            
+        Returns:
+            List of playlist entries
+            
+        Raises:
+            DownloadError: If playlist extraction fails
+        """
+        try:
+            with self.ydl_pool.acquire() as ydl:
+                info = ydl.extract_info(playlist_url, download=False)
+            
+            if not info or 'entries' not in info:
+                raise DownloadError("URL does not point to a playlist")
+            
+            entries = []
+            for entry in info['entries']:
+                if not entry or not entry.get('id'):
+                    continue
+                
+                title = entry.get('title') or ''
+                entries.append({
+                    'id': entry['id'],
+                    'url': f"https://www.youtube.com/watch?v={entry['id']}",
+                    'title': title,
+                    # Flat extraction lists removed videos with placeholder titles
+                    'available': title not in ('[Private video]', '[Deleted video]')
+                })
+            
+            self.logger.info(
+                f"Playlist '{info.get('title', playlist_url)}' has {len(entries)} entries"
+            )
+            return entries
+        
+        except DownloadError:
+            raise
+        
+        except YTDLError as e:
+            raise DownloadError(f"Failed to read playlist: {str(e)}")
+        
+        except Exception as e:
+            raise DownloadError(f"Failed to get playlist entries: {str(e)}")
+    
     async def download_video(
         self,
         video_url: str,
         metadata: Dict[str, Any],
-        progress_callback: Optional[Callable[[float], None]] = None
+        progress_callback: Optional[Callable[[float], None]] = None,
+        format_plan: Optional[Dict[str, Any]] = None,
+        priority: float = 1.0
     ) -> Path:
         """
         Download a video from YouTube.
@@ -167,6 +409,8 @@ class YouTubeDownloader:
             video_url: YouTube video URL
             metadata: Video metadata from get_video_info
             progress_callback: Optional callback for download progress
+            format_plan: Streams to download, from plan_formats
+            priority: Bandwidth weight relative to other jobs of this process
             
         Returns:
             Path to downloaded video file
@@ -174,8 +418,168 @@ class YouTubeDownloader:
         Raises:
             DownloadError: If download fails
         """
+        return await self.executor.run(
+            'download',
+            self._download_video,
+            video_url,
+            metadata,
+            self.executor.threadsafe(progress_callback),
+            format_plan,
+            priority
+        )
+    
+    def _download_video(
+        self,
+        video_url: str,
+        metadata: Dict[str, Any],
+        progress_callback: Optional[Callable[[float], None]] = None,
+        format_plan: Optional[Dict[str, Any]] = None,
+        priority: float = 1.0
+    ) -> Path:
+        """
+        Blocking implementation of download_video, run on a worker thread.
+        
+        With a shared cache, the video is taken from the cache when another
+        worker already downloaded it in the same format. Otherwise it is
+        downloaded under the entry's lock, so a worker wanting the same
+        video waits for it instead of downloading it a second time. Entries
+        are keyed by the format IDs yt-dlp selects (e.g. '137+140'), never
+        by the selector that asked for them.
+        
+        Args:
+            video_url: YouTube video URL
+            metadata: Video metadata from get_video_info
+            progress_callback: Thread-safe callback for download progress
+            format_plan: Streams to download, from plan_formats
+            priority: Bandwidth weight relative to other jobs of this process
+            
+        Returns:
+            Path to downloaded video file
+            
+        Raises:
+            DownloadError: If download fails
+        """
+        if not self.shared_cache:
+            return self._fetch_video(video_url, metadata, progress_callback, format_plan, priority)[0]
+            
+        video_id = metadata['id']
+        video_format = self._resolve_format(video_url, video_id, format_plan)
+        if not video_format:
+            self.logger.warning(f"Could not resolve the formats of {video_id}, bypassing the shared cache")
+            return self._fetch_video(video_url, metadata, progress_callback, format_plan, priority)[0]
+        final_path = get_video_path(video_id, metadata['title'], self.settings.PROCESSED_DIR)
+        
+        try:
+            with self.shared_cache.lock(video_id, video_format):
+                if self.shared_cache.fetch(video_id, video_format, final_path):
+                    return final_path
+                    
+                final_path, downloaded_format = self._fetch_video(
+                    video_url, metadata, progress_callback, format_plan, priority
+                )
+                if not downloaded_format:
+                    return final_path
+                if downloaded_format != video_format:
+                    self.logger.warning(
+                        f"Downloaded formats {downloaded_format} of {video_id} instead of {video_format}"
+                    )
+                try:
+                    self.shared_cache.store(video_id, downloaded_format, final_path)
+                except OSError as e:
+                    self.logger.warning(f"Could not add {video_id} to the shared cache: {str(e)}")
+                return final_path
+        except OSError as e:
+            raise DownloadError(f"Shared cache error: {str(e)}")
+    
+    @staticmethod
+    def _format_params(format_plan: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Get the YoutubeDL params that apply a format plan.
+        
+        Args:
+            format_plan: Streams to download, from plan_formats
+            
+        Returns:
+            Params to override for the job; empty to use the default selector
+        """
+        if not format_plan:
+            return {}
+        return {
+            'format': format_plan['format'],
+            'merge_output_format': format_plan['container']
+        }
+    
+    def _resolve_format(
+        self,
+        video_url: str,
+        video_id: str,
+        format_plan: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Find the formats a download would fetch, without downloading them.
+        
+        Args:
+            video_url: YouTube video URL
+            video_id: YouTube video ID
+            format_plan: Streams to download, from plan_formats
+            
+        Returns:
+            Format ID reported by yt-dlp, e.g. '137+140', or None if the
+            video could not be resolved
+        """
+        info = self._take_extraction(video_id, keep=True)
+        try:
+            with self.ydl_pool.acquire(params=self._format_params(format_plan)) as ydl:
+                if not info:
+                    info = ydl.extract_info(video_url, download=False)
+                    if not info:
+                        return None
+                    # Kept for the download that follows
+                    self._remember_extraction(info)
+                resolved = ydl.process_ie_result(
+                    ydl.sanitize_info(info, remove_private_keys=True), download=False
+                )
+        except YTDLError as e:
+            self.logger.debug(f"Could not resolve formats of {video_id}: {str(e)}")
+            return None
+        return resolved.get('format_id') if resolved else None
+    
+    def _fetch_video(
+        self,
+        video_url: str,
+        metadata: Dict[str, Any],
+        progress_callback: Optional[Callable[[float], None]] = None,
+        format_plan: Optional[Dict[str, Any]] = None,
+        priority: float = 1.0
+    ) -> Tuple[Path, Optional[str]]:
+        """
+        Download a video from YouTube and finalize it to MP4.
+        
+        Args:
+            video_url: YouTube video URL
+            metadata: Video metadata from get_video_info
+            progress_callback: Thread-safe callback for download progress
+            format_plan: Streams to download, from plan_formats
+            priority: Bandwidth weight relative to other jobs of this process
+            
+        Returns:
+            Tuple of (path to downloaded video file, format ID yt-dlp
+            selected, or None if it did not report one)
+            
+        Raises:
+            DownloadError: If download fails
+        """
+        share = self.bandwidth.share('download', priority)
+        received: Dict[str, int] = {}
+        
         def progress_hook(d):
             if d['status'] == 'downloading':
+                # Blocking here holds yt-dlp's read loop to the shared rate
+                key = d.get('filename') or ''
+                downloaded = d.get('downloaded_bytes') or 0
+                share.consume(downloaded - received.get(key, 0))
+                received[key] = downloaded
+                
                 if progress_callback and 'total_bytes' in d:
                     progress = d['downloaded_bytes'] / d['total_bytes']
                     progress_callback(progress)
@@ -196,15 +600,34 @@ class YouTubeDownloader:
             # Ensure temp directory exists
             temp_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Configure yt-dlp options
-            ydl_opts = self._get_ydl_opts(progress_hook)
-            ydl_opts['outtmpl'] = str(temp_path)
+            # Let yt-dlp pick the extension; the file is finalized to MP4 below
+            outtmpl = str(temp_path.with_suffix('')).replace('%', '%%') + '.%(ext)s'
+            
+            # Download video, reusing the extraction from get_video_info if still fresh
+            extracted = self._take_extraction(metadata['id'])
             
-            # Download video
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            params = self._format_params(format_plan)
+            with self.ydl_pool.acquire(outtmpl=outtmpl, progress_hook=progress_hook, params=params) as ydl:
                 self.logger.info(f"Downloading video: {metadata['title']}")
                 try:
-                    ydl.download([video_url])
+                    if not extracted:
+                        extracted = ydl.extract_info(video_url, download=False)
+                        if not extracted:
+                            raise DownloadError("Failed to extract video information")
+                    extracted = ydl.sanitize_info(extracted, remove_private_keys=True)
+                    
+                    # Resolve the selected streams without downloading them
+                    resolved = ydl.process_ie_result(dict(extracted), download=False)
+                    downloaded_format = resolved.get('format_id') if resolved else None
+                    streams = self._ranged_streams(resolved)
+                    if streams:
+                        sources = self._download_ranged(streams, temp_path, progress_callback, share)
+                    else:
+                        downloaded = ydl.process_ie_result(extracted, download=True)
+                        if downloaded and downloaded.get('format_id'):
+                            downloaded_format = downloaded['format_id']
+                        downloaded = self._find_download(temp_path)
+                        sources = [downloaded] if downloaded else []
                 except YTDLError as e:
                     if "No video formats found" in str(e):
                         raise DownloadError("No suitable video formats found for download")
@@ -213,6 +636,16 @@ class YouTubeDownloader:
                     else:
                         raise DownloadError(f"Download failed: {str(e)}")
             
+            if not sources:
+                raise DownloadError("Download completed but file not found")
+                
+            if any(source.stat().st_size == 0 for source in sources):
+                raise DownloadError("Downloaded file is empty")
+                
+            containers = '+'.join(source.suffix.lstrip('.') for source in sources)
+            path = self.remuxer.finalize(sources, temp_path)
+            self.logger.info(f"Finalized {metadata['id']} via {path} ({containers} -> mp4)")
+            
             # Move to final location if download successful
             final_path = get_video_path(
                 metadata['id'],
@@ -221,16 +654,13 @@ class YouTubeDownloader:
             )
             final_path.parent.mkdir(parents=True, exist_ok=True)
             
-            if temp_path.exists():
-                if temp_path.stat().st_size == 0:
-                    raise DownloadError("Downloaded file is empty")
-                    
-                temp_path.rename(final_path)
-                self.logger.info(f"Video saved to: {final_path}")
-                return final_path
-            else:
-                raise DownloadError("Download completed but file not found")
-                
+            temp_path.rename(final_path)
+            self.logger.info(f"Video saved to: {final_path}")
+            return final_path, downloaded_format
+            
+        except DownloadError:
+            raise
+            
         except URLError as e:
             raise DownloadError(f"Network error during download: {str(e)}")
             
@@ -243,6 +673,139 @@ class YouTubeDownloader:
         except Exception as e:
             raise DownloadError(f"Failed to download video: {str(e)}")
             
+    def _ranged_streams(self, resolved: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the selected formats if all of them can be fetched with byte ranges.
+        
+        Fragmented formats (DASH, HLS) are left to yt-dlp, which downloads
+        their fragments concurrently.
+        
+        Args:
+            resolved: Info dict after format selection
+            
+        Returns:
+            Selected format dictionaries, or None to download with yt-dlp
+        """
+        if self.settings.DOWNLOAD_CONNECTIONS <= 1:
+            return None
+            
+        streams = resolved.get('requested_formats') or [resolved]
+        if all(f.get('url') and f.get('protocol') in ('http', 'https') for f in streams):
+            return streams
+        return None
+    
+    def _download_ranged(
+        self,
+        streams: List[Dict[str, Any]],
+        temp_path: Path,
+        progress_callback: Optional[Callable[[float], None]] = None,
+        share: Optional[BandwidthShare] = None
+    ) -> List[Path]:
+        """
+        Download each selected stream over parallel range requests.
+        
+        Args:
+            streams: Format dictionaries with direct URLs
+            temp_path: Temporary .mp4 path the stream files are named after
+            progress_callback: Thread-safe callback for overall progress
+            share: Job's share of the download bandwidth
+            
+        Returns:
+            Paths of the downloaded stream files, video first
+            
+        Raises:
+            DownloadError: If a stream cannot be downloaded
+        """
+        progress = {}
+        
+        def _progress(index: int, done: int, total: int) -> None:
+            progress[index] = (done, total)
+            overall_total = sum(t for _, t in progress.values())
+            if progress_callback and overall_total:
+                progress_callback(sum(d for d, _ in progress.values()) / overall_total)
+                
+        sources = []
+        for index, fmt in enumerate(streams):
+            dest = temp_path.with_name(f"{temp_path.stem}.f{fmt['format_id']}.{fmt.get('ext') or 'bin'}")
+            self.logger.info(
+                f"Fetching format {fmt['format_id']} over up to "
+                f"{self.settings.DOWNLOAD_CONNECTIONS} connections"
+            )
+            self.ranged.download(
+                fmt['url'],
+                dest,
+                headers=fmt.get('http_headers'),
+                size=fmt.get('filesize'),
+                progress_callback=lambda done, total, i=index: _progress(i, done, total),
+                throttle=share.consume if share else None
+            )
+            sources.append(dest)
+        return sources
+    
+    @staticmethod
+    def _find_download(temp_path: Path) -> Optional[Path]:
+        """
+        Locate the finished file yt-dlp wrote for a temporary path.
+        
+        Args:
+            temp_path: Temporary .mp4 path the download was named after
+            
+        Returns:
+            Path of the downloaded file, or None if there is none
+        """
+        if not temp_path.parent.exists():
+            return None
+            
+        candidates = [
+            candidate for candidate in temp_path.parent.iterdir()
+            if candidate.stem == temp_path.stem and candidate.suffix not in ('.part', '.ytdl')
+        ]
+        # Prefer the newest file if an earlier attempt left one behind
+        return max(candidates, key=lambda c: c.stat().st_mtime, default=None)
+    
+    def reclaim_temp_files(self, keep_ids: Iterable[str] = ()) -> int:
+        """
+        Delete old partial downloads that no unfinished job can resume.
+        
+        Args:
+            keep_ids: Video IDs of unfinished jobs whose files are kept
+            
+        Returns:
+            Number of bytes reclaimed
+        """
+        temp_dir = self.settings.TEMP_DIR
+        if not temp_dir.exists():
+            return 0
+            
+        keep_ids = set(keep_ids)
+        cutoff = time.time() - self.settings.TEMP_FILE_MAX_AGE
+        reclaimed = 0
+        removed = 0
+        
+        for path in temp_dir.iterdir():
+            try:
+                stat = path.stat()
+                if not path.is_file() or stat.st_mtime > cutoff:
+                    continue
+                # Temp names are '<title>_<video id>.<ext>[.part|.ranges|...]'
+                if keep_ids.intersection(_TEMP_VIDEO_ID.findall(path.name)):
+                    continue
+                path.unlink()
+                reclaimed += stat.st_size
+                removed += 1
+            except OSError as e:
+                self.logger.warning(f"Could not reclaim temp file {path.name}: {str(e)}")
+                
+        if removed:
+            self.logger.info(f"Reclaimed {removed} orphaned temp files ({format_size(reclaimed)})")
+        return reclaimed
+    
+    def close(self) -> None:
+        """Release resources held by the downloader."""
+        self.ydl_pool.close()
+        if self.metadata_cache:
+            self.metadata_cache.close()
+    
     async def cleanup(self, video_path: Path) -> None:
         """
         Clean up downloaded video file.
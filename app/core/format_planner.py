@@ -0,0 +1,199 @@
+"""
+Format selection for video downloads.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config.settings import Settings
+
+# Relative compression efficiency of codecs at equal quality (higher is better)
+VIDEO_CODEC_RANK = {'av01': 4, 'vp09': 3, 'vp9': 3, 'hev1': 2, 'hvc1': 2, 'avc1': 1}
+AUDIO_CODEC_RANK = {'opus': 3, 'mp4a': 2, 'vorbis': 1}
+
+# Codecs that can be merged into MP4 without re-encoding
+MP4_VIDEO_CODECS = {'av01', 'vp09', 'vp9', 'hev1', 'hvc1', 'avc1'}
+MP4_AUDIO_CODECS = {'opus', 'mp4a', 'mp3', 'ac-3', 'ec-3'}
+
+def _codec(name: Optional[str]) -> Optional[str]:
+    """
+    Reduce a codec string such as 'avc1.640028' to its family.
+    
+    Args:
+        name: Codec string reported by yt-dlp
+        
+    Returns:
+        Lower-case codec family, or None for 'none' or a missing codec
+    """
+    if not name or name == 'none':
+        return None
+    return name.split('.')[0].lower()
+
+class FormatPlanner:
+    """
+    Picks the video and audio streams to download from an extracted info dict.
+    
+    Candidates are ranked by resolution, then frame rate, codec efficiency,
+    audio bitrate and finally estimated size. Combinations whose average
+    bitrate exceeds the configured budget are only used when nothing fits,
+    in which case the smallest one is chosen.
+    """
+    
+    def __init__(self, settings: Settings):
+        """
+        Initialize the planner.
+        
+        Args:
+            settings: Application settings
+        """
+        self.settings = settings
+        self.logger = logging.getLogger(__name__)
+    
+    def plan(self, info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Build a download plan for a video.
+        
+        Args:
+            info: Full info dict from YoutubeDL.extract_info
+            
+        Returns:
+            Plan with the yt-dlp format selector, chosen stream IDs, codecs,
+            container and estimated size, or None if the info lists no formats
+        """
+        duration = info.get('duration') or 0
+        formats = [f for f in info.get('formats') or [] if not f.get('has_drm')]
+        
+        videos = [f for f in formats if _codec(f.get('vcodec'))]
+        audios = [f for f in formats if _codec(f.get('acodec')) and not _codec(f.get('vcodec'))]
+        
+        max_height = self.settings.FORMAT_MAX_HEIGHT
+        if max_height:
+            videos = [f for f in videos if (f.get('height') or 0) <= max_height] or videos
+            
+        candidates: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = []
+        for video in videos:
+            if _codec(video.get('acodec')):
+                candidates.append((video, None))
+            else:
+                candidates.extend((video, audio) for audio in audios)
+                
+        if not candidates:
+            return None
+            
+        best = max(candidates, key=lambda pair: self._score(pair[0], pair[1], duration))
+        return self._describe(best[0], best[1], duration)
+    
+    @staticmethod
+    def _estimate_size(fmt: Optional[Dict[str, Any]], duration: float) -> int:
+        """
+        Estimate the size of a format in bytes.
+        
+        Args:
+            fmt: yt-dlp format dictionary, or None
+            duration: Video duration in seconds
+            
+        Returns:
+            Exact or approximate size, or 0 if unknown
+        """
+        if not fmt:
+            return 0
+        size = fmt.get('filesize') or fmt.get('filesize_approx')
+        if not size and fmt.get('tbr') and duration:
+            size = fmt['tbr'] * 125 * duration  # kbit/s to bytes
+        return int(size or 0)
+    
+    def _bitrate(
+        self,
+        video: Dict[str, Any],
+        audio: Optional[Dict[str, Any]],
+        duration: float
+    ) -> float:
+        """
+        Average bitrate of a stream combination in kbit/s.
+        
+        Args:
+            video: Video (or combined) format
+            audio: Audio format, or None for a combined format
+            duration: Video duration in seconds
+            
+        Returns:
+            Combined bitrate, or 0 if unknown
+        """
+        if duration:
+            size = self._estimate_size(video, duration) + self._estimate_size(audio, duration)
+            if size:
+                return size / 125 / duration
+        return (video.get('tbr') or 0) + ((audio or {}).get('tbr') or 0)
+    
+    def _score(
+        self,
+        video: Dict[str, Any],
+        audio: Optional[Dict[str, Any]],
+        duration: float
+    ) -> Tuple:
+        """
+        Rank a stream combination; higher tuples are better.
+        
+        Args:
+            video: Video (or combined) format
+            audio: Audio format, or None for a combined format
+            duration: Video duration in seconds
+            
+        Returns:
+            Sort key for max()
+        """
+        bitrate = self._bitrate(video, audio, duration)
+        budget = self.settings.FORMAT_BANDWIDTH_BUDGET
+        if budget and bitrate > budget:
+            return (0, -bitrate)
+            
+        sound = audio or video
+        size = self._estimate_size(video, duration) + self._estimate_size(audio, duration)
+        return (
+            1,
+            video.get('height') or 0,
+            video.get('fps') or 0,
+            VIDEO_CODEC_RANK.get(_codec(video.get('vcodec')), 0),
+            sound.get('abr') or 0,
+            AUDIO_CODEC_RANK.get(_codec(sound.get('acodec')), 0),
+            -size
+        )
+    
+    def _describe(
+        self,
+        video: Dict[str, Any],
+        audio: Optional[Dict[str, Any]],
+        duration: float
+    ) -> Dict[str, Any]:
+        """
+        Turn the chosen combination into a plan dictionary.
+        
+        Args:
+            video: Video (or combined) format
+            audio: Audio format, or None for a combined format
+            duration: Video duration in seconds
+            
+        Returns:
+            JSON-serializable plan
+        """
+        vcodec = _codec(video.get('vcodec'))
+        acodec = _codec((audio or video).get('acodec'))
+        bitrate = self._bitrate(video, audio, duration)
+        budget = self.settings.FORMAT_BANDWIDTH_BUDGET
+        
+        mp4_ok = vcodec in MP4_VIDEO_CODECS and (acodec is None or acodec in MP4_AUDIO_CODECS)
+        
+        return {
+            'format': f"{video['format_id']}+{audio['format_id']}" if audio else video['format_id'],
+            'video_format_id': video['format_id'],
+            'audio_format_id': audio['format_id'] if audio else None,
+            'container': 'mp4' if mp4_ok else 'mkv',
+            'width': video.get('width'),
+            'height': video.get('height'),
+            'fps': video.get('fps'),
+            'vcodec': video.get('vcodec'),
+            'acodec': (audio or video).get('acodec'),
+            'estimated_size': self._estimate_size(video, duration) + self._estimate_size(audio, duration),
+            'bitrate': round(bitrate, 1),
+            'within_budget': not budget or bitrate <= budget
+        }
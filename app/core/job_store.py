@@ -0,0 +1,237 @@
+"""
+Durable SQLite-backed record of each video's processing progress.
+"""
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.utils.exceptions import ProcessingError
+from app.utils.helpers import connect_database
+
+# Stages in completion order; a job resumes after the last one it reached
+STAGE_PENDING = 'pending'
+STAGE_INFO_FETCHED = 'info_fetched'
+STAGE_DOWNLOADED = 'downloaded'
+STAGE_UPLOADED = 'uploaded'
+STAGE_SHEET_UPDATED = 'sheet_updated'
+
+STAGES = [
+    STAGE_PENDING,
+    STAGE_INFO_FETCHED,
+    STAGE_DOWNLOADED,
+    STAGE_UPLOADED,
+    STAGE_SHEET_UPDATED
+]
+
+# Job statuses
+JOB_ACTIVE = 'active'
+JOB_FAILED = 'failed'
+JOB_COMPLETED = 'completed'
+
+class JobStore:
+    """
+    Records the stage and artifacts of every video job in SQLite.
+    
+    Each stage transition is committed before the next stage starts, so
+    after a crash a job can continue from the last finished stage using
+    the stored metadata, file path and Drive file ID.
+    """
+    
+    def __init__(self, db_path: Path):
+        """
+        Initialize the job store.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            
+        Raises:
+            ProcessingError: If the database cannot be opened
+        """
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        
+        try:
+            self._conn = connect_database(db_path)
+            with self._conn:
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS jobs (
+                        video_id TEXT PRIMARY KEY,
+                        url TEXT NOT NULL,
+                        stage TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        artifacts TEXT NOT NULL DEFAULT '{}',
+                        error TEXT,
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        created_at REAL NOT NULL,
+                        updated_at REAL NOT NULL
+                    )
+                    """
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)"
+                )
+        except Exception as e:
+            raise ProcessingError(f"Failed to open job store at {db_path}: {str(e)}")
+    
+    @staticmethod
+    def _to_dict(row: Any) -> Dict[str, Any]:
+        """
+        Convert a database row to a job dictionary.
+        
+        Args:
+            row: sqlite3.Row from the jobs table
+            
+        Returns:
+            Job dictionary with decoded artifacts
+        """
+        job = dict(row)
+        job['artifacts'] = json.loads(job['artifacts'])
+        return job
+    
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored job for a video.
+        
+        Args:
+            video_id: YouTube video ID
+            
+        Returns:
+            Job dictionary or None if the video has no job
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        return self._to_dict(row) if row else None
+    
+    def start(self, video_id: str, url: str) -> Dict[str, Any]:
+        """
+        Register an attempt to process a video.
+        
+        An unfinished job keeps its stage and artifacts so the attempt can
+        resume; a completed job starts over from the beginning.
+        
+        Args:
+            video_id: YouTube video ID
+            url: Video URL
+            
+        Returns:
+            Job dictionary for this attempt
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR IGNORE INTO jobs (video_id, url, stage, status, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (video_id, url, STAGE_PENDING, JOB_ACTIVE, now, now)
+            )
+            self._conn.execute(
+                """
+                UPDATE jobs SET
+                    url = ?,
+                    stage = CASE WHEN status = ? THEN ? ELSE stage END,
+                    artifacts = CASE WHEN status = ? THEN '{}' ELSE artifacts END,
+                    status = ?,
+                    error = NULL,
+                    attempts = attempts + 1,
+                    updated_at = ?
+                WHERE video_id = ?
+                """,
+                (url, JOB_COMPLETED, STAGE_PENDING, JOB_COMPLETED, JOB_ACTIVE, now, video_id)
+            )
+            
+        job = self.get(video_id)
+        if job['stage'] != STAGE_PENDING:
+            self.logger.info(f"Resuming video {video_id} after stage '{job['stage']}'")
+        return job
+    
+    def advance(self, video_id: str, stage: str, **artifacts: Any) -> None:
+        """
+        Record that a job finished a stage, merging in the stage's artifacts.
+        
+        Args:
+            video_id: YouTube video ID
+            stage: Stage just finished (one of STAGES)
+            **artifacts: JSON-serializable values produced by the stage
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown job stage: {stage}")
+            
+        status = JOB_COMPLETED if stage == STAGES[-1] else JOB_ACTIVE
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT artifacts FROM jobs WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            merged = json.loads(row['artifacts']) if row else {}
+            merged.update(artifacts)
+            self._conn.execute(
+                """
+                UPDATE jobs SET stage = ?, status = ?, artifacts = ?, updated_at = ?
+                WHERE video_id = ?
+                """,
+                (stage, status, json.dumps(merged), time.time(), video_id)
+            )
+    
+    def fail(self, video_id: str, error: str) -> None:
+        """
+        Mark a job as failed, keeping its stage so it can resume later.
+        
+        Args:
+            video_id: YouTube video ID
+            error: Error message
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE video_id = ?",
+                (JOB_FAILED, error, time.time(), video_id)
+            )
+    
+    def incomplete(self, failed_since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Get jobs that were interrupted or failed before completing.
+        
+        Args:
+            failed_since: If given, leave out failed jobs whose last update
+                is older than this timestamp
+        
+        Returns:
+            Job dictionaries ordered by creation time
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT * FROM jobs
+                WHERE status != ? AND NOT (status = ? AND updated_at < ?)
+                ORDER BY created_at
+                """,
+                (JOB_COMPLETED, JOB_FAILED, failed_since if failed_since is not None else 0)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+    
+    @staticmethod
+    def reached(job: Optional[Dict[str, Any]], stage: str) -> bool:
+        """
+        Check whether a job has already finished a stage.
+        
+        Args:
+            job: Job dictionary or None
+            stage: Stage to check (one of STAGES)
+            
+        Returns:
+            True if the job's recorded stage is at or past the given stage
+        """
+        if not job:
+            return False
+        return STAGES.index(job['stage']) >= STAGES.index(stage)
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
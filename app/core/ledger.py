@@ -0,0 +1,135 @@
+"""
+Persistent ledger of videos that have been fully processed.
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.utils.exceptions import ProcessingError
+from app.utils.helpers import connect_database
+
+class ProcessedLedger:
+    """
+    Index of completed videos keyed by YouTube video ID.
+    
+    Entries are stored in SQLite and mirrored in memory, so checking
+    whether a video is already done is a dictionary lookup that needs
+    neither disk nor network access.
+    """
+    
+    def __init__(self, db_path: Path):
+        """
+        Initialize the ledger and load all entries into memory.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            
+        Raises:
+            ProcessingError: If the database cannot be opened
+        """
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        
+        try:
+            self._conn = connect_database(db_path)
+            with self._conn:
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS processed (
+                        video_id TEXT PRIMARY KEY,
+                        title TEXT,
+                        video_path TEXT,
+                        drive_file_id TEXT,
+                        file_size INTEGER NOT NULL DEFAULT 0,
+                        checksum TEXT,
+                        completed_at REAL NOT NULL
+                    )
+                    """
+                )
+            self._entries: Dict[str, Dict[str, Any]] = {
+                row['video_id']: dict(row)
+                for row in self._conn.execute("SELECT * FROM processed")
+            }
+        except Exception as e:
+            raise ProcessingError(f"Failed to open ledger at {db_path}: {str(e)}")
+            
+        self.logger.debug(f"Loaded {len(self._entries)} processed videos from ledger")
+    
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a processed video.
+        
+        Args:
+            video_id: YouTube video ID
+            
+        Returns:
+            Ledger entry or None if the video has not been processed
+        """
+        entry = self._entries.get(video_id)
+        return dict(entry) if entry else None
+    
+    def record(
+        self,
+        video_id: str,
+        title: Optional[str],
+        video_path: Optional[str],
+        drive_file_id: Optional[str],
+        file_size: int,
+        checksum: Optional[str]
+    ) -> None:
+        """
+        Record a fully processed video, replacing any previous entry.
+        
+        Args:
+            video_id: YouTube video ID
+            title: Video title
+            video_path: Final local path of the video file
+            drive_file_id: Google Drive file ID, if uploaded
+            file_size: File size in bytes
+            checksum: SHA-256 hex digest of the file
+        """
+        entry = {
+            'video_id': video_id,
+            'title': title,
+            'video_path': video_path,
+            'drive_file_id': drive_file_id,
+            'file_size': file_size,
+            'checksum': checksum,
+            'completed_at': time.time()
+        }
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO processed
+                    (video_id, title, video_path, drive_file_id, file_size, checksum, completed_at)
+                VALUES
+                    (:video_id, :title, :video_path, :drive_file_id, :file_size, :checksum, :completed_at)
+                """,
+                entry
+            )
+            self._entries[video_id] = entry
+    
+    def remove(self, video_id: str) -> None:
+        """
+        Forget a processed video so it will be processed again.
+        
+        Args:
+            video_id: YouTube video ID
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM processed WHERE video_id = ?", (video_id,))
+            self._entries.pop(video_id, None)
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,209 @@
+"""
+On-disk cache of normalized video metadata.
+"""
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from app.utils.exceptions import ConfigurationError
+from app.utils.helpers import connect_database
+
+class MetadataCache:
+    """
+    SQLite cache of get_video_info results keyed by video ID.
+    
+    Entries expire after a fixed time to live. Expired entries are never
+    returned, but are only swept from the database every expire_interval
+    seconds. When the cache grows past its entry or byte limit, the least
+    recently used entries are evicted.
+    
+    Methods block on SQLite; async callers should run them on an executor.
+    """
+    
+    def __init__(
+        self,
+        db_path: Path,
+        ttl: float,
+        max_entries: int = 0,
+        max_bytes: int = 0,
+        expire_interval: float = 3600
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            ttl: Seconds an entry stays valid
+            max_entries: Maximum number of entries (0 for no limit)
+            max_bytes: Maximum total size of stored metadata (0 for no limit)
+            expire_interval: Minimum seconds between sweeps of expired entries
+            
+        Raises:
+            ConfigurationError: If the database cannot be opened
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.expire_interval = expire_interval
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._next_expiry = 0.0
+        
+        try:
+            self._conn = connect_database(db_path)
+            with self._conn:
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS metadata (
+                        video_id TEXT PRIMARY KEY,
+                        data TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        created_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL
+                    )
+                    """
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS metadata_accessed ON metadata (accessed_at)"
+                )
+                self._count, self._bytes = self._totals()
+        except Exception as e:
+            raise ConfigurationError(f"Failed to open metadata cache at {db_path}: {str(e)}")
+    
+    def _totals(self) -> Tuple[int, int]:
+        """
+        Count the stored entries and their size.
+        
+        Returns:
+            Number of entries and total bytes
+        """
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM metadata"
+        ).fetchone()
+        return count, total
+    
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up cached metadata.
+        
+        Args:
+            video_id: YouTube video ID
+            
+        Returns:
+            Metadata dictionary, or None if missing or expired
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT data, created_at FROM metadata WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            
+            if row and now - row['created_at'] <= self.ttl:
+                self._conn.execute(
+                    "UPDATE metadata SET accessed_at = ? WHERE video_id = ?", (now, video_id)
+                )
+                self.hits += 1
+                return json.loads(row['data'])
+                
+            if row:
+                self._conn.execute("DELETE FROM metadata WHERE video_id = ?", (video_id,))
+                self._count -= 1
+                self._bytes -= len(row['data'])
+            self.misses += 1
+            return None
+    
+    def put(self, video_id: str, metadata: Dict[str, Any]) -> None:
+        """
+        Store metadata and evict entries beyond the configured limits.
+        
+        Args:
+            video_id: YouTube video ID
+            metadata: JSON-serializable metadata dictionary
+        """
+        data = json.dumps(metadata)
+        now = time.time()
+        with self._lock, self._conn:
+            old = self._conn.execute(
+                "SELECT size FROM metadata WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            if old:
+                self._count -= 1
+                self._bytes -= old['size']
+                
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO metadata (video_id, data, size, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (video_id, data, len(data), now, now)
+            )
+            self._count += 1
+            self._bytes += len(data)
+            self._evict(now)
+    
+    def _evict(self, now: float) -> None:
+        """
+        Drop expired entries if a sweep is due, then least recently used
+        ones over the limits.
+        
+        Must be called with the lock held inside a transaction.
+        
+        Args:
+            now: Current timestamp
+        """
+        if time.monotonic() >= self._next_expiry:
+            self._next_expiry = time.monotonic() + self.expire_interval
+            expired = self._conn.execute(
+                "DELETE FROM metadata WHERE created_at < ?", (now - self.ttl,)
+            ).rowcount
+            if expired:
+                self._count, self._bytes = self._totals()
+                self.logger.debug(f"Expired {expired} metadata cache entries")
+                
+        count, total = self._count, self._bytes
+        if (not self.max_entries or count <= self.max_entries) and \
+                (not self.max_bytes or total <= self.max_bytes):
+            return
+            
+        evicted = 0
+        while (self.max_entries and count > self.max_entries) or \
+                (self.max_bytes and total > self.max_bytes):
+            # Oldest entries in small batches instead of reading the whole table
+            rows = self._conn.execute(
+                "SELECT video_id, size FROM metadata ORDER BY accessed_at LIMIT 32"
+            ).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                if (not self.max_entries or count <= self.max_entries) and \
+                        (not self.max_bytes or total <= self.max_bytes):
+                    break
+                self._conn.execute("DELETE FROM metadata WHERE video_id = ?", (row['video_id'],))
+                count -= 1
+                total -= row['size']
+                evicted += 1
+                
+        self._count, self._bytes = count, total
+        self.logger.debug(f"Evicted {evicted} metadata cache entries")
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache usage statistics.
+        
+        Returns:
+            Dictionary with entries, bytes, hits and misses
+        """
+        with self._lock:
+            count, total = self._count, self._bytes
+        return {'entries': count, 'bytes': total, 'hits': self.hits, 'misses': self.misses}
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
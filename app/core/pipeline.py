@@ -0,0 +1,201 @@
+"""
+Staged processing pipeline with a bounded queue and worker pool per stage.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Marks the end of input on a stage queue
+_DONE = object()
+
+class PipelineStage:
+    """A single pipeline stage: a handler with its own queue and workers."""
+    
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Dict[str, Any]], Awaitable[None]],
+        workers: int = 1,
+        queue_size: int = 0
+    ):
+        """
+        Initialize the stage.
+        
+        Args:
+            name: Stage name used in logs and queue statistics
+            handler: Coroutine function that advances a job in place
+            workers: Number of jobs this stage works on at once
+            queue_size: Maximum jobs waiting for this stage (0 for unbounded)
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.queue: Optional[asyncio.Queue] = None
+        self.active = 0
+        self.processed = 0
+        self.failed = 0
+        self.busy_time = 0.0
+
+class VideoPipeline:
+    """
+    Runs jobs through a sequence of stages concurrently.
+    
+    Every stage pulls jobs from its own bounded queue, so a slow stage
+    fills its queue and applies back-pressure upstream while the other
+    stages keep working on different videos.
+    """
+    
+    def __init__(
+        self,
+        stages: List[PipelineStage],
+        stats_interval: float = 0
+    ):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            stages: Stages in execution order
+            stats_interval: Seconds between queue statistics log lines (0 disables)
+        """
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        
+        self.stages = stages
+        self.stats_interval = stats_interval
+        self.logger = logging.getLogger(__name__)
+    
+    def queue_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a snapshot of every stage queue.
+        
+        The stage with the fullest queue is the bottleneck: jobs are
+        arriving faster than its workers can finish them.
+        
+        Returns:
+            Mapping of stage name to queued, capacity, active, workers,
+            processed, failed, fill ratio and busy time values
+        """
+        stats = {}
+        for stage in self.stages:
+            queued = stage.queue.qsize() if stage.queue else 0
+            stats[stage.name] = {
+                'queued': queued,
+                'capacity': stage.queue_size,
+                'fill': queued / stage.queue_size if stage.queue_size else 0.0,
+                'active': stage.active,
+                'workers': stage.workers,
+                'processed': stage.processed,
+                'failed': stage.failed,
+                'busy_time': stage.busy_time
+            }
+        return stats
+    
+    async def run(
+        self,
+        jobs: List[Dict[str, Any]],
+        on_error: Callable[[Dict[str, Any], str, Exception], None]
+    ) -> List[Dict[str, Any]]:
+        """
+        Run jobs through all stages.
+        
+        A job whose handler raises leaves the pipeline at that stage and is
+        reported through on_error; the remaining jobs are unaffected.
+        
+        Args:
+            jobs: Job dictionaries, advanced in place by the stage handlers
+            on_error: Callback receiving the job, stage name and exception
+        
+        Returns:
+            The same job dictionaries, in input order
+        """
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(maxsize=stage.queue_size)
+            stage.active = stage.processed = stage.failed = 0
+            stage.busy_time = 0.0
+        
+        workers = []
+        for index, stage in enumerate(self.stages):
+            next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+            workers.append([
+                asyncio.create_task(self._worker(stage, next_stage, on_error))
+                for _ in range(stage.workers)
+            ])
+        
+        monitor = None
+        if self.stats_interval > 0:
+            monitor = asyncio.create_task(self._monitor())
+        
+        try:
+            for job in jobs:
+                await self.stages[0].queue.put(job)
+            
+            # Close each stage once every worker of the previous one has exited
+            for index, stage in enumerate(self.stages):
+                for _ in range(stage.workers):
+                    await stage.queue.put(_DONE)
+                await asyncio.gather(*workers[index])
+        
+        finally:
+            for task in (t for stage_workers in workers for t in stage_workers):
+                task.cancel()
+            if monitor:
+                monitor.cancel()
+        
+        self._log_stats()
+        return jobs
+    
+    async def _worker(
+        self,
+        stage: PipelineStage,
+        next_stage: Optional[PipelineStage],
+        on_error: Callable[[Dict[str, Any], str, Exception], None]
+    ) -> None:
+        """
+        Pull jobs from a stage queue until it is closed.
+        
+        Args:
+            stage: Stage this worker serves
+            next_stage: Stage receiving successful jobs, if any
+            on_error: Callback for failed jobs
+        """
+        while True:
+            job = await stage.queue.get()
+            if job is _DONE:
+                return
+            
+            stage.active += 1
+            started = time.monotonic()
+            try:
+                await stage.handler(job)
+                stage.processed += 1
+            
+            except Exception as e:
+                stage.failed += 1
+                on_error(job, stage.name, e)
+                continue
+            
+            finally:
+                stage.active -= 1
+                stage.busy_time += time.monotonic() - started
+            
+            if next_stage:
+                await next_stage.queue.put(job)
+    
+    async def _monitor(self) -> None:
+        """Log queue statistics periodically while the pipeline runs."""
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            self._log_stats()
+    
+    def _log_stats(self) -> None:
+        """Log one line per stage with its queue depth and progress."""
+        for name, stats in self.queue_stats().items():
+            capacity = stats['capacity'] or 'unbounded'
+            self.logger.info(
+                f"Stage '{name}': {stats['queued']}/{capacity} queued, "
+                f"{stats['active']}/{stats['workers']} active, "
+                f"{stats['processed']} done, {stats['failed']} failed"
+            )
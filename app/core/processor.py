@@ -4,17 +4,41 @@ Main video processor that orchestrates the download and upload process.
 
 import logging
 import asyncio
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
 
 from app.config.settings import Settings
+from app.core.disk_scheduler import DiskSpaceScheduler
 from app.core.downloader import YouTubeDownloader
+from app.core.ledger import ProcessedLedger
+from app.core.job_store import (
+    JobStore, STAGE_INFO_FETCHED, STAGE_DOWNLOADED, STAGE_UPLOADED, STAGE_SHEET_UPDATED
+)
+from app.core.pipeline import PipelineStage, VideoPipeline
+from app.core.retention import ProcessedRetention
 from app.services.google_drive import GoogleDriveService
 from app.services.google_sheets import GoogleSheetsService
+from app.utils.bandwidth import BandwidthGovernor
 from app.utils.exceptions import (
     YouTubeManagerError, ValidationError, ProcessingError
 )
-from app.utils.validators import validate_youtube_url
+from app.utils.executors import BlockingExecutor
+from app.utils.helpers import file_digests
+from app.utils.validators import validate_youtube_url, validate_youtube_playlist_url
+
+# Job store stage reached by each processing stage, and the job fields it persists
+_JOB_STAGES = {
+    'info': (STAGE_INFO_FETCHED, ('info',)),
+    'download': (STAGE_DOWNLOADED, ('video_path', 'file_size', 'checksum', 'md5', 'format_plan')),
+    'upload': (STAGE_UPLOADED, ('drive_file_id',)),
+    'sheet': (STAGE_SHEET_UPDATED, ())
+}
+
+# Result statuses reported for each entry of a batch
+STATUS_SUCCEEDED = 'succeeded'
+STATUS_FAILED = 'failed'
+STATUS_SKIPPED = 'skipped'
 
 class VideoProcessor:
     """Main class for processing YouTube videos."""
@@ -29,86 +53,673 @@ class VideoProcessor:
         self.settings = settings
         self.logger = logging.getLogger(__name__)
         
+        # Blocking library calls run on shared pools so jobs overlap on one event loop
+        self.executor = BlockingExecutor(settings)
+        
+        # Download and upload rate limits shared by every job
+        self.bandwidth = BandwidthGovernor(settings)
+        
         # Initialize services
-        self.downloader = YouTubeDownloader(settings)
-        self.drive = GoogleDriveService(settings)
-        self.sheets = GoogleSheetsService(settings)
+        self.downloader = YouTubeDownloader(settings, self.executor, self.bandwidth)
+        self.drive = GoogleDriveService(settings, self.executor, self.bandwidth)
+        self.sheets = GoogleSheetsService(settings, self.executor)
+        
+        # Durable per-video progress so interrupted jobs resume where they stopped
+        self.jobs = JobStore(settings.JOB_DB_PATH)
+        
+        # Index of finished videos, checked before any network call
+        self.ledger = ProcessedLedger(settings.LEDGER_DB_PATH)
+        
+        # Kept video files, evicted by size and age once they are in Drive
+        self.retention = ProcessedRetention(
+            settings.RETENTION_DB_PATH,
+            max_bytes=settings.RETENTION_MAX_BYTES,
+            max_age=settings.RETENTION_MAX_AGE
+        )
+        self.retention.enforce()
+        
+        # Partial downloads of interrupted jobs are kept so they can resume;
+        # those of failed jobs only until they have stayed failed for a while
+        failed_since = time.time() - settings.FAILED_JOB_TEMP_RETENTION
+        self.downloader.reclaim_temp_files(
+            keep_ids=[job['video_id'] for job in self.jobs.incomplete(failed_since)]
+        )
+        
+        # Downloads wait here until their expected size fits on disk
+        self.disk = DiskSpaceScheduler(settings)
+        
+        # Staged pipeline of the current batch, exposed for queue statistics
+        self.pipeline: Optional[VideoPipeline] = None
         
         # Ensure directories exist
         settings.initialize_directories()
     
-    async def process_video(self, video_url: str) -> None:
+    async def process_video(
+        self,
+        video_url: str,
+        force: bool = False,
+        priority: float = 1.0
+    ) -> Dict[str, Any]:
         """
         Process a single video URL.
         
+        Videos found in the processed ledger are returned immediately
+        without contacting YouTube, Drive or Sheets.
+        
         Args:
             video_url: YouTube video URL to process
+            force: Process the video even if the ledger says it is done
+            priority: Bandwidth weight relative to other jobs of this process
+        
+        Returns:
+            Dictionary with the video ID, title, local path, Drive file ID,
+            file size and per-stage timings
             
         Raises:
             ProcessingError: If video processing fails
         """
         try:
-            # Extract video ID and get info
             video_id = validate_youtube_url(video_url)
-            video_info = await self.downloader.get_video_info(video_url)
+            if not force and video_id in self.ledger:
+                return self._ledger_outcome(video_id)
+                
+            job = self._new_job(video_url, priority)
+            for name, handler in self._stages():
+                await self._run_stage(job, name, handler)
             
-            # Add to spreadsheet first
-            await self.sheets.add_video(video_info)
+            self._complete_job(job)
+            self.logger.info(f"Successfully processed video: {job['info']['title']}")
+            return self._job_outcome(job)
             
-            # Download the video with metadata
-            video_path = await self.downloader.download_video(
-                video_url,
-                video_info
-            )
+        except Exception as e:
+            raise ProcessingError(f"Processing error: {str(e)}")
+    
+    def _new_job(self, video_url: str, priority: float = 1.0) -> Dict[str, Any]:
+        """
+        Create the state dictionary that is carried through the stages.
+        
+        Args:
+            video_url: YouTube video URL to process
+            priority: Bandwidth weight relative to other jobs of this process
+        
+        Returns:
+            Job dictionary, including the stored record of earlier attempts
+            
+        Raises:
+            ValidationError: If the URL is not a valid YouTube video URL
+        """
+        video_id = validate_youtube_url(video_url)
+        
+        return {
+            'url': video_url,
+            'video_id': video_id,
+            'priority': priority,
+            'info': None,
+            'video_path': None,
+            'file_size': 0,
+            'checksum': None,
+            'md5': None,
+            'format_plan': None,
+            'drive_file_id': None,
+            'stage_times': {},
+            'started': time.monotonic(),
+            'record': self.jobs.start(video_id, video_url)
+        }
+    
+    def _stages(self) -> List[Tuple[str, Callable[[Dict[str, Any]], Awaitable[None]]]]:
+        """
+        Get the processing stages in execution order.
+        
+        Returns:
+            List of (stage name, handler) pairs
+        """
+        return [
+            ('info', self._fetch_info),
+            ('download', self._download),
+            ('upload', self._upload),
+            ('sheet', self._update_sheet)
+        ]
+    
+    async def _run_stage(
+        self,
+        job: Dict[str, Any],
+        name: str,
+        handler: Callable[[Dict[str, Any]], Awaitable[None]]
+    ) -> None:
+        """
+        Run one stage for a job and record how long it took.
+        
+        A stage already finished by an earlier attempt is not run again;
+        its artifacts are restored from the job store instead. Otherwise
+        the stage's artifacts are persisted as soon as it finishes.
+        
+        Args:
+            job: Job dictionary
+            name: Stage name
+            handler: Stage handler
+        """
+        stage, artifact_keys = _JOB_STAGES[name]
+        if self._restore_stage(job, name):
+            self.logger.info(f"Skipping stage '{name}' for {job['video_id']}: already done")
+            return
+            
+        started = time.monotonic()
+        try:
+            await handler(job)
+        except Exception as e:
+            self.jobs.fail(job['video_id'], f"{name}: {str(e)}")
+            raise
+        finally:
+            job['stage_times'][name] = time.monotonic() - started
+            
+        self.jobs.advance(
+            job['video_id'],
+            stage,
+            **{
+                key: str(job[key]) if isinstance(job[key], Path) else job[key]
+                for key in artifact_keys
+            }
+        )
+    
+    def _restore_stage(self, job: Dict[str, Any], name: str) -> bool:
+        """
+        Restore a stage's artifacts from a previous attempt, if it finished.
+        
+        Args:
+            job: Job dictionary
+            name: Stage name
+            
+        Returns:
+            True if the stage can be skipped
+        """
+        record = job['record']
+        stage, artifact_keys = _JOB_STAGES[name]
+        if not JobStore.reached(record, stage):
+            return False
             
-            if self.settings.UPLOAD_TO_DRIVE and self.drive:
-                # Upload to Drive
-                file_id = await self.drive.upload_file(
-                    video_path,
-                    title=video_info['title']
+        artifacts = record['artifacts']
+        if name == 'download':
+            # The file is only needed again if it has not been uploaded yet
+            video_path = Path(artifacts['video_path'])
+            if not video_path.exists() and not JobStore.reached(record, STAGE_UPLOADED):
+                return False
+            artifacts = dict(artifacts, video_path=video_path)
+            
+        for key in artifact_keys:
+            job[key] = artifacts.get(key)
+        return True
+    
+    async def _fetch_info(self, job: Dict[str, Any]) -> None:
+        """
+        Resolve video metadata and add the video to the spreadsheet.
+        
+        Args:
+            job: Job dictionary
+        """
+        job['info'] = await self.downloader.get_video_info(job['url'])
+        
+        # Add to spreadsheet first
+        await self.sheets.add_video(job['info'])
+    
+    async def _download(self, job: Dict[str, Any]) -> None:
+        """
+        Plan which streams to fetch, then download the video file once its
+        expected size fits on disk. A file still kept from an earlier run
+        is reused instead.
+        
+        Args:
+            job: Job dictionary
+        """
+        video_path = self.retention.lookup(job['video_id'])
+        if video_path:
+            self.logger.info(f"Reusing kept file for {job['video_id']}: {video_path}")
+        else:
+            job['format_plan'] = await self.downloader.plan_formats(job['url'], job['video_id'])
+            
+            estimated_size = (job['format_plan'] or {}).get('estimated_size', 0)
+            async with self.disk.reserve(job['video_id'], estimated_size):
+                video_path = await self.downloader.download_video(
+                    job['url'],
+                    job['info'],
+                    format_plan=job['format_plan'],
+                    priority=job['priority']
                 )
-                if file_id:
-                    await self.sheets.update_video_status(
-                        video_id=video_id,
-                        status="Completed",
-                        drive_file_id=file_id,
-                        title=video_info['title']
-                    )
-                    
-                    # Delete local file if not keeping files
-                    if not self.settings.KEEP_FILES:
-                        video_path.unlink()
-                        self.logger.info(f"Deleted local file: {video_path}")
-            else:
-                # Keep local file and update status as completed locally
+        job['video_path'] = video_path
+        job['file_size'] = video_path.stat().st_size
+        
+        # One read for both digests; the MD5 is checked against Drive after the upload
+        digests = await self.executor.run('download', file_digests, video_path, ('sha256', 'md5'))
+        job['checksum'] = digests['sha256']
+        job['md5'] = digests['md5']
+    
+    async def _upload(self, job: Dict[str, Any]) -> None:
+        """
+        Upload the downloaded file to Drive when uploads are enabled.
+        
+        Args:
+            job: Job dictionary
+        """
+        if self.settings.UPLOAD_TO_DRIVE and self.drive:
+            job['drive_file_id'] = await self.drive.upload_file(
+                job['video_path'],
+                title=job['info']['title'],
+                priority=job['priority'],
+                md5=job['md5'],
+                video_id=job['video_id']
+            )
+    
+    async def _update_sheet(self, job: Dict[str, Any]) -> None:
+        """
+        Record the final status in the spreadsheet and tidy up local files.
+        
+        Args:
+            job: Job dictionary
+        """
+        video_path = job['video_path']
+        title = job['info']['title']
+        
+        if self.settings.UPLOAD_TO_DRIVE and self.drive:
+            if job['drive_file_id']:
                 await self.sheets.update_video_status(
-                    video_id=video_id,
-                    status="Completed Locally",
-                    drive_file_id=str(video_path),  # Store local file path instead of Drive ID
-                    title=video_info['title']
+                    video_id=job['video_id'],
+                    status="Completed",
+                    drive_file_id=job['drive_file_id'],
+                    title=title
                 )
-                self.logger.info(f"Video saved locally at: {video_path}")
-            
-            self.logger.info(f"Successfully processed video: {video_info['title']}")
+                
+                # Delete local file if not keeping files
+                if not self.settings.KEEP_FILES:
+                    video_path.unlink()
+                    self.retention.discard(job['video_id'])
+                    self.logger.info(f"Deleted local file: {video_path}")
+                else:
+                    self.retention.add(job['video_id'], video_path, uploaded=True)
+        else:
+            # Keep local file and update status as completed locally
+            await self.sheets.update_video_status(
+                video_id=job['video_id'],
+                status="Completed Locally",
+                drive_file_id=str(video_path),  # Store local file path instead of Drive ID
+                title=title
+            )
+            self.retention.add(job['video_id'], video_path, uploaded=False)
+            self.logger.info(f"Video saved locally at: {video_path}")
+    
+    def _complete_job(self, job: Dict[str, Any]) -> None:
+        """
+        Record a successfully processed video in the ledger.
+        
+        Args:
+            job: Job dictionary that finished every stage
+        """
+        self.ledger.record(
+            job['video_id'],
+            title=job['info']['title'],
+            video_path=str(job['video_path']),
+            drive_file_id=job['drive_file_id'],
+            file_size=job['file_size'],
+            checksum=job['checksum']
+        )
+    
+    def _ledger_outcome(self, video_id: str) -> Dict[str, Any]:
+        """
+        Build the outcome of a video that was already processed.
+        
+        Args:
+            video_id: YouTube video ID found in the ledger
             
-        except Exception as e:
-            raise ProcessingError(f"Processing error: {str(e)}")
+        Returns:
+            Dictionary with the same fields as a processed video
+        """
+        entry = self.ledger.get(video_id)
+        self.logger.info(f"Video {video_id} already processed, skipping")
+        return {
+            'video_id': video_id,
+            'title': entry['title'],
+            'video_path': entry['video_path'],
+            'drive_file_id': entry['drive_file_id'],
+            'file_size': entry['file_size'],
+            'checksum': entry['checksum'],
+            'format_plan': None,
+            'stage_times': {},
+            'already_processed': True
+        }
+    
+    @staticmethod
+    def _job_outcome(job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Summarize a finished job.
+        
+        Args:
+            job: Job dictionary
+        
+        Returns:
+            Dictionary with the fields reported for a processed video
+        """
+        return {
+            'video_id': job['video_id'],
+            'title': job['info']['title'] if job['info'] else None,
+            'video_path': str(job['video_path']) if job['video_path'] else None,
+            'drive_file_id': job['drive_file_id'],
+            'file_size': job['file_size'],
+            'checksum': job['checksum'],
+            'format_plan': job['format_plan'],
+            'stage_times': dict(job['stage_times']),
+            'already_processed': False
+        }
     
-    async def process_playlist(self, playlist_url: str) -> List[Dict[str, Any]]:
+    async def process_playlist(
+        self,
+        playlist_url: str,
+        max_workers: Optional[int] = None,
+        pipeline: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
         """
         Process all videos in a playlist.
         
         Args:
             playlist_url: YouTube playlist URL
+            max_workers: Maximum number of videos processed at once
+                (defaults to Settings.MAX_CONCURRENT_VIDEOS)
+            pipeline: Run through the staged pipeline (defaults to Settings.PIPELINE_MODE)
             
         Returns:
-            List of processing results for each video
+            List of processing results for each video, in playlist order
             
         Raises:
-            ProcessingError: If processing fails
+            ProcessingError: If the playlist cannot be expanded
+        """
+        try:
+            validate_youtube_playlist_url(playlist_url)
+            entries = await self.downloader.get_playlist_entries(playlist_url)
+        except Exception as e:
+            raise ProcessingError(f"Playlist error: {str(e)}")
+        
+        # Unavailable and repeated entries are reported but never processed
+        skipped = {}
+        to_process = {}
+        for index, entry in enumerate(entries):
+            if not entry['available']:
+                skipped[index] = "Video is private or has been removed"
+            elif entry['id'] in to_process:
+                skipped[index] = "Duplicate playlist entry"
+            else:
+                to_process[entry['id']] = entry['url']
+        
+        results = await self.process_batch(
+            list(to_process.values()),
+            max_workers=max_workers,
+            pipeline=pipeline
+        )
+        by_id = dict(zip(to_process, results))
+        
+        ordered = []
+        for index, entry in enumerate(entries):
+            if index in skipped:
+                ordered.append(self._make_result(
+                    entry['url'],
+                    video_id=entry['id'],
+                    title=entry['title'],
+                    status=STATUS_SKIPPED,
+                    error=skipped[index]
+                ))
+            else:
+                ordered.append(by_id[entry['id']])
+        
+        self._log_batch_summary(ordered)
+        return ordered
+    
+    async def process_batch(
+        self,
+        video_urls: List[str],
+        max_workers: Optional[int] = None,
+        pipeline: Optional[bool] = None,
+        priorities: Optional[Dict[str, float]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Process many videos concurrently with a bounded number of workers.
+
+        A failure in one video never aborts the others; it is reported in
+        that video's result instead.
+
+        Args:
+            video_urls: YouTube video URLs to process
+            max_workers: Maximum number of videos processed at once
+                (defaults to Settings.MAX_CONCURRENT_VIDEOS)
+            pipeline: Run through the staged pipeline instead of whole-video
+                workers (defaults to Settings.PIPELINE_MODE)
+            priorities: Bandwidth weight of each URL relative to the other
+                videos; URLs without one get 1.0
+
+        Returns:
+            List of results in the same order as video_urls
+        """
+        priorities = priorities or {}
+        if pipeline is None:
+            pipeline = self.settings.PIPELINE_MODE
+        if pipeline:
+            return await self._process_pipeline(video_urls, priorities)
+
+        max_workers = max(1, max_workers or self.settings.MAX_CONCURRENT_VIDEOS)
+        semaphore = asyncio.Semaphore(max_workers)
+        
+        self.logger.info(
+            f"Processing {len(video_urls)} videos with {max_workers} workers"
+        )
+        
+        async def _run(video_url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._process_entry(video_url, priorities.get(video_url, 1.0))
+        
+        return list(await asyncio.gather(*(_run(url) for url in video_urls)))
+    
+    async def _process_entry(self, video_url: str, priority: float = 1.0) -> Dict[str, Any]:
+        """
+        Process one batch entry and capture its outcome and timing.
+        
+        Args:
+            video_url: YouTube video URL to process
+            priority: Bandwidth weight relative to other jobs of this process
+        
+        Returns:
+            Result dictionary for the entry
+        """
+        started = time.monotonic()
+        
+        try:
+            video_id = validate_youtube_url(video_url)
+        except ValidationError as e:
+            return self._make_result(video_url, status=STATUS_SKIPPED, error=str(e))
+        
+        try:
+            outcome = await self.process_video(video_url, priority=priority)
+            return self._make_result(
+                video_url,
+                status=STATUS_SKIPPED if outcome['already_processed'] else STATUS_SUCCEEDED,
+                error="Already processed" if outcome['already_processed'] else None,
+                elapsed=time.monotonic() - started,
+                **outcome
+            )
+        
+        except YouTubeManagerError as e:
+            self.logger.error(f"Failed to process {video_url}: {str(e)}")
+            return self._make_result(
+                video_url,
+                video_id=video_id,
+                status=STATUS_FAILED,
+                error=str(e),
+                elapsed=time.monotonic() - started
+            )
+    
+    async def _process_pipeline(
+        self,
+        video_urls: List[str],
+        priorities: Optional[Dict[str, float]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Process videos through the staged pipeline.
+        
+        Each stage has its own queue and worker count, so one video can be
+        downloading while another uploads and a third updates the sheet.
+        
+        Args:
+            video_urls: YouTube video URLs to process
+            priorities: Bandwidth weight of each URL; URLs without one get 1.0
+        
+        Returns:
+            List of results in the same order as video_urls
         """
-        # TODO: Implement playlist processing
-        raise NotImplementedError("Playlist processing not yet implemented")
+        priorities = priorities or {}
+        workers = {
+            'info': self.settings.PIPELINE_INFO_WORKERS,
+            'download': self.settings.PIPELINE_DOWNLOAD_WORKERS,
+            'upload': self.settings.PIPELINE_UPLOAD_WORKERS,
+            'sheet': self.settings.PIPELINE_SHEET_WORKERS
+        }
+        
+        def _stage(name: str, handler: Callable) -> PipelineStage:
+            async def _handle(job: Dict[str, Any]) -> None:
+                await self._run_stage(job, name, handler)
+            return PipelineStage(
+                name,
+                _handle,
+                workers=workers[name],
+                queue_size=self.settings.PIPELINE_QUEUE_SIZE
+            )
+        
+        self.pipeline = VideoPipeline(
+            [_stage(name, handler) for name, handler in self._stages()],
+            stats_interval=self.settings.PIPELINE_STATS_INTERVAL
+        )
+        
+        results = {}
+        jobs = []
+        for index, video_url in enumerate(video_urls):
+            try:
+                video_id = validate_youtube_url(video_url)
+            except ValidationError as e:
+                results[index] = self._make_result(
+                    video_url, status=STATUS_SKIPPED, error=str(e)
+                )
+                continue
+                
+            if video_id in self.ledger:
+                results[index] = self._make_result(
+                    video_url,
+                    status=STATUS_SKIPPED,
+                    error="Already processed",
+                    **self._ledger_outcome(video_id)
+                )
+                continue
+                
+            job = self._new_job(video_url, priorities.get(video_url, 1.0))
+            job['index'] = index
+            jobs.append(job)
+        
+        def _on_error(job: Dict[str, Any], stage: str, error: Exception) -> None:
+            self.logger.error(f"Failed to process {job['url']} at stage '{stage}': {str(error)}")
+            job['error'] = f"{stage} stage failed: {str(error)}"
+        
+        self.logger.info(f"Processing {len(jobs)} videos through the staged pipeline")
+        await self.pipeline.run(jobs, on_error=_on_error)
+        
+        for job in jobs:
+            if not job.get('error'):
+                self._complete_job(job)
+            outcome = self._job_outcome(job)
+            results[job['index']] = self._make_result(
+                job['url'],
+                status=STATUS_FAILED if job.get('error') else STATUS_SUCCEEDED,
+                error=job.get('error'),
+                elapsed=time.monotonic() - job['started'],
+                **outcome
+            )
+        
+        return [results[index] for index in range(len(video_urls))]
+    
+    @staticmethod
+    def _make_result(video_url: str, **fields: Any) -> Dict[str, Any]:
+        """
+        Build a batch result dictionary with every key present.
+        
+        Args:
+            video_url: URL of the processed entry
+            **fields: Values overriding the defaults
+        
+        Returns:
+            Result dictionary
+        """
+        result = {
+            'url': video_url,
+            'video_id': None,
+            'title': None,
+            'status': STATUS_FAILED,
+            'error': None,
+            'video_path': None,
+            'drive_file_id': None,
+            'file_size': 0,
+            'checksum': None,
+            'format_plan': None,
+            'stage_times': {},
+            'already_processed': False,
+            'elapsed': 0.0
+        }
+        result.update(fields)
+        return result
+    
+    def _log_batch_summary(self, results: List[Dict[str, Any]]) -> None:
+        """
+        Log how many batch entries succeeded, failed or were skipped.
+        
+        Args:
+            results: Batch results
+        """
+        counts = {STATUS_SUCCEEDED: 0, STATUS_FAILED: 0, STATUS_SKIPPED: 0}
+        for result in results:
+            counts[result['status']] += 1
+        
+        self.logger.info(
+            f"Batch finished: {counts[STATUS_SUCCEEDED]} succeeded, "
+            f"{counts[STATUS_FAILED]} failed, {counts[STATUS_SKIPPED]} skipped"
+        )
+    
+    async def resume_incomplete(
+        self,
+        max_workers: Optional[int] = None,
+        pipeline: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Resume every job that was interrupted or failed in an earlier run.
+        
+        Each job continues after the last stage it finished.
+        
+        Args:
+            max_workers: Maximum number of videos processed at once
+            pipeline: Run through the staged pipeline (defaults to Settings.PIPELINE_MODE)
+            
+        Returns:
+            List of results for the resumed jobs
+        """
+        urls = [job['url'] for job in self.jobs.incomplete()]
+        self.logger.info(f"Resuming {len(urls)} incomplete jobs")
+        return await self.process_batch(
+            urls,
+            max_workers=max_workers,
+            pipeline=pipeline
+        )
+    
+    def close(self) -> None:
+        """Release worker pools and other resources held by the processor."""
+        try:
+            self.sheets.close()
+        except YouTubeManagerError as e:
+            self.logger.error(f"Spreadsheet writes left for the next run: {str(e)}")
+        self.executor.shutdown(wait=False)
+        self.downloader.close()
+        self.drive.close()
+        self.jobs.close()
+        self.ledger.close()
+        self.retention.close()
     
     def _download_progress(self, progress: float) -> None:
         """
@@ -0,0 +1,345 @@
+"""
+Multi-connection HTTP downloader using byte ranges.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPException
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.error import HTTPError, URLError
+
+from app.utils.exceptions import DownloadError
+
+_CONTENT_RANGE = re.compile(r'bytes\s+\d+-\d+/(\d+)')
+
+class RangedDownloader:
+    """
+    Fetches one HTTP resource over several connections at once.
+    
+    The resource is split into fixed-size byte ranges that a small pool of
+    connections works through in parallel, each writing straight into its
+    slot of a preallocated file. Servers throttle per connection, so the
+    combined throughput grows with the connection count. Servers that do
+    not honour Range requests are downloaded over a single connection.
+    """
+    
+    def __init__(
+        self,
+        connections: int = 4,
+        segment_size: int = 10 * 1024 * 1024,
+        timeout: float = 30,
+        retries: int = 3,
+        block_size: int = 64 * 1024,
+        checkpoint_bytes: int = 4 * 1024 * 1024
+    ):
+        """
+        Initialize the downloader.
+        
+        Args:
+            connections: Maximum parallel connections per resource
+            segment_size: Bytes requested per range
+            timeout: Socket timeout in seconds
+            retries: Attempts per range before the download fails
+            block_size: Bytes read from the socket per write
+            checkpoint_bytes: Bytes written to a range between offset checkpoints
+        """
+        self.connections = max(1, connections)
+        self.segment_size = max(block_size, segment_size)
+        self.timeout = timeout
+        self.retries = max(1, retries)
+        self.block_size = block_size
+        self.checkpoint_bytes = checkpoint_bytes
+        self.logger = logging.getLogger(__name__)
+    
+    def _open(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        byte_range: Optional[Tuple[int, int]] = None
+    ):
+        """
+        Open an HTTP request, optionally for an inclusive byte range.
+        
+        Args:
+            url: Resource URL
+            headers: Request headers
+            byte_range: (first, last) byte offsets, or None for the whole resource
+            
+        Returns:
+            HTTP response object
+        """
+        request = urllib.request.Request(url, headers=dict(headers))
+        if byte_range:
+            request.add_header('Range', f"bytes={byte_range[0]}-{byte_range[1]}")
+        return urllib.request.urlopen(request, timeout=self.timeout)
+    
+    def probe(self, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[Optional[int], bool]:
+        """
+        Find the size of a resource and whether it accepts range requests.
+        
+        Args:
+            url: Resource URL
+            headers: Request headers
+            
+        Returns:
+            Tuple of (total size or None if unknown, ranges supported)
+            
+        Raises:
+            DownloadError: If the server cannot be reached
+        """
+        try:
+            with self._open(url, headers or {}, (0, 0)) as response:
+                if response.status == 206:
+                    match = _CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+                    if match:
+                        return int(match.group(1)), True
+                length = response.headers.get('Content-Length')
+                return (int(length) if length else None), False
+        except (HTTPError, URLError, HTTPException, OSError) as e:
+            raise DownloadError(f"Failed to probe {url}: {str(e)}")
+    
+    def download(
+        self,
+        url: str,
+        dest: Path,
+        headers: Optional[Dict[str, str]] = None,
+        size: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        throttle: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Download a resource into a file, continuing an interrupted download.
+        
+        While a ranged download runs, the offset reached in every range is
+        checkpointed to a sidecar file (see state_path). If the process dies,
+        the next call for the same destination and size resumes each range
+        from its checkpoint; a destination without a sidecar and of the
+        expected size is already complete.
+        
+        Args:
+            url: Resource URL
+            dest: Destination file
+            headers: Request headers
+            size: Known total size in bytes; probed if not given
+            progress_callback: Called with (bytes done, total bytes)
+            throttle: Called with each block size before it is written; may
+                block to limit the transfer rate
+                
+        Returns:
+            Size of the downloaded resource in bytes
+            
+        Raises:
+            DownloadError: If any range fails after all retries
+        """
+        headers = headers or {}
+        total, ranged = self.probe(url, headers)
+        total = total or size
+        state_path = self.state_path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        
+        positions: Dict[int, int] = {}
+        if ranged and total:
+            segments = [
+                (start, min(start + self.segment_size, total) - 1)
+                for start in range(0, total, self.segment_size)
+            ]
+            state = self._load_state(state_path)
+            on_disk = dest.stat().st_size if dest.exists() else None
+            
+            if state is None and on_disk == total:
+                self.logger.info(f"{dest.name} was already downloaded")
+                return total
+                
+            if state and state.get('total') == total and on_disk == total:
+                positions = {int(start): position for start, position in state['positions'].items()}
+                self.logger.info(
+                    f"Resuming {dest.name} at {sum(p - s for s, p in positions.items())} of {total} bytes"
+                )
+            else:
+                # The sidecar goes first so a preallocated file is never mistaken for a finished one
+                self._save_state(state_path, total, positions)
+                with open(dest, 'wb') as f:
+                    f.truncate(total)
+        else:
+            segments = [(0, None)]
+            state_path.unlink(missing_ok=True)
+            open(dest, 'wb').close()
+            
+        done = [sum(positions.get(start, start) - start for start, _ in segments)]
+        lock = threading.Lock()
+        
+        def _advance(count: int) -> None:
+            with lock:
+                done[0] += count
+                current = done[0]
+            if progress_callback:
+                progress_callback(current, total or 0)
+        
+        def _checkpoint(start: int, position: int) -> None:
+            with lock:
+                positions[start] = position
+                self._save_state(state_path, total, positions)
+                
+        pending = [
+            (start, end) for start, end in segments
+            if end is None or positions.get(start, start) <= end
+        ]
+        
+        started = time.monotonic()
+        workers = max(1, min(self.connections, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='range') as pool:
+            futures = [
+                pool.submit(
+                    self._fetch_segment,
+                    url,
+                    headers,
+                    dest,
+                    start,
+                    end,
+                    positions.get(start, start),
+                    _advance,
+                    _checkpoint if end is not None else None,
+                    throttle
+                )
+                for start, end in pending
+            ]
+            errors = [f.exception() for f in futures if f.exception()]
+            
+        if errors:
+            raise DownloadError(f"Ranged download of {dest.name} failed: {str(errors[0])}")
+            
+        state_path.unlink(missing_ok=True)
+        
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.logger.debug(
+            f"Fetched {dest.name}: {len(pending)} of {len(segments)} ranges over "
+            f"{workers} connections ({done[0] / elapsed / 1024 / 1024:.1f} MiB/s)"
+        )
+        return total or done[0]
+    
+    @staticmethod
+    def state_path(dest: Path) -> Path:
+        """
+        Get the sidecar file holding the range offsets of a download.
+        
+        Args:
+            dest: Destination file
+            
+        Returns:
+            Path of the sidecar file
+        """
+        return dest.with_name(dest.name + '.ranges')
+    
+    @staticmethod
+    def _load_state(state_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Read a download's checkpointed offsets.
+        
+        Args:
+            state_path: Sidecar file
+            
+        Returns:
+            State dictionary, or None if there is no readable sidecar
+        """
+        try:
+            return json.loads(state_path.read_text())
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def _save_state(state_path: Path, total: int, positions: Dict[int, int]) -> None:
+        """
+        Atomically write a download's checkpointed offsets.
+        
+        Args:
+            state_path: Sidecar file
+            total: Total size of the resource
+            positions: Next byte to fetch for each range, keyed by range start
+        """
+        temp = state_path.with_name(state_path.name + '.tmp')
+        with open(temp, 'w') as f:
+            f.write(json.dumps({'total': total, 'positions': positions}))
+            f.flush()
+            # A torn sidecar would make a preallocated file look finished
+            os.fsync(f.fileno())
+        os.replace(temp, state_path)
+    
+    def _fetch_segment(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        dest: Path,
+        start: int,
+        end: Optional[int],
+        position: int,
+        advance: Callable[[int], None],
+        checkpoint: Optional[Callable[[int, int], None]] = None,
+        throttle: Optional[Callable[[int], None]] = None
+    ) -> None:
+        """
+        Download one byte range into its slot of the destination file.
+        
+        A failed attempt resumes from the last byte written.
+        
+        Args:
+            url: Resource URL
+            headers: Request headers
+            dest: Preallocated destination file
+            start: First byte offset of the range
+            end: Last byte offset (inclusive), or None to read to the end
+            position: Offset to continue from
+            advance: Called with the number of bytes written
+            checkpoint: Called with (start, position) once written data is on disk
+            throttle: Called with each block size before it is written
+        """
+        for attempt in range(1, self.retries + 1):
+            try:
+                byte_range = (position, end) if end is not None else None
+                with self._open(url, headers, byte_range) as response, open(dest, 'r+b') as f:
+                    if byte_range and response.status != 206:
+                        raise DownloadError(f"Server ignored range {position}-{end}")
+                    f.seek(position)
+                    unsaved = 0
+                    while True:
+                        block = response.read(self.block_size)
+                        if not block:
+                            break
+                        if throttle:
+                            throttle(len(block))
+                        f.write(block)
+                        position += len(block)
+                        unsaved += len(block)
+                        advance(len(block))
+                        if checkpoint and unsaved >= self.checkpoint_bytes:
+                            # The sidecar must never claim bytes a power loss could drop
+                            f.flush()
+                            os.fsync(f.fileno())
+                            checkpoint(start, position)
+                            unsaved = 0
+                    if end is None:
+                        f.truncate()
+                    f.flush()
+                    if checkpoint:
+                        os.fsync(f.fileno())
+                        checkpoint(start, position)
+                        
+                if end is None or position > end:
+                    return
+                raise DownloadError(f"Range {start}-{end} ended early at {position}")
+                
+            except (HTTPError, URLError, HTTPException, OSError, DownloadError) as e:
+                if attempt == self.retries:
+                    raise
+                if end is None:
+                    # Without range support the whole resource is fetched again
+                    advance(start - position)
+                    position = start
+                self.logger.debug(f"Retrying range {position}-{end} of {dest.name}: {str(e)}")
+                time.sleep(min(2 ** attempt, 10))
@@ -0,0 +1,195 @@
+"""
+Container finalization for downloaded videos.
+"""
+
+import json
+import logging
+import os
+import struct
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from app.config.settings import Settings
+from app.utils.exceptions import DownloadError
+
+# Codecs (as named by ffprobe) that the ffmpeg MP4 muxer accepts as-is
+MP4_VIDEO_CODECS = {'h264', 'hevc', 'av1', 'vp9', 'mpeg4'}
+MP4_AUDIO_CODECS = {'aac', 'mp3', 'opus', 'ac3', 'eac3', 'alac'}
+
+# Finalization paths, from cheapest to most expensive
+PATH_NONE = 'none'
+PATH_FASTSTART = 'faststart'
+PATH_REMUX = 'remux'
+PATH_TRANSCODE = 'transcode'
+
+class MediaRemuxer:
+    """
+    Turns a downloaded file into a streamable MP4 with as little work as possible.
+    
+    Streams whose codecs MP4 can hold are stream-copied; only incompatible
+    streams are re-encoded. The moov atom is moved to the front so players
+    can start before the whole file is read.
+    """
+    
+    def __init__(self, settings: Settings):
+        """
+        Initialize the remuxer.
+        
+        Args:
+            settings: Application settings
+        """
+        self.settings = settings
+        self.logger = logging.getLogger(__name__)
+    
+    def probe_streams(self, file_path: Path) -> List[Dict[str, Any]]:
+        """
+        List the audio and video streams of a media file.
+        
+        Args:
+            file_path: Path to the media file
+            
+        Returns:
+            List of dictionaries with 'codec_type' and 'codec_name' keys
+            
+        Raises:
+            DownloadError: If ffprobe fails
+        """
+        result = subprocess.run(
+            [
+                str(self.settings.FFPROBE_PATH),
+                '-v', 'error',
+                '-show_entries', 'stream=codec_type,codec_name',
+                '-of', 'json',
+                str(file_path)
+            ],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            raise DownloadError(f"ffprobe failed for {file_path.name}: {result.stderr.strip()}")
+            
+        streams = json.loads(result.stdout or '{}').get('streams', [])
+        return [s for s in streams if s.get('codec_type') in ('video', 'audio')]
+    
+    @staticmethod
+    def is_faststart(file_path: Path) -> bool:
+        """
+        Check whether an MP4 file has its moov atom before the media data.
+        
+        Only the top-level box headers are read.
+        
+        Args:
+            file_path: Path to an MP4 file
+            
+        Returns:
+            True if moov comes before mdat
+        """
+        with open(file_path, 'rb') as f:
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    return False
+                    
+                size, box_type = struct.unpack('>I4s', header)
+                if box_type == b'moov':
+                    return True
+                if box_type == b'mdat':
+                    return False
+                    
+                if size == 1:
+                    size = struct.unpack('>Q', f.read(8))[0] - 8
+                elif size == 0:
+                    return False
+                f.seek(size - 8, os.SEEK_CUR)
+    
+    def plan(self, sources: List[Path]) -> Tuple[str, List[str]]:
+        """
+        Choose the cheapest way to turn downloaded files into one faststart MP4.
+        
+        Args:
+            sources: Downloaded file, or separate video and audio files
+            
+        Returns:
+            Tuple of (finalization path, stream types that must be re-encoded)
+        """
+        streams = [stream for source in sources for stream in self.probe_streams(source)]
+        
+        transcode = []
+        for stream in streams:
+            allowed = MP4_VIDEO_CODECS if stream['codec_type'] == 'video' else MP4_AUDIO_CODECS
+            if stream.get('codec_name') not in allowed and stream['codec_type'] not in transcode:
+                transcode.append(stream['codec_type'])
+                
+        if transcode:
+            return PATH_TRANSCODE, transcode
+        if len(sources) > 1 or sources[0].suffix.lower() != '.mp4':
+            return PATH_REMUX, []
+        if self.settings.MP4_FASTSTART and not self.is_faststart(sources[0]):
+            return PATH_FASTSTART, []
+        return PATH_NONE, []
+    
+    def finalize(self, sources: List[Path], target: Path) -> str:
+        """
+        Write sources to target as one MP4, copying streams wherever possible.
+        
+        Args:
+            sources: Downloaded file in any container, or separate video and
+                audio files to merge
+            target: Destination .mp4 path (may equal a source)
+            
+        Returns:
+            The finalization path that was taken
+            
+        Raises:
+            DownloadError: If ffmpeg fails
+        """
+        path, transcode = self.plan(sources)
+        
+        if path == PATH_NONE:
+            if sources[0] != target:
+                os.replace(sources[0], target)
+            return path
+            
+        codec_args = ['-c', 'copy']
+        if 'video' in transcode:
+            codec_args += [
+                '-c:v', 'libx264',
+                '-preset', self.settings.TRANSCODE_PRESET,
+                '-crf', str(self.settings.TRANSCODE_CRF)
+            ]
+        if 'audio' in transcode:
+            codec_args += ['-c:a', 'aac', '-b:a', self.settings.TRANSCODE_AUDIO_BITRATE]
+            
+        movflags = ['-movflags', '+faststart'] if self.settings.MP4_FASTSTART else []
+        
+        inputs = []
+        maps = []
+        for index, source in enumerate(sources):
+            inputs += ['-i', str(source)]
+            maps += ['-map', f"{index}:v?", '-map', f"{index}:a?"]
+            
+        work_path = target.with_name(f"{target.stem}.{path}.mp4")
+        result = subprocess.run(
+            [
+                str(self.settings.FFMPEG_PATH),
+                '-y', '-v', 'error',
+                *inputs,
+                *maps,
+                '-dn',
+                *codec_args,
+                *movflags,
+                str(work_path)
+            ],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            work_path.unlink(missing_ok=True)
+            raise DownloadError(f"ffmpeg {path} failed: {result.stderr.strip()[-500:]}")
+            
+        os.replace(work_path, target)
+        for source in sources:
+            if source != target:
+                source.unlink(missing_ok=True)
+        return path
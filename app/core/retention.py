@@ -0,0 +1,208 @@
+"""
+Size and age bounded retention of processed video files.
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.utils.exceptions import ConfigurationError
+from app.utils.helpers import connect_database
+
+class ProcessedRetention:
+    """
+    SQLite index of the video files kept in PROCESSED_DIR.
+    
+    Every kept file is recorded with its size and last access time, so
+    usage is known without scanning the directory. When the files exceed
+    the size limit, or have not been used for longer than the age limit,
+    the least recently used ones are deleted. Only files that have been
+    uploaded to Drive are ever evicted; local-only files are the sole copy.
+    """
+    
+    def __init__(self, db_path: Path, max_bytes: int = 0, max_age: float = 0):
+        """
+        Initialize the index.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            max_bytes: Maximum total size of kept files (0 for no limit)
+            max_age: Seconds a file may go unused before eviction (0 for no limit)
+            
+        Raises:
+            ConfigurationError: If the database cannot be opened
+        """
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        
+        try:
+            self._conn = connect_database(db_path)
+            with self._conn:
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS retained (
+                        video_id TEXT PRIMARY KEY,
+                        path TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        uploaded INTEGER NOT NULL,
+                        added_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL
+                    )
+                    """
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS retained_accessed ON retained (accessed_at)"
+                )
+        except Exception as e:
+            raise ConfigurationError(f"Failed to open retention index at {db_path}: {str(e)}")
+    
+    def lookup(self, video_id: str) -> Optional[Path]:
+        """
+        Find a kept file and mark it as recently used.
+        
+        Args:
+            video_id: YouTube video ID
+            
+        Returns:
+            Path of the file, or None if it is not kept or no longer intact
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT path, size FROM retained WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            
+            if row:
+                path = Path(row['path'])
+                if path.is_file() and path.stat().st_size == row['size']:
+                    self._conn.execute(
+                        "UPDATE retained SET accessed_at = ? WHERE video_id = ?",
+                        (time.time(), video_id)
+                    )
+                    self.hits += 1
+                    return path
+                    
+                # Deleted or replaced behind our back
+                self._conn.execute("DELETE FROM retained WHERE video_id = ?", (video_id,))
+                
+            self.misses += 1
+            return None
+    
+    def add(self, video_id: str, path: Path, uploaded: bool) -> List[Path]:
+        """
+        Record a kept file and evict files beyond the configured limits.
+        
+        Args:
+            video_id: YouTube video ID
+            path: Final path of the video file
+            uploaded: Whether the file is safely stored in Drive
+            
+        Returns:
+            Paths of the files that were evicted
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO retained (video_id, path, size, uploaded, added_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (video_id, str(path), path.stat().st_size, int(uploaded), now, now)
+            )
+            return self._evict(now, keep=video_id)
+    
+    def discard(self, video_id: str) -> None:
+        """
+        Forget a file that was deleted by its owner.
+        
+        Args:
+            video_id: YouTube video ID
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM retained WHERE video_id = ?", (video_id,))
+    
+    def enforce(self) -> List[Path]:
+        """
+        Evict files beyond the configured limits.
+        
+        Returns:
+            Paths of the files that were evicted
+        """
+        with self._lock, self._conn:
+            return self._evict(time.time())
+    
+    def _evict(self, now: float, keep: Optional[str] = None) -> List[Path]:
+        """
+        Delete uploaded files unused for too long, then least recently used
+        uploaded files until the total size fits.
+        
+        Must be called with the lock held inside a transaction.
+        
+        Args:
+            now: Current timestamp
+            keep: Video ID that must not be evicted
+            
+        Returns:
+            Paths of the files that were evicted
+        """
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM retained").fetchone()[0]
+        cutoff = now - self.max_age if self.max_age else None
+        
+        if (not self.max_bytes or total <= self.max_bytes) and cutoff is None:
+            return []
+            
+        evicted = []
+        rows = self._conn.execute(
+            "SELECT video_id, path, size, accessed_at FROM retained "
+            "WHERE uploaded = 1 AND video_id != ? ORDER BY accessed_at",
+            (keep or '',)
+        ).fetchall()
+        for row in rows:
+            expired = cutoff is not None and row['accessed_at'] < cutoff
+            if not expired and (not self.max_bytes or total <= self.max_bytes):
+                break
+            path = Path(row['path'])
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                self.logger.warning(f"Failed to evict {path}: {str(e)}")
+                continue
+            self._conn.execute("DELETE FROM retained WHERE video_id = ?", (row['video_id'],))
+            total -= row['size']
+            evicted.append(path)
+            
+        if evicted:
+            self.evictions += len(evicted)
+            self.logger.info(f"Evicted {len(evicted)} processed files, {total} bytes kept")
+        return evicted
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get retention usage statistics.
+        
+        Returns:
+            Dictionary with files, bytes, max_bytes, hits, misses and evictions
+        """
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM retained"
+            ).fetchone()
+        return {
+            'files': count,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,245 @@
+"""
+Media cache shared by several worker hosts through a common directory.
+"""
+
+import logging
+import os
+import re
+import shutil
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+_UNSAFE_KEY = re.compile(r'[^A-Za-z0-9+_-]')
+
+class SharedMediaCache:
+    """
+    Directory of finished videos keyed by video ID and format.
+    
+    Meant to live on a mount shared by every worker (e.g. NFS) so a video
+    downloaded on one host is linked or copied by the others instead of
+    being fetched from YouTube again. Writers of the same entry serialize
+    on an exclusively created lock file that its holder keeps fresh; a lock
+    that has not been refreshed for stale_after seconds belongs to a dead
+    process and is broken. Breaking renames the lock away and checks it got
+    the stale file it looked at, so two waiters can never both break the
+    lock and both take it. Entries are published with an atomic rename, so
+    readers never see a partial file.
+    """
+    
+    def __init__(self, root: Path, stale_after: float = 600, poll_interval: float = 5):
+        """
+        Initialize the cache.
+        
+        Args:
+            root: Shared cache directory (a local directory works for testing)
+            stale_after: Seconds after which an unrefreshed lock is broken
+            poll_interval: Seconds between checks while waiting for a lock
+        """
+        self.root = Path(root)
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.logger = logging.getLogger(__name__)
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.root.mkdir(parents=True, exist_ok=True)
+    
+    def entry_path(self, video_id: str, video_format: str) -> Path:
+        """
+        Get the cache file of a video in a format.
+        
+        Args:
+            video_id: YouTube video ID
+            video_format: Format ID yt-dlp selected for the file, e.g. '137+140'
+            
+        Returns:
+            Path of the cache entry
+        """
+        return self.root / video_id / f"{_UNSAFE_KEY.sub('_', video_format)}.mp4"
+    
+    @contextmanager
+    def lock(self, video_id: str, video_format: str) -> Iterator[None]:
+        """
+        Hold the writer lock of a cache entry.
+        
+        Args:
+            video_id: YouTube video ID
+            video_format: Format ID yt-dlp selected
+            
+        Yields:
+            Once this process owns the lock
+        """
+        entry = self.entry_path(video_id, video_format)
+        lock_path = entry.with_name(entry.name + '.lock')
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        
+        waiting = False
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    stat = lock_path.stat()
+                except FileNotFoundError:
+                    continue
+                age = time.time() - stat.st_mtime
+                if age > self.stale_after:
+                    self._break_lock(lock_path, stat.st_ino, age)
+                    continue
+                if not waiting:
+                    waiting = True
+                    self.logger.info(f"Waiting for another worker caching {video_id}")
+                time.sleep(self.poll_interval)
+                continue
+            # Unique per acquisition, so a holder can tell its lock from a replacement
+            token = f"{self._owner}:{uuid.uuid4().hex}"
+            with os.fdopen(fd, 'w') as f:
+                f.write(token)
+            break
+            
+        # Refresh the lock while it is held so other hosts know we are alive
+        stop = threading.Event()
+        
+        def _heartbeat() -> None:
+            while not stop.wait(self.stale_after / 3):
+                try:
+                    if self._owns(lock_path, token):
+                        os.utime(lock_path)
+                except OSError:
+                    pass
+                    
+        heartbeat = threading.Thread(target=_heartbeat, name='cache-lock', daemon=True)
+        heartbeat.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            heartbeat.join()
+            if self._owns(lock_path, token):
+                lock_path.unlink(missing_ok=True)
+            else:
+                self.logger.warning(f"Cache lock {lock_path} was broken while held")
+    
+    def _break_lock(self, lock_path: Path, inode: int, age: float) -> None:
+        """
+        Remove a stale lock file, unless another waiter got to it first.
+        
+        The lock is renamed to a name only this process uses, which at most
+        one waiter can do per lock file. If what was renamed is not the stale
+        file that was looked at, it is a fresh lock taken in the meantime and
+        is put back.
+        
+        Args:
+            lock_path: Lock file
+            inode: Inode of the stale lock file
+            age: Seconds since the stale lock was refreshed
+        """
+        suffix = f"{self._owner.replace(':', '.')}.{threading.get_ident()}"
+        broken = lock_path.with_name(f"{lock_path.name}.{suffix}.broken")
+        try:
+            os.rename(lock_path, broken)
+        except FileNotFoundError:
+            return
+        try:
+            stat = broken.stat()
+            if stat.st_ino == inode and time.time() - stat.st_mtime > self.stale_after:
+                self.logger.warning(f"Breaking stale cache lock {lock_path} ({age:.0f}s old)")
+                return
+            try:
+                # Never replaces a lock created since; os.rename would
+                os.link(broken, lock_path)
+            except FileExistsError:
+                self.logger.warning(f"Cache lock {lock_path} was replaced while being restored")
+        finally:
+            broken.unlink(missing_ok=True)
+    
+    @staticmethod
+    def _owns(lock_path: Path, token: str) -> bool:
+        """
+        Check whether a lock file is still the one this holder created.
+        
+        Args:
+            lock_path: Lock file
+            token: Token the holder wrote into the lock
+            
+        Returns:
+            True if lock_path holds that token
+        """
+        try:
+            return lock_path.read_text() == token
+        except FileNotFoundError:
+            return False
+    
+    def fetch(self, video_id: str, video_format: str, dest: Path) -> bool:
+        """
+        Place a cached video at dest, hard-linking when possible.
+        
+        Args:
+            video_id: YouTube video ID
+            video_format: Format ID yt-dlp selected
+            dest: Destination file
+            
+        Returns:
+            True if the video was in the cache
+        """
+        entry = self.entry_path(video_id, video_format)
+        if not entry.is_file():
+            self.misses += 1
+            return False
+            
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        self._place(entry, dest.with_name(dest.name + '.cache'), dest)
+        self.hits += 1
+        self.logger.info(f"Fetched {video_id} ({video_format}) from the shared cache")
+        return True
+    
+    def store(self, video_id: str, video_format: str, source: Path) -> None:
+        """
+        Publish a finished video to the cache.
+        
+        Should be called while holding the entry's lock.
+        
+        Args:
+            video_id: YouTube video ID
+            video_format: Format ID yt-dlp selected for the file
+            source: Finished video file
+        """
+        entry = self.entry_path(video_id, video_format)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        temp = entry.with_name(f".{entry.name}.{self._owner.replace(':', '.')}.tmp")
+        self._place(source, temp, entry)
+        self.stores += 1
+        self.logger.debug(f"Stored {video_id} ({video_format}) in the shared cache")
+    
+    @staticmethod
+    def _place(source: Path, temp: Path, dest: Path) -> None:
+        """
+        Link or copy source to temp, then atomically rename it to dest.
+        
+        Args:
+            source: Existing file
+            temp: Scratch path next to dest
+            dest: Final path
+        """
+        temp.unlink(missing_ok=True)
+        try:
+            os.link(source, temp)
+        except OSError:
+            # Different filesystems, or links not supported by the mount
+            shutil.copyfile(source, temp)
+        os.replace(temp, dest)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics of this process.
+        
+        Returns:
+            Dictionary with hits, misses and stores
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'stores': self.stores}
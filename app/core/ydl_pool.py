@@ -0,0 +1,158 @@
+"""
+Pool of reusable yt-dlp YoutubeDL instances.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import yt_dlp
+
+class YoutubeDLPool:
+    """
+    Keeps one YoutubeDL instance per worker thread and reuses it across jobs.
+    
+    Building a YoutubeDL initializes every extractor, the cookie jar and the
+    HTTP handlers; reusing it keeps those, including open keep-alive
+    connections, for all jobs run on the same thread. Instances are never
+    shared between threads because YoutubeDL is not thread-safe.
+    
+    Per-job options (output template, progress hook and other params) are
+    applied on acquire and restored on release instead of rebuilding the
+    instance. YoutubeDL compiles its format selector once when built, so a
+    per-job format is compiled into a selector of its own.
+    """
+    
+    def __init__(self, opts_factory: Callable[[], Dict[str, Any]]):
+        """
+        Initialize the pool.
+        
+        Args:
+            opts_factory: Returns the base options for new instances
+        """
+        self.opts_factory = opts_factory
+        self.logger = logging.getLogger(__name__)
+        self._local = threading.local()
+        self._instances: List[yt_dlp.YoutubeDL] = []
+        self._lock = threading.Lock()
+    
+    def _get_instance(self) -> yt_dlp.YoutubeDL:
+        """
+        Get the calling thread's instance, creating it on first use.
+        
+        Returns:
+            YoutubeDL instance owned by the current thread
+        """
+        ydl = getattr(self._local, 'ydl', None)
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL(self.opts_factory())
+            # A single permanent hook forwards to whichever job holds the instance
+            ydl.add_progress_hook(self._dispatch_progress)
+            self._local.ydl = ydl
+            self._local.progress_hook = None
+            with self._lock:
+                self._instances.append(ydl)
+            self.logger.debug(f"Created YoutubeDL instance for {threading.current_thread().name}")
+        return ydl
+    
+    def _dispatch_progress(self, status: Dict[str, Any]) -> None:
+        """
+        Forward a progress update to the current job's hook.
+        
+        Args:
+            status: yt-dlp progress dictionary
+        """
+        hook = getattr(self._local, 'progress_hook', None)
+        if hook:
+            hook(status)
+    
+    @staticmethod
+    def _format_selector(ydl: yt_dlp.YoutubeDL, spec: Any) -> Any:
+        """
+        Compile a format spec the way YoutubeDL does on construction.
+        
+        Args:
+            ydl: Instance the selector is for
+            spec: Format spec string, callable selector, None or '-'
+            
+        Returns:
+            Value for the instance's format_selector
+        """
+        if spec in (None, '-') or callable(spec):
+            return spec
+        return ydl.build_format_selector(spec)
+    
+    def _discard_instance(self) -> None:
+        """Close and forget the calling thread's instance."""
+        ydl = getattr(self._local, 'ydl', None)
+        self._local.ydl = None
+        if ydl is None:
+            return
+            
+        with self._lock:
+            if ydl in self._instances:
+                self._instances.remove(ydl)
+        try:
+            ydl.close()
+        except Exception as e:
+            self.logger.debug(f"Error closing YoutubeDL instance: {str(e)}")
+    
+    @contextmanager
+    def acquire(
+        self,
+        outtmpl: Optional[str] = None,
+        progress_hook: Optional[Callable[[Dict[str, Any]], None]] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[yt_dlp.YoutubeDL]:
+        """
+        Borrow the calling thread's instance configured for one job.
+        
+        If the job raises, the instance is discarded so the next job starts
+        from a clean state.
+        
+        Args:
+            outtmpl: Output template for this job
+            progress_hook: Progress hook for this job
+            params: Other YoutubeDL params to override for this job
+            
+        Yields:
+            Configured YoutubeDL instance
+        """
+        ydl = self._get_instance()
+        
+        overrides = dict(params or {})
+        saved_params = {key: ydl.params.get(key) for key in overrides}
+        saved_outtmpl = ydl.params['outtmpl'].get('default')
+        saved_selector = ydl.format_selector
+        
+        # Compiled before anything changes, so a bad spec leaves the instance untouched
+        if 'format' in overrides:
+            ydl.format_selector = self._format_selector(ydl, overrides['format'])
+        ydl.params.update(overrides)
+        if outtmpl:
+            ydl.params['outtmpl']['default'] = outtmpl
+        self._local.progress_hook = progress_hook
+        
+        try:
+            yield ydl
+        except BaseException:
+            self._discard_instance()
+            raise
+        else:
+            ydl.params.update(saved_params)
+            ydl.params['outtmpl']['default'] = saved_outtmpl
+            ydl.format_selector = saved_selector
+        finally:
+            self._local.progress_hook = None
+    
+    def close(self) -> None:
+        """Close every instance created by the pool."""
+        with self._lock:
+            instances, self._instances = self._instances, []
+            
+        for ydl in instances:
+            try:
+                ydl.close()
+            except Exception as e:
+                self.logger.debug(f"Error closing YoutubeDL instance: {str(e)}")
@@ -0,0 +1,246 @@
+"""
+Local index of the files in the Drive upload folder.
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.utils.exceptions import ConfigurationError
+from app.utils.helpers import connect_database
+
+_FILE_FIELDS = 'id, name, size, md5Checksum, appProperties, parents, trashed'
+
+class DriveFolderIndex:
+    """
+    SQLite mirror of the files in one Drive folder.
+    
+    The folder is listed once; afterwards only the Drive changes feed is
+    read, starting from the page token saved by the previous refresh, so
+    keeping the index current costs a request or two however large the
+    folder is. Uploads look up a file's size and MD5 here to find an
+    identical video that is already in the folder. Files are stored per
+    folder, so switching DRIVE_FOLDER_ID back and forth keeps each folder's
+    files consistent with its saved page token.
+    """
+    
+    def __init__(self, db_path: Path, folder_id: str, refresh_interval: float = 300):
+        """
+        Initialize the index.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            folder_id: ID of the Drive folder to mirror
+            refresh_interval: Minimum seconds between change feed reads
+            
+        Raises:
+            ConfigurationError: If the database cannot be opened
+        """
+        self.folder_id = folder_id
+        self.refresh_interval = refresh_interval
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._refreshed: Optional[float] = None
+        
+        try:
+            self._conn = connect_database(db_path)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS drive_index_state (folder_id TEXT PRIMARY KEY, page_token TEXT)"
+                )
+                columns = [row['name'] for row in self._conn.execute("PRAGMA table_info(drive_files)")]
+                if columns and 'folder_id' not in columns:
+                    # Indexes from before files were stored per folder are rebuilt from scratch
+                    self._conn.execute("DROP TABLE drive_files")
+                    self._conn.execute("DELETE FROM drive_index_state")
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS drive_files (
+                        folder_id TEXT NOT NULL,
+                        file_id TEXT NOT NULL,
+                        name TEXT,
+                        size INTEGER,
+                        md5 TEXT,
+                        video_id TEXT,
+                        PRIMARY KEY (folder_id, file_id)
+                    )
+                    """
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS drive_files_md5 ON drive_files (folder_id, md5, size)"
+                )
+        except Exception as e:
+            raise ConfigurationError(f"Failed to open Drive folder index at {db_path}: {str(e)}")
+    
+    def refresh(self, service: Any, force: bool = False) -> None:
+        """
+        Bring the index up to date with the folder.
+        
+        Args:
+            service: Drive API service used for the requests
+            force: Read the change feed even if the last refresh was recent
+        """
+        with self._lock:
+            if not force and self._refreshed is not None and \
+                    time.monotonic() - self._refreshed < self.refresh_interval:
+                return
+                
+            row = self._conn.execute(
+                "SELECT page_token FROM drive_index_state WHERE folder_id = ?", (self.folder_id,)
+            ).fetchone()
+            if row:
+                token = self._apply_changes(service, row['page_token'])
+            else:
+                token = self._rebuild(service)
+                
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO drive_index_state (folder_id, page_token) VALUES (?, ?)",
+                    (self.folder_id, token)
+                )
+            self._refreshed = time.monotonic()
+    
+    def _rebuild(self, service: Any) -> str:
+        """
+        List the whole folder into the index.
+        
+        Must be called with the lock held.
+        
+        Args:
+            service: Drive API service
+            
+        Returns:
+            Change feed page token to continue from
+        """
+        # Taken before listing so changes made during the listing are replayed
+        token = service.changes().getStartPageToken().execute()['startPageToken']
+        
+        files = []
+        page_token = None
+        while True:
+            response = service.files().list(
+                q=f"'{self.folder_id}' in parents and trashed = false",
+                fields=f"nextPageToken, files({_FILE_FIELDS})",
+                pageSize=1000,
+                pageToken=page_token
+            ).execute()
+            files.extend(response.get('files', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+                
+        with self._conn:
+            self._conn.execute("DELETE FROM drive_files WHERE folder_id = ?", (self.folder_id,))
+            for file in files:
+                self._upsert(file)
+        self.logger.info(f"Indexed {len(files)} files in Drive folder {self.folder_id}")
+        return token
+    
+    def _apply_changes(self, service: Any, token: str) -> str:
+        """
+        Apply the change feed since a page token to the index.
+        
+        Must be called with the lock held.
+        
+        Args:
+            service: Drive API service
+            token: Page token saved by the previous refresh
+            
+        Returns:
+            Page token to continue from next time
+        """
+        applied = 0
+        while True:
+            response = service.changes().list(
+                pageToken=token,
+                fields=f"nextPageToken, newStartPageToken, changes(fileId, removed, file({_FILE_FIELDS}))",
+                pageSize=1000
+            ).execute()
+            
+            with self._conn:
+                for change in response.get('changes', []):
+                    file = change.get('file')
+                    if change.get('removed') or not file or file.get('trashed') or \
+                            self.folder_id not in file.get('parents', []):
+                        self._conn.execute(
+                            "DELETE FROM drive_files WHERE folder_id = ? AND file_id = ?",
+                            (self.folder_id, change['fileId'])
+                        )
+                    else:
+                        self._upsert(file)
+                    applied += 1
+                    
+            if 'newStartPageToken' in response:
+                if applied:
+                    self.logger.debug(f"Applied {applied} Drive changes to the folder index")
+                return response['newStartPageToken']
+            token = response['nextPageToken']
+    
+    def _upsert(self, file: Dict[str, Any]) -> None:
+        """
+        Store a Drive file resource under the indexed folder.
+        
+        Must be called inside a transaction.
+        
+        Args:
+            file: File resource with the fields in _FILE_FIELDS
+        """
+        self._conn.execute(
+            "INSERT OR REPLACE INTO drive_files (folder_id, file_id, name, size, md5, video_id) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                self.folder_id,
+                file['id'],
+                file.get('name'),
+                int(file['size']) if file.get('size') is not None else None,
+                file.get('md5Checksum'),
+                (file.get('appProperties') or {}).get('video_id')
+            )
+        )
+    
+    def find(self, size: int, md5: str, video_id: Optional[str] = None) -> Optional[str]:
+        """
+        Find a file in the folder with the given content.
+        
+        Args:
+            size: File size in bytes
+            md5: MD5 hex digest of the file
+            video_id: YouTube video ID; a file tagged with it is preferred
+            
+        Returns:
+            ID of a matching Drive file, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_id FROM drive_files WHERE folder_id = ? AND md5 = ? AND size = ? "
+                "ORDER BY video_id IS ? DESC LIMIT 1",
+                (self.folder_id, md5, size, video_id)
+            ).fetchone()
+        return row['file_id'] if row else None
+    
+    def add(self, file_id: str, name: str, size: int, md5: str, video_id: Optional[str] = None) -> None:
+        """
+        Record a file this process uploaded, ahead of the change feed.
+        
+        Args:
+            file_id: Drive file ID
+            name: File name
+            size: File size in bytes
+            md5: MD5 hex digest
+            video_id: YouTube video ID
+        """
+        with self._lock, self._conn:
+            self._upsert({
+                'id': file_id,
+                'name': name,
+                'size': size,
+                'md5Checksum': md5,
+                'appProperties': {'video_id': video_id} if video_id else {}
+            })
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -3,32 +3,95 @@ Google Drive service for file uploads and management.
 """
 
 import logging
+import threading
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Iterable, List, Tuple
 
 from google.oauth2.service_account import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload, build_http
 from googleapiclient.errors import HttpError
 
 from app.config.settings import Settings
+from app.services.drive_index import DriveFolderIndex
+from app.services.upload_sessions import UploadSessionStore
+from app.utils.bandwidth import BandwidthGovernor
+from app.utils.chunk_sizer import AdaptiveChunkSizer
 from app.utils.exceptions import GoogleDriveError
+from app.utils.executors import BlockingExecutor
+from app.utils.helpers import format_size
 from app.utils.validators import validate_file_exists
 
+# Chunk failures worth retrying with a smaller chunk
+_RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# Most calls Drive accepts in one batch request
+BATCH_LIMIT = 100
+
+_FILE_INFO_FIELDS = 'id, name, mimeType, size, createdTime'
+
+class _AdaptiveMediaFileUpload(MediaFileUpload):
+    """MediaFileUpload whose chunk size follows an AdaptiveChunkSizer."""
+    
+    def __init__(self, filename: str, sizer: AdaptiveChunkSizer, **kwargs: Any):
+        """
+        Initialize the upload.
+        
+        Args:
+            filename: Path of the file to upload
+            sizer: Sizer consulted for the size of every chunk
+            **kwargs: Further MediaFileUpload arguments
+        """
+        super().__init__(filename, chunksize=sizer.size, resumable=True, **kwargs)
+        self.sizer = sizer
+    
+    def chunksize(self) -> int:
+        """Size of the next chunk; read by the request before each one."""
+        return self.sizer.size
+
 class GoogleDriveService:
-    """Handles Google Drive operations."""
+    """
+    Handles Google Drive operations.
     
-    def __init__(self, settings: Settings):
+    Uploads run on the executor's 'upload' pool, DRIVE_UPLOAD_CONCURRENCY at
+    a time. httplib2 connections are not thread-safe, so every upload worker
+    builds its own Drive client with its own authorized HTTP transport; the
+    shared client serves the remaining calls on the single 'drive' thread.
+    """
+    
+    def __init__(
+        self,
+        settings: Settings,
+        executor: Optional[BlockingExecutor] = None,
+        bandwidth: Optional[BandwidthGovernor] = None
+    ):
         """
         Initialize the Google Drive service.
         
         Args:
             settings: Application settings
+            executor: Shared pools for blocking API calls
+            bandwidth: Shared upload rate limit
         """
         self.settings = settings
         self.logger = logging.getLogger(__name__)
+        self.executor = executor or BlockingExecutor(settings)
+        self.bandwidth = bandwidth or BandwidthGovernor(settings)
+        self._local = threading.local()
+        self.sessions = UploadSessionStore()
         self._setup_service()
         
+        # Files already in the upload folder, so identical videos are not uploaded twice
+        self.index = None
+        if settings.DRIVE_DEDUPLICATE:
+            self.index = DriveFolderIndex(
+                settings.DRIVE_INDEX_PATH,
+                settings.DRIVE_FOLDER_ID,
+                refresh_interval=settings.DRIVE_INDEX_REFRESH_INTERVAL
+            )
+        
     def _setup_service(self) -> None:
         """
         Set up the Google Drive API service.
@@ -37,7 +100,7 @@ class GoogleDriveService:
             GoogleDriveError: If service setup fails
         """
         try:
-            credentials = Credentials.from_service_account_file(
+            self.credentials = Credentials.from_service_account_file(
                 str(self.settings.GOOGLE_CREDS_PATH),
                 scopes=['https://www.googleapis.com/auth/drive.file']
             )
@@ -45,7 +108,7 @@ class GoogleDriveService:
             self.service = build(
                 'drive',
                 'v3',
-                credentials=credentials,
+                credentials=self.credentials,
                 cache_discovery=False
             )
             
@@ -54,21 +117,94 @@ class GoogleDriveService:
         except Exception as e:
             raise GoogleDriveError(f"Failed to initialize Drive service: {str(e)}")
     
+    def _worker_service(self) -> Any:
+        """
+        Get the Drive client of the calling upload worker, creating it on first use.
+        
+        Returns:
+            Drive API service with a transport owned by this thread
+            
+        Raises:
+            GoogleDriveError: If the client cannot be built
+        """
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            try:
+                # build_http passes Drive's 308 Resume Incomplete through instead of
+                # following it as a redirect, and sets the client's socket timeout
+                http = AuthorizedHttp(self.credentials, http=build_http())
+                service = build('drive', 'v3', http=http, cache_discovery=False)
+            except Exception as e:
+                raise GoogleDriveError(f"Failed to initialize Drive upload client: {str(e)}")
+            self._local.service = service
+            self._local.http = http
+            self.logger.debug(f"Built Drive upload client for {threading.current_thread().name}")
+        return service
+    
     async def upload_file(
         self,
         file_path: Path,
         title: Optional[str] = None,
         mime_type: str = 'video/mp4',
-        progress_callback: Optional[Callable[[float], None]] = None
+        progress_callback: Optional[Callable[[float], None]] = None,
+        priority: float = 1.0,
+        md5: Optional[str] = None,
+        video_id: Optional[str] = None
     ) -> str:
         """
         Upload a file to Google Drive.
         
+        If the folder already holds a file with the same size and MD5, its
+        ID is returned and nothing is uploaded.
+        
         Args:
             file_path: Path to the file to upload
             title: Optional title for the file (defaults to filename)
             mime_type: MIME type of the file
             progress_callback: Optional callback for upload progress
+            priority: Bandwidth weight relative to other jobs of this process
+            md5: Expected MD5 hex digest, verified against Drive's md5Checksum
+            video_id: YouTube video ID, stored in the file's appProperties
+            
+        Returns:
+            ID of the uploaded file
+            
+        Raises:
+            GoogleDriveError: If upload fails
+        """
+        return await self.executor.run(
+            'upload',
+            self._upload_file,
+            file_path,
+            title,
+            mime_type,
+            self.executor.threadsafe(progress_callback),
+            priority,
+            md5,
+            video_id
+        )
+    
+    def _upload_file(
+        self,
+        file_path: Path,
+        title: Optional[str],
+        mime_type: str,
+        progress_callback: Optional[Callable[[float], None]],
+        priority: float = 1.0,
+        md5: Optional[str] = None,
+        video_id: Optional[str] = None
+    ) -> str:
+        """
+        Blocking implementation of upload_file, run on an upload worker thread.
+        
+        Args:
+            file_path: Path to the file to upload
+            title: Optional title for the file (defaults to filename)
+            mime_type: MIME type of the file
+            progress_callback: Thread-safe callback for upload progress
+            priority: Bandwidth weight relative to other jobs of this process
+            md5: Expected MD5 hex digest; a mismatching upload is deleted
+            video_id: YouTube video ID, stored in the file's appProperties
             
         Returns:
             ID of the uploaded file
@@ -79,48 +215,100 @@ class GoogleDriveService:
         try:
             validate_file_exists(file_path)
             
+            if md5 and self.index:
+                existing = self._find_existing(file_path, md5, video_id)
+                if existing:
+                    self.sessions.clear(file_path)
+                    self.logger.info(f"{file_path.name} is already in Drive as {existing}, skipping upload")
+                    return existing
+                    
             file_metadata = {
                 'name': title or file_path.name,
                 'parents': [self.settings.DRIVE_FOLDER_ID]
             }
+            if video_id:
+                file_metadata['appProperties'] = {'video_id': video_id}
             
-            media = MediaFileUpload(
-                str(file_path),
-                mimetype=mime_type,
-                resumable=True,
-                chunksize=self.settings.CHUNK_SIZE
+            sizer = AdaptiveChunkSizer(
+                initial=self.settings.CHUNK_SIZE,
+                minimum=self.settings.UPLOAD_CHUNK_MIN,
+                maximum=self.settings.UPLOAD_CHUNK_MAX,
+                target_seconds=self.settings.UPLOAD_CHUNK_TARGET_SECONDS
             )
+            media = _AdaptiveMediaFileUpload(str(file_path), sizer, mimetype=mime_type)
             
             # Create the file
-            request = self.service.files().create(
+            request = self._worker_service().files().create(
                 body=file_metadata,
                 media_body=media,
-                fields='id'
+                fields='id, md5Checksum'
             )
             
-            print("\nUploading to Google Drive...")
-            self.logger.info("Starting file upload to Google Drive")
-            
             response = None
+            
+            # Continue the session of an interrupted upload from the bytes Drive holds
+            session = self.sessions.load(file_path)
+            if session:
+                offset, response = self.sessions.query(self._local.http, session['uri'], media.size())
+                if offset is None:
+                    self.logger.info(f"Upload session of {file_path.name} expired, starting over")
+                    self.sessions.clear(file_path)
+                elif response is None:
+                    request.resumable_uri = session['uri']
+                    request.resumable_progress = offset
+                    self.logger.info(
+                        f"Resuming upload of {file_path.name} at {format_size(offset)} "
+                        f"of {format_size(media.size())}"
+                    )
+                    
+            self.logger.info(f"Starting upload of {file_path.name} to Google Drive")
+            
             last_progress = -1  # Start at -1 to ensure first update is shown
             
-            def _print_progress(progress: int) -> None:
-                """Print progress to both console and log."""
-                print(f"\rUpload Progress: {progress}%", end="", flush=True)
-                self.logger.info(f"Upload progress: {progress}%")
+            def _log_progress(progress: int) -> None:
+                """Log progress; uploads run in parallel, so lines name the file."""
+                self.logger.info(f"Upload progress of {file_path.name}: {progress}%")
+            
+            share = self.bandwidth.share('upload', priority)
+            retries = 0
             
             while response is None:
                 try:
-                    status, response = request.next_chunk()
+                    # Wait for the shared upload budget before sending each chunk
+                    offset = request.resumable_progress
+                    share.consume(min(media.chunksize(), media.size() - offset))
+                    started = time.monotonic()
+                    try:
+                        status, response = request.next_chunk()
+                    except (HttpError, OSError) as e:
+                        status_code = getattr(getattr(e, 'resp', None), 'status', None)
+                        retryable = isinstance(e, OSError) or status_code in _RETRYABLE_STATUSES
+                        if not retryable or retries >= self.settings.MAX_RETRIES:
+                            raise
+                        retries += 1
+                        sizer.record_failure()
+                        self.logger.warning(
+                            f"Upload chunk at {format_size(offset)} failed ({str(e)}), "
+                            f"retrying with {format_size(sizer.size)} chunks"
+                        )
+                        time.sleep(min(2 ** retries, 30))
+                        continue
+                        
+                    retries = 0
+                    end = media.size() if response is not None else request.resumable_progress
+                    sizer.record(end - offset, time.monotonic() - started)
+                    if response is None:
+                        self.sessions.save(file_path, request.resumable_uri, end)
+                    
                     if status:
                         current_progress = int(status.progress() * 100)
                         # Always show 0% at start
                         if last_progress == -1:
-                            _print_progress(0)
+                            _log_progress(0)
                             
                         # Show progress when it increases
                         if current_progress > last_progress:
-                            _print_progress(current_progress)
+                            _log_progress(current_progress)
                             last_progress = current_progress
                             if progress_callback:
                                 progress_callback(status.progress())
@@ -132,14 +320,24 @@ class GoogleDriveService:
             
             # Always show 100% at completion
             if last_progress < 100:
-                _print_progress(100)
+                _log_progress(100)
             
-            print("\nUpload completed!")
-            self.logger.info("File upload completed successfully")
+            stats = sizer.stats()
+            self.logger.info(
+                f"Upload of {file_path.name} completed: {stats['chunks']} chunks of "
+                f"{format_size(stats['smallest'])}-{format_size(stats['largest'])}, "
+                f"{format_size(stats['throughput'])}/s, {stats['failures']} retried"
+            )
             
+            self.sessions.clear(file_path)
             file_id = response.get('id')
             if not file_id:
                 raise GoogleDriveError("Upload successful but file ID not received")
+                
+            if md5:
+                self._verify_md5(file_id, md5, response.get('md5Checksum'))
+                if self.index:
+                    self.index.add(file_id, file_metadata['name'], media.size(), md5, video_id)
             
             self.logger.info(f"File uploaded successfully. ID: {file_id}")
             return file_id
@@ -149,10 +347,65 @@ class GoogleDriveService:
         except Exception as e:
             raise GoogleDriveError(f"Upload failed: {str(e)}")
     
+    def _find_existing(self, file_path: Path, md5: str, video_id: Optional[str]) -> Optional[str]:
+        """
+        Look for an identical file in the upload folder.
+        
+        Args:
+            file_path: File about to be uploaded
+            md5: MD5 hex digest of the file
+            video_id: YouTube video ID of the file
+            
+        Returns:
+            ID of the existing Drive file, or None
+        """
+        try:
+            self.index.refresh(self._worker_service())
+        except (HttpError, OSError) as e:
+            # A stale index can still answer; at worst the file is uploaded again
+            self.logger.warning(f"Could not refresh Drive folder index: {str(e)}")
+        return self.index.find(file_path.stat().st_size, md5, video_id)
+    
+    def _verify_md5(self, file_id: str, expected: str, actual: Optional[str]) -> None:
+        """
+        Check an uploaded file against the digest computed after its download.
+        
+        Args:
+            file_id: ID of the uploaded file
+            expected: MD5 hex digest of the local file
+            actual: md5Checksum from the upload response, if it included one
+            
+        Raises:
+            GoogleDriveError: If the digests differ; the corrupt upload is deleted
+        """
+        service = self._worker_service()
+        if actual is None:
+            # A resumed session that had already finished reports no checksum
+            actual = service.files().get(fileId=file_id, fields='md5Checksum').execute().get('md5Checksum')
+            
+        if actual != expected:
+            service.files().delete(fileId=file_id).execute()
+            raise GoogleDriveError(
+                f"Checksum mismatch for uploaded file {file_id}: expected {expected}, got {actual}"
+            )
+        self.logger.debug(f"Verified MD5 of uploaded file {file_id}")
+    
     async def delete_file(self, file_id: str) -> None:
         """
         Delete a file from Google Drive.
         
+        Args:
+            file_id: ID of the file to delete
+            
+        Raises:
+            GoogleDriveError: If deletion fails
+        """
+        await self.executor.run('drive', self._delete_file, file_id)
+    
+    def _delete_file(self, file_id: str) -> None:
+        """
+        Blocking implementation of delete_file.
+        
         Args:
             file_id: ID of the file to delete
             
@@ -170,6 +423,21 @@ class GoogleDriveService:
         """
         Get information about a file.
         
+        Args:
+            file_id: ID of the file
+            
+        Returns:
+            Dictionary containing file information
+            
+        Raises:
+            GoogleDriveError: If retrieval fails
+        """
+        return await self.executor.run('drive', self._get_file_info, file_id)
+    
+    def _get_file_info(self, file_id: str) -> Dict[str, Any]:
+        """
+        Blocking implementation of get_file_info.
+        
         Args:
             file_id: ID of the file
             
@@ -182,16 +450,133 @@ class GoogleDriveService:
         try:
             file = self.service.files().get(
                 fileId=file_id,
-                fields='id, name, mimeType, size, createdTime'
+                fields=_FILE_INFO_FIELDS
             ).execute()
             
-            return {
-                'id': file.get('id'),
-                'name': file.get('name'),
-                'mime_type': file.get('mimeType'),
-                'size': int(file.get('size', 0)),
-                'created_time': file.get('createdTime')
-            }
+            return self._file_info(file)
             
         except HttpError as e:
-            raise GoogleDriveError(f"Failed to get file info: {str(e)}") 
\ No newline at end of file
+            raise GoogleDriveError(f"Failed to get file info: {str(e)}")
+    
+    @staticmethod
+    def _file_info(file: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a Drive file resource to the file information dictionary.
+        
+        Args:
+            file: File resource with the fields in _FILE_INFO_FIELDS
+            
+        Returns:
+            Dictionary containing file information
+        """
+        return {
+            'id': file.get('id'),
+            'name': file.get('name'),
+            'mime_type': file.get('mimeType'),
+            'size': int(file.get('size', 0)),
+            'created_time': file.get('createdTime')
+        }
+    
+    async def get_files_info(self, file_ids: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get information about many files, up to BATCH_LIMIT per request.
+        
+        Args:
+            file_ids: IDs of the files
+            
+        Returns:
+            Dictionary with 'files' (file information keyed by ID) and
+            'errors' (error message keyed by the IDs that failed)
+        """
+        files, errors = await self.executor.run(
+            'drive',
+            self._execute_batched,
+            file_ids,
+            lambda file_id: self.service.files().get(fileId=file_id, fields=_FILE_INFO_FIELDS)
+        )
+        return {
+            'files': {file_id: self._file_info(file) for file_id, file in files.items()},
+            'errors': errors
+        }
+    
+    async def delete_files(self, file_ids: Iterable[str]) -> Dict[str, Any]:
+        """
+        Delete many files, up to BATCH_LIMIT per request.
+        
+        Args:
+            file_ids: IDs of the files to delete
+            
+        Returns:
+            Dictionary with 'deleted' (IDs removed) and 'errors' (error
+            message keyed by the IDs that could not be deleted)
+        """
+        deleted, errors = await self.executor.run(
+            'drive',
+            self._execute_batched,
+            file_ids,
+            lambda file_id: self.service.files().delete(fileId=file_id)
+        )
+        return {'deleted': list(deleted), 'errors': errors}
+    
+    def _execute_batched(
+        self,
+        file_ids: Iterable[str],
+        make_request: Callable[[str], Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Run one API call per file ID through batch requests.
+        
+        Sub-requests that fail with a transient error (rate limits, 5xx) are
+        sent again in a new batch, up to MAX_RETRIES times; the others keep
+        their result.
+        
+        Args:
+            file_ids: File IDs, duplicates are sent once
+            make_request: Builds the API request for a file ID
+            
+        Returns:
+            Tuple of (responses keyed by file ID, error messages keyed by file ID)
+        """
+        results: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        pending = list(dict.fromkeys(file_ids))
+        
+        for attempt in range(self.settings.MAX_RETRIES + 1):
+            retry: List[str] = []
+            
+            def _callback(request_id: str, response: Any, exception: Optional[HttpError]) -> None:
+                if exception is None:
+                    results[request_id] = response
+                    errors.pop(request_id, None)
+                    return
+                errors[request_id] = str(exception)
+                status = getattr(getattr(exception, 'resp', None), 'status', None)
+                if status in _RETRYABLE_STATUSES or 'ratelimitexceeded' in str(exception).lower():
+                    retry.append(request_id)
+                    
+            for start in range(0, len(pending), BATCH_LIMIT):
+                chunk = pending[start:start + BATCH_LIMIT]
+                batch = self.service.new_batch_http_request(callback=_callback)
+                for file_id in chunk:
+                    batch.add(make_request(file_id), request_id=file_id)
+                try:
+                    batch.execute()
+                except (HttpError, OSError) as e:
+                    # The batch itself failed, so none of its calls ran
+                    for file_id in chunk:
+                        errors[file_id] = str(e)
+                    retry.extend(file_id for file_id in chunk if file_id not in results)
+                    
+            if not retry or attempt == self.settings.MAX_RETRIES:
+                break
+            self.logger.warning(f"Retrying {len(retry)} of {len(pending)} batched Drive calls")
+            pending = list(dict.fromkeys(retry))
+            time.sleep(min(2 ** (attempt + 1), 30))
+            
+        self.logger.info(f"Batched Drive calls: {len(results)} succeeded, {len(errors)} failed")
+        return results, errors
+    
+    def close(self) -> None:
+        """Release resources held by the service."""
+        if self.index:
+            self.index.close()
\ No newline at end of file
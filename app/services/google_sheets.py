@@ -10,10 +10,18 @@ import gspread
 from google.oauth2.service_account import Credentials
 
 from app.config.settings import Settings
+from app.services.sheets_writer import SheetsWriteBuffer
 from app.utils.exceptions import GoogleSheetsError
+from app.utils.executors import BlockingExecutor
 
 class GoogleSheetsService:
-    """Handles Google Sheets operations."""
+    """
+    Handles Google Sheets operations.
+    
+    Writes go through a journaled write-behind buffer that sends them in
+    batches; add_video and update_video_status return once the write is
+    journaled locally.
+    """
     
     # Default headers for the spreadsheet
     HEADERS = [
@@ -26,18 +34,21 @@ class GoogleSheetsService:
         'Thumbnail',
         'Upload Date',
         'Download Status',
-        'Upload Status'
+        'Upload Status',
+        'Video ID'
     ]
     
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, executor: Optional[BlockingExecutor] = None):
         """
         Initialize the Google Sheets service.
         
         Args:
             settings: Application settings
+            executor: Shared pools for blocking API calls
         """
         self.settings = settings
         self.logger = logging.getLogger(__name__)
+        self.executor = executor or BlockingExecutor(settings)
         self._setup_service()
         
     def _setup_service(self) -> None:
@@ -56,6 +67,14 @@ class GoogleSheetsService:
             self.client = gspread.authorize(credentials)
             self.spreadsheet = self.client.open_by_key(self.settings.SPREADSHEET_ID)
             self.worksheet = self._get_or_create_worksheet()
+            self.writer = SheetsWriteBuffer(
+                self.worksheet,
+                self.HEADERS,
+                self.settings.SHEETS_JOURNAL_PATH,
+                batch_size=self.settings.SHEETS_BATCH_SIZE,
+                flush_interval=self.settings.SHEETS_FLUSH_INTERVAL,
+                row_index=self._build_row_index()
+            )
             
             self.logger.info("Google Sheets service initialized successfully")
             
@@ -81,6 +100,10 @@ class GoogleSheetsService:
             if not headers:
                 worksheet.append_row(self.HEADERS)
                 self.logger.info("Created headers in worksheet")
+            elif headers == self.HEADERS[:-1]:
+                # Sheets from before the Video ID column keep their rows
+                worksheet.update_cell(1, len(self.HEADERS), self.HEADERS[-1])
+                self.logger.info("Added Video ID column to worksheet")
             elif headers != self.HEADERS:
                 # Update headers if they don't match
                 worksheet.clear()
@@ -92,6 +115,22 @@ class GoogleSheetsService:
         except Exception as e:
             raise GoogleSheetsError(f"Failed to setup worksheet: {str(e)}")
     
+    def _build_row_index(self) -> Dict[str, int]:
+        """
+        Map every video ID in the sheet to its row, reading only the ID column.
+        
+        Returns:
+            1-based row number keyed by video ID
+        """
+        video_ids = self.worksheet.col_values(self.HEADERS.index('Video ID') + 1)
+        index = {
+            video_id: row
+            for row, video_id in enumerate(video_ids, start=1)
+            if row > 1 and video_id
+        }
+        self.logger.debug(f"Indexed {len(index)} spreadsheet rows by video ID")
+        return index
+    
     async def add_video(
         self,
         metadata: Dict[str, Any],
@@ -101,6 +140,25 @@ class GoogleSheetsService:
         """
         Add video information to the spreadsheet.
         
+        Args:
+            metadata: Video metadata
+            drive_file_id: Optional Google Drive file ID
+            status: Current status of the video
+            
+        Raises:
+            GoogleSheetsError: If update fails
+        """
+        await self.executor.run('sheets', self._add_video, metadata, drive_file_id, status)
+    
+    def _add_video(
+        self,
+        metadata: Dict[str, Any],
+        drive_file_id: Optional[str],
+        status: str
+    ) -> None:
+        """
+        Blocking implementation of add_video.
+        
         Args:
             metadata: Video metadata
             drive_file_id: Optional Google Drive file ID
@@ -124,12 +182,13 @@ class GoogleSheetsService:
                 metadata.get('thumbnail', ''),               # Thumbnail
                 current_date,                                # Upload Date
                 'Pending',                                   # Download Status
-                'Pending'                                    # Upload Status
+                'Pending',                                   # Upload Status
+                metadata['id']                               # Video ID
             ]
             
-            # Add row to spreadsheet
-            self.worksheet.append_row(row_data)
-            self.logger.info(f"Added video {metadata.get('title', 'Unknown')} to spreadsheet")
+            # Queue row for the next batched append
+            self.writer.append(metadata['id'], metadata.get('title', ''), row_data)
+            self.logger.info(f"Queued video {metadata.get('title', 'Unknown')} for spreadsheet")
             
         except Exception as e:
             raise GoogleSheetsError(f"Failed to add video to spreadsheet: {str(e)}")
@@ -145,10 +204,38 @@ class GoogleSheetsService:
         Update video status in the spreadsheet.
         
         Args:
-            video_id: YouTube video ID (used for logging)
+            video_id: YouTube video ID of the row
+            status: New status
+            drive_file_id: Optional Google Drive file ID
+            title: Video title, used only for rows without a video ID
+            
+        Raises:
+            GoogleSheetsError: If update fails
+        """
+        await self.executor.run(
+            'sheets',
+            self._update_video_status,
+            video_id,
+            status,
+            drive_file_id,
+            title
+        )
+    
+    def _update_video_status(
+        self,
+        video_id: str,
+        status: str,
+        drive_file_id: Optional[str],
+        title: Optional[str]
+    ) -> None:
+        """
+        Blocking implementation of update_video_status.
+        
+        Args:
+            video_id: YouTube video ID of the row
             status: New status
             drive_file_id: Optional Google Drive file ID
-            title: Video title to search for in spreadsheet
+            title: Video title, used only for rows without a video ID
             
         Raises:
             GoogleSheetsError: If update fails
@@ -157,27 +244,20 @@ class GoogleSheetsService:
             if not title:
                 raise GoogleSheetsError("Video title is required to update status")
 
-            # Find the row with the video title
-            cell = self.worksheet.find(title)
-            if not cell:
-                raise GoogleSheetsError(f"Video '{title}' not found in spreadsheet")
-            
-            row = cell.row
+            cells = {}
             
             # Only update Download Status to Completed when download finishes
             # Upload Status remains as Pending
             if status == "Completed":
-                self.worksheet.update_cell(row, self.HEADERS.index('Download Status') + 1, "Completed")
+                cells['Download Status'] = "Completed"
             
             # Update Drive file ID if provided
             if drive_file_id:
-                self.worksheet.update_cell(
-                    row,
-                    self.HEADERS.index('Drive File ID') + 1,
-                    drive_file_id
-                )
+                cells['Drive File ID'] = drive_file_id
             
-            self.logger.info(f"Updated status for video '{title}'")
+            if cells:
+                self.writer.update(video_id, title, cells)
+            self.logger.info(f"Queued status update for video '{title}'")
             
         except Exception as e:
             raise GoogleSheetsError(f"Failed to update video status: {str(e)}")
@@ -186,6 +266,21 @@ class GoogleSheetsService:
         """
         Get video information from the spreadsheet.
         
+        Args:
+            video_id: YouTube video ID
+            
+        Returns:
+            Dictionary containing video information or None if not found
+            
+        Raises:
+            GoogleSheetsError: If retrieval fails
+        """
+        return await self.executor.run('sheets', self._get_video_info, video_id)
+    
+    def _get_video_info(self, video_id: str) -> Optional[Dict[str, str]]:
+        """
+        Blocking implementation of get_video_info.
+        
         Args:
             video_id: YouTube video ID
             
@@ -196,16 +291,29 @@ class GoogleSheetsService:
             GoogleSheetsError: If retrieval fails
         """
         try:
+            # Rows may still be waiting in the write buffer
+            self.writer.flush()
+            
             # Find the row with the video ID
-            cell = self.worksheet.find(video_id)
-            if not cell:
+            row = self.writer.row_of(video_id)
+            if row is None:
                 return None
             
             # Get all values in the row
-            row_data = self.worksheet.row_values(cell.row)
+            row_data = self.worksheet.row_values(row)
             
             # Create dictionary with headers as keys
             return dict(zip(self.HEADERS, row_data))
             
         except Exception as e:
-            raise GoogleSheetsError(f"Failed to get video info: {str(e)}") 
\ No newline at end of file
+            raise GoogleSheetsError(f"Failed to get video info: {str(e)}")
+    
+    def close(self) -> None:
+        """
+        Send all buffered writes and stop the background flusher.
+        
+        Raises:
+            GoogleSheetsError: If the final flush fails; the writes stay
+                journaled and are sent on the next start
+        """
+        self.writer.close()
\ No newline at end of file
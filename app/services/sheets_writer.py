@@ -0,0 +1,345 @@
+"""
+Write-behind buffer that batches Google Sheets writes.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from gspread.utils import rowcol_to_a1
+
+from app.utils.exceptions import GoogleSheetsError
+
+# First row of the range reported by an append, e.g. "'Sheet1'!A12:J14"
+_APPENDED_ROW = re.compile(r'![A-Z]+(\d+)')
+
+class SheetsWriteBuffer:
+    """
+    Buffers row appends and cell updates and sends them in batches.
+    
+    Appends are sent together through one append_rows call and cell updates
+    through one batch_update call, when batch_size writes are waiting or
+    flush_interval seconds have passed, and on close. An update to a row
+    that is still waiting to be appended is merged into that row, so a
+    video added and completed between two flushes costs a single append.
+    
+    Rows are located through an index of video ID to row number, seeded
+    from the sheet's Video ID column and extended from the ranges that
+    appends report, so no write ever searches the sheet. A video that
+    already has a row is rewritten in place instead of appended again.
+    
+    Every write is appended to a local journal before it is accepted, and
+    the journal is only dropped once Sheets has confirmed the batch, so a
+    crash loses nothing: the journal is replayed on the next start. A
+    crash between a confirmed batch and dropping the journal replays that
+    batch again.
+    """
+    
+    def __init__(
+        self,
+        worksheet: Any,
+        headers: List[str],
+        journal_path: Path,
+        batch_size: int = 100,
+        flush_interval: float = 5.0,
+        row_index: Optional[Dict[str, int]] = None,
+        id_header: str = 'Video ID',
+        title_header: str = 'Title'
+    ):
+        """
+        Initialize the buffer and replay writes left by a previous run.
+        
+        Args:
+            worksheet: gspread worksheet to write to
+            headers: Column headers, used to place cell updates
+            journal_path: File journaling writes not yet confirmed by Sheets
+            batch_size: Waiting writes that trigger a flush
+            flush_interval: Maximum seconds a write waits before it is sent
+            row_index: Row number of every video ID already in the sheet
+            id_header: Header of the video ID column
+            title_header: Header of the title column, used to find rows
+                written before the video ID column existed
+        """
+        self.worksheet = worksheet
+        self.headers = headers
+        self.journal_path = journal_path
+        self.inflight_path = journal_path.with_name(journal_path.name + '.inflight')
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.id_header = id_header
+        self.title_header = title_header
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._appends: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._updates: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._rows: Dict[str, int] = dict(row_index or {})
+        
+        journal_path.parent.mkdir(parents=True, exist_ok=True)
+        replayed = 0
+        for path in (self.inflight_path, self.journal_path):
+            if path.exists():
+                for line in path.read_text().splitlines():
+                    if line.strip():
+                        self._apply(self._appends, self._updates, json.loads(line))
+                        replayed += 1
+        if replayed:
+            self.logger.info(f"Replaying {replayed} unconfirmed spreadsheet writes from the journal")
+        self._journal = open(self.journal_path, 'a')
+        
+        self._closed = threading.Event()
+        self._wake = threading.Event()
+        self._flusher = threading.Thread(target=self._run_flusher, name='sheets-flusher', daemon=True)
+        self._flusher.start()
+        if replayed:
+            self._wake.set()
+    
+    def _apply(
+        self,
+        appends: "OrderedDict[str, Dict[str, Any]]",
+        updates: "OrderedDict[str, Dict[str, Any]]",
+        op: Dict[str, Any]
+    ) -> None:
+        """
+        Merge a write into pending appends and updates.
+        
+        Args:
+            appends: Pending rows keyed by video ID
+            updates: Pending cell values keyed by video ID
+            op: Journaled write
+        """
+        video_id = op['video_id']
+        if op['op'] == 'append':
+            appends[video_id] = {'title': op['title'], 'row': list(op['row'])}
+            updates.pop(video_id, None)
+        elif video_id in appends:
+            row = appends[video_id]['row']
+            for header, value in op['cells'].items():
+                row[self.headers.index(header)] = value
+        else:
+            pending = updates.setdefault(video_id, {'title': op['title'], 'cells': {}})
+            pending['cells'].update(op['cells'])
+    
+    def _submit(self, op: Dict[str, Any]) -> None:
+        """
+        Journal a write and add it to the buffer.
+        
+        Args:
+            op: Write to perform
+        """
+        with self._lock:
+            self._journal.write(json.dumps(op) + '\n')
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._apply(self._appends, self._updates, op)
+            pending = len(self._appends) + len(self._updates)
+        if pending >= self.batch_size:
+            self._wake.set()
+    
+    def append(self, video_id: str, title: str, row: List[Any]) -> None:
+        """
+        Queue a new row.
+        
+        Args:
+            video_id: YouTube video ID of the row
+            title: Video title, used to find the row if it was added by another run
+            row: Cell values in header order
+        """
+        self._submit({'op': 'append', 'video_id': video_id, 'title': title, 'row': row})
+    
+    def update(self, video_id: str, title: str, cells: Dict[str, Any]) -> None:
+        """
+        Queue new values for cells of a video's row.
+        
+        Args:
+            video_id: YouTube video ID of the row
+            title: Video title, used to find the row if it was added by another run
+            cells: New values keyed by column header
+        """
+        self._submit({'op': 'update', 'video_id': video_id, 'title': title, 'cells': cells})
+    
+    def row_of(self, video_id: str) -> Optional[int]:
+        """
+        Look up the row of a video that has been written to the sheet.
+        
+        Args:
+            video_id: YouTube video ID
+            
+        Returns:
+            1-based row number, or None if the video has no row yet
+        """
+        return self._rows.get(video_id)
+    
+    def pending(self) -> int:
+        """
+        Get the number of rows with writes waiting to be sent.
+        
+        Returns:
+            Pending appends plus rows with pending updates
+        """
+        with self._lock:
+            return len(self._appends) + len(self._updates)
+    
+    def _rotate_journal(self) -> None:
+        """
+        Move the journaled writes being flushed out of the live journal.
+        
+        Must be called with the lock held. Writes of an earlier failed
+        flush are still in the in-flight file, so the journal is added to it.
+        """
+        self._journal.close()
+        if self.inflight_path.exists():
+            with open(self.inflight_path, 'a') as inflight:
+                inflight.write(self.journal_path.read_text())
+                inflight.flush()
+                os.fsync(inflight.fileno())
+            self.journal_path.write_text('')
+        else:
+            os.replace(self.journal_path, self.inflight_path)
+        self._journal = open(self.journal_path, 'a')
+    
+    def flush(self) -> None:
+        """
+        Send all waiting writes.
+        
+        Raises:
+            GoogleSheetsError: If Sheets rejects a batch; the writes stay
+                buffered and journaled for the next flush
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._appends and not self._updates:
+                    return
+                appends, self._appends = self._appends, OrderedDict()
+                updates, self._updates = self._updates, OrderedDict()
+                self._rotate_journal()
+                
+            try:
+                self._send(appends, updates)
+            except Exception as e:
+                with self._lock:
+                    # Put the batch back in front of the writes queued meanwhile
+                    newer = [{'op': 'append', 'video_id': video_id, **pending}
+                             for video_id, pending in self._appends.items()]
+                    newer += [{'op': 'update', 'video_id': video_id, **pending}
+                              for video_id, pending in self._updates.items()]
+                    for op in newer:
+                        self._apply(appends, updates, op)
+                    self._appends, self._updates = appends, updates
+                raise GoogleSheetsError(f"Failed to write to spreadsheet: {str(e)}")
+                
+            self.inflight_path.unlink(missing_ok=True)
+    
+    def _send(
+        self,
+        appends: "OrderedDict[str, Dict[str, Any]]",
+        updates: "OrderedDict[str, Dict[str, Any]]"
+    ) -> None:
+        """
+        Write a batch of appends and updates to the worksheet.
+        
+        Args:
+            appends: Rows to append keyed by video ID
+            updates: Cell values to set keyed by video ID
+        """
+        data = []
+        
+        # Videos that already have a row (processed again, or a replayed journal) are rewritten in place
+        new_rows = OrderedDict()
+        for video_id, pending in appends.items():
+            row = self._rows.get(video_id)
+            if row is None:
+                new_rows[video_id] = pending
+                continue
+            data.append({
+                'range': f"{rowcol_to_a1(row, 1)}:{rowcol_to_a1(row, len(self.headers))}",
+                'values': [pending['row']]
+            })
+            
+        if new_rows:
+            response = self.worksheet.append_rows([pending['row'] for pending in new_rows.values()])
+            match = _APPENDED_ROW.search((response or {}).get('updates', {}).get('updatedRange', ''))
+            if match:
+                first = int(match.group(1))
+                for offset, video_id in enumerate(new_rows):
+                    self._rows[video_id] = first + offset
+            self.logger.info(f"Appended {len(new_rows)} rows to spreadsheet")
+            
+        for video_id, pending in updates.items():
+            cells = dict(pending['cells'])
+            if video_id not in self._rows:
+                # A row from before the video ID column gets its ID in this batch
+                cells[self.id_header] = video_id
+            row = self._find_row(video_id, pending['title'])
+            if row is None:
+                self.logger.warning(f"Video '{pending['title']}' not found in spreadsheet, dropping update")
+                continue
+            for header, value in cells.items():
+                data.append({
+                    'range': rowcol_to_a1(row, self.headers.index(header) + 1),
+                    'values': [[value]]
+                })
+        if data:
+            self.worksheet.batch_update(data, value_input_option='USER_ENTERED')
+            self.logger.info(f"Updated {len(data)} ranges in {len(updates) + len(appends) - len(new_rows)} spreadsheet rows")
+    
+    def _find_row(self, video_id: str, title: str) -> Optional[int]:
+        """
+        Get the row number of a video.
+        
+        Videos missing from the index can only be in rows written before the
+        sheet had a video ID column. Those are matched by title among the
+        rows not yet indexed, and the match is added to the index.
+        
+        Args:
+            video_id: YouTube video ID
+            title: Video title
+            
+        Returns:
+            1-based row number, or None if the video is not in the sheet
+        """
+        if video_id in self._rows:
+            return self._rows[video_id]
+            
+        known = set(self._rows.values())
+        cells = self.worksheet.findall(title, in_column=self.headers.index(self.title_header) + 1)
+        rows = [cell.row for cell in cells if cell.row > 1 and cell.row not in known]
+        if not rows:
+            return None
+            
+        row = rows[-1]
+        self._rows[video_id] = row
+        return row
+    
+    def _run_flusher(self) -> None:
+        """Flush on the time threshold, or sooner when woken by a full batch."""
+        while not self._closed.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except GoogleSheetsError as e:
+                self.logger.error(str(e))
+    
+    def close(self) -> None:
+        """
+        Stop the background flusher and send everything still waiting.
+        
+        Raises:
+            GoogleSheetsError: If the final flush fails; the writes remain
+                in the journal for the next run
+        """
+        self._closed.set()
+        self._wake.set()
+        self._flusher.join()
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._journal.close()
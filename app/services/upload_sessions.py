@@ -0,0 +1,123 @@
+"""
+Persistence of Drive resumable upload sessions across restarts.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from app.utils.exceptions import GoogleDriveError
+
+class UploadSessionStore:
+    """
+    Keeps the resumable session of an upload in a sidecar next to the file.
+    
+    The sidecar holds the session URI and the last byte offset Drive
+    acknowledged, along with the size and modification time of the file so
+    a session is never resumed for different content. After a crash the
+    session status is queried from Drive, which reports the bytes it
+    actually holds, and the upload continues from there.
+    """
+    
+    def __init__(self):
+        """Initialize the store."""
+        self.logger = logging.getLogger(__name__)
+    
+    @staticmethod
+    def state_path(file_path: Path) -> Path:
+        """
+        Get the sidecar file holding the session of an upload.
+        
+        Args:
+            file_path: File being uploaded
+            
+        Returns:
+            Path of the sidecar file
+        """
+        return file_path.with_name(file_path.name + '.upload')
+    
+    def load(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Read the saved session of a file, if it still matches the file.
+        
+        Args:
+            file_path: File being uploaded
+            
+        Returns:
+            Dictionary with 'uri' and 'offset', or None if there is no usable session
+        """
+        try:
+            state = json.loads(self.state_path(file_path).read_text())
+            stat = file_path.stat()
+        except (OSError, ValueError):
+            return None
+            
+        if state.get('size') != stat.st_size or state.get('mtime') != stat.st_mtime:
+            self.logger.info(f"Discarding upload session of {file_path.name}: file has changed")
+            self.clear(file_path)
+            return None
+        return state
+    
+    def save(self, file_path: Path, uri: str, offset: int) -> None:
+        """
+        Atomically record the session and acknowledged offset of an upload.
+        
+        Args:
+            file_path: File being uploaded
+            uri: Resumable session URI
+            offset: Bytes Drive has acknowledged
+        """
+        stat = file_path.stat()
+        state_path = self.state_path(file_path)
+        temp = state_path.with_name(state_path.name + '.tmp')
+        temp.write_text(json.dumps({
+            'uri': uri,
+            'offset': offset,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime
+        }))
+        os.replace(temp, state_path)
+    
+    def clear(self, file_path: Path) -> None:
+        """
+        Forget the session of an upload.
+        
+        Args:
+            file_path: File that was uploaded
+        """
+        self.state_path(file_path).unlink(missing_ok=True)
+    
+    def query(self, http: Any, uri: str, size: int) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+        """
+        Ask Drive how much of an upload session it has received.
+        
+        Args:
+            http: Authorized httplib2-compatible client
+            uri: Resumable session URI
+            size: Total size of the file
+            
+        Returns:
+            Tuple of (next byte to send, finished file resource). The offset
+            is None when the session has expired; the resource is set only
+            when the upload had already completed
+            
+        Raises:
+            GoogleDriveError: If Drive answers with an unexpected status
+        """
+        response, content = http.request(
+            uri,
+            'PUT',
+            body=b'',
+            headers={'Content-Length': '0', 'Content-Range': f"bytes */{size}"}
+        )
+        
+        if response.status in (200, 201):
+            return size, json.loads(content or b'{}')
+        if response.status == 308:
+            received = response.get('range')
+            return (int(received.rsplit('-', 1)[1]) + 1 if received else 0), None
+        if response.status in (404, 410):
+            return None, None
+        raise GoogleDriveError(f"Unexpected upload session status {response.status}")
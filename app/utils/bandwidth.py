@@ -0,0 +1,186 @@
+"""
+Process-wide bandwidth limits for downloads and uploads.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config.settings import Settings
+
+class _TokenBucket:
+    """
+    Token bucket that hands out bytes in weighted fair order.
+    
+    Every request gets a virtual finish tag of its share's previous tag plus
+    bytes / weight; waiting requests are served lowest tag first, so a share
+    with weight 2 receives twice the throughput of a weight 1 share while
+    both are busy. Requests larger than the burst size are allowed to drive
+    the bucket into debt, which later requests wait out.
+    """
+    
+    def __init__(self, rate: float, burst: float):
+        """
+        Initialize the bucket.
+        
+        Args:
+            rate: Allowed bytes per second (0 for unlimited)
+            burst: Maximum tokens that can accumulate
+        """
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._virtual = 0.0
+        self._waiting: List[Tuple[float, int]] = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        
+        self.total_bytes = 0
+        self.first_use: Optional[float] = None
+        self.last_use: Optional[float] = None
+    
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last refill."""
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def consume(self, count: int, tag_base: float, weight: float) -> float:
+        """
+        Block until count bytes may be transferred.
+        
+        Args:
+            count: Number of bytes
+            tag_base: Virtual finish tag of the share's previous request
+            weight: Priority weight of the share
+            
+        Returns:
+            Virtual finish tag of this request
+        """
+        with self._cond:
+            now = time.monotonic()
+            if self.first_use is None:
+                self.first_use = now
+            self.total_bytes += count
+            
+            if not self.rate:
+                self.last_use = now
+                return tag_base
+                
+            tag = max(self._virtual, tag_base) + count / max(weight, 1e-3)
+            entry = (tag, next(self._sequence))
+            heapq.heappush(self._waiting, entry)
+            
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._waiting[0] == entry:
+                    needed = min(count, self.burst)
+                    if self._tokens >= needed:
+                        break
+                    self._cond.wait((needed - self._tokens) / self.rate)
+                else:
+                    self._cond.wait()
+                    
+            heapq.heappop(self._waiting)
+            self._tokens -= count
+            self._virtual = tag
+            self.last_use = time.monotonic()
+            self._cond.notify_all()
+            return tag
+
+class BandwidthShare:
+    """A job's handle on a direction of the governor, with its priority weight."""
+    
+    def __init__(self, bucket: _TokenBucket, weight: float):
+        """
+        Initialize the share.
+        
+        Args:
+            bucket: Token bucket of the direction
+            weight: Relative priority of the job (higher gets more bandwidth)
+        """
+        self._bucket = bucket
+        self.weight = weight
+        self._tag = 0.0
+    
+    def consume(self, count: int) -> None:
+        """
+        Block until count bytes may be transferred by this job.
+        
+        Args:
+            count: Number of bytes about to be (or just) transferred
+        """
+        if count > 0:
+            self._tag = self._bucket.consume(count, self._tag, self.weight)
+
+class BandwidthGovernor:
+    """
+    Shared download and upload rate limits.
+    
+    One instance is shared by every downloader and Drive service in the
+    process, so concurrent jobs together stay within the configured rates
+    instead of each getting the full link.
+    """
+    
+    DIRECTIONS = ('download', 'upload')
+    
+    def __init__(self, settings: Settings):
+        """
+        Initialize the governor.
+        
+        Args:
+            settings: Application settings
+        """
+        self.settings = settings
+        self.logger = logging.getLogger(__name__)
+        
+        rates = {
+            'download': settings.DOWNLOAD_RATE_LIMIT,
+            'upload': settings.UPLOAD_RATE_LIMIT
+        }
+        self._buckets = {
+            direction: _TokenBucket(rate, burst=max(rate * settings.BANDWIDTH_BURST_SECONDS, 64 * 1024))
+            for direction, rate in rates.items()
+        }
+    
+    def share(self, direction: str, weight: float = 1.0) -> BandwidthShare:
+        """
+        Create a handle for one job's transfers in a direction.
+        
+        Args:
+            direction: 'download' or 'upload'
+            weight: Relative priority of the job
+            
+        Returns:
+            Bandwidth share to call consume() on
+            
+        Raises:
+            ValueError: If the direction is unknown
+        """
+        if direction not in self._buckets:
+            raise ValueError(f"Unknown bandwidth direction: {direction}")
+        return BandwidthShare(self._buckets[direction], weight)
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report achieved against allowed throughput for each direction.
+        
+        Returns:
+            Dictionary keyed by direction with 'allowed' and 'achieved'
+            bytes per second (allowed is 0 when unlimited) and total 'bytes'
+        """
+        stats = {}
+        for direction, bucket in self._buckets.items():
+            elapsed = 0.0
+            if bucket.first_use is not None and bucket.last_use is not None:
+                elapsed = bucket.last_use - bucket.first_use
+            stats[direction] = {
+                'allowed': bucket.rate,
+                'achieved': bucket.total_bytes / elapsed if elapsed > 0 else 0.0,
+                'bytes': bucket.total_bytes
+            }
+        return stats
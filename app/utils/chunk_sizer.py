@@ -0,0 +1,128 @@
+"""
+Adaptive chunk sizing for resumable uploads.
+"""
+
+from typing import Any, Dict, Optional
+
+# Drive requires every chunk but the last to be a multiple of 256 KiB
+CHUNK_ALIGNMENT = 256 * 1024
+
+def align_chunk_size(size: float) -> int:
+    """
+    Round a chunk size down to a multiple of CHUNK_ALIGNMENT.
+    
+    Args:
+        size: Desired chunk size in bytes
+        
+    Returns:
+        Aligned chunk size, at least CHUNK_ALIGNMENT
+    """
+    return max(CHUNK_ALIGNMENT, int(size) // CHUNK_ALIGNMENT * CHUNK_ALIGNMENT)
+
+class AdaptiveChunkSizer:
+    """
+    Picks the size of the next upload chunk from measured throughput.
+    
+    Chunks are sized to take about target_seconds at the smoothed
+    throughput of the previous chunks, so fast links send few large
+    requests and slow links send small ones. Every failed chunk halves the
+    size, which bounds how much a flaky link has to resend; growth after a
+    success is limited to doubling so one lucky chunk cannot overshoot.
+    """
+    
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        target_seconds: float = 10.0,
+        smoothing: float = 0.3
+    ):
+        """
+        Initialize the sizer.
+        
+        Args:
+            initial: First chunk size in bytes
+            minimum: Smallest chunk size in bytes
+            maximum: Largest chunk size in bytes
+            target_seconds: Intended duration of one chunk request
+            smoothing: Weight of the newest throughput sample (0-1)
+        """
+        self.minimum = align_chunk_size(minimum)
+        self.maximum = max(self.minimum, align_chunk_size(maximum))
+        self.target_seconds = target_seconds
+        self.smoothing = smoothing
+        self.size = self._clamp(initial)
+        self.throughput: Optional[float] = None
+        
+        self.chunks = 0
+        self.failures = 0
+        self.bytes_sent = 0
+        self.seconds = 0.0
+        self.smallest = self.size
+        self.largest = self.size
+    
+    def _clamp(self, size: float) -> int:
+        """Align a size and keep it within the configured bounds."""
+        return min(self.maximum, max(self.minimum, align_chunk_size(size)))
+    
+    def record(self, sent: int, seconds: float) -> int:
+        """
+        Account for a successful chunk and size the next one.
+        
+        Args:
+            sent: Bytes the chunk carried
+            seconds: Duration of the chunk request
+            
+        Returns:
+            Size of the next chunk
+        """
+        self.chunks += 1
+        self.bytes_sent += sent
+        self.seconds += seconds
+        
+        # Short final chunks say little about the link
+        if sent >= self.size // 2 and seconds > 0:
+            sample = sent / seconds
+            if self.throughput is None:
+                self.throughput = sample
+            else:
+                self.throughput += self.smoothing * (sample - self.throughput)
+            self._resize(min(self.throughput * self.target_seconds, self.size * 2))
+        return self.size
+    
+    def record_failure(self) -> int:
+        """
+        Account for a failed chunk and shrink the next one.
+        
+        Returns:
+            Size of the next chunk
+        """
+        self.failures += 1
+        self._resize(self.size / 2)
+        return self.size
+    
+    def _resize(self, size: float) -> None:
+        """Set the next chunk size and track the range of sizes used."""
+        self.size = self._clamp(size)
+        self.smallest = min(self.smallest, self.size)
+        self.largest = max(self.largest, self.size)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get statistics of the upload so far.
+        
+        Returns:
+            Dictionary with chunks, failures, error rate, smallest, largest
+            and current chunk size, and average throughput in bytes per second
+        """
+        attempts = self.chunks + self.failures
+        return {
+            'chunks': self.chunks,
+            'failures': self.failures,
+            'error_rate': self.failures / attempts if attempts else 0.0,
+            'smallest': self.smallest,
+            'largest': self.largest,
+            'size': self.size,
+            'throughput': self.bytes_sent / self.seconds if self.seconds > 0 else 0.0
+        }
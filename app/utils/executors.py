@@ -0,0 +1,127 @@
+"""
+Managed thread pools for running blocking library calls off the event loop.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.config.settings import Settings
+
+T = TypeVar('T')
+
+class BlockingExecutor:
+    """
+    Named thread pools for yt-dlp, Google Drive and Google Sheets calls.
+    
+    Each kind of work gets its own pool so a long download never holds up
+    a metadata lookup or a spreadsheet write. Pools are created lazily and
+    shared by every service that receives the same instance.
+    
+    Threads are used rather than processes: the blocking work is network
+    I/O and FFmpeg subprocesses, and yt-dlp and API client objects cannot
+    be pickled across process boundaries.
+    """
+    
+    def __init__(self, settings: Settings):
+        """
+        Initialize the executor.
+        
+        Args:
+            settings: Application settings
+        """
+        self.settings = settings
+        self.logger = logging.getLogger(__name__)
+        self._sizes = {
+            'metadata': settings.METADATA_THREADS,
+            'download': settings.DOWNLOAD_THREADS,
+            'drive': settings.DRIVE_THREADS,
+            'sheets': settings.SHEETS_THREADS,
+            'upload': settings.DRIVE_UPLOAD_CONCURRENCY
+        }
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+    
+    def _get_pool(self, name: str) -> ThreadPoolExecutor:
+        """
+        Get or create the named pool.
+        
+        Args:
+            name: Pool name
+            
+        Returns:
+            Thread pool executor
+            
+        Raises:
+            ValueError: If the pool name is unknown
+        """
+        if name not in self._sizes:
+            raise ValueError(f"Unknown executor pool: {name}")
+            
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                size = max(1, self._sizes[name])
+                pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"{name}-worker")
+                self._pools[name] = pool
+                self.logger.debug(f"Started '{name}' pool with {size} threads")
+            return pool
+    
+    async def run(self, name: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking function on the named pool and await its result.
+        
+        Args:
+            name: Pool name ('metadata', 'download', 'drive', 'sheets' or 'upload')
+            func: Blocking function to call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+            
+        Returns:
+            Return value of func
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_pool(name),
+            functools.partial(func, *args, **kwargs)
+        )
+    
+    @staticmethod
+    def threadsafe(callback: Optional[Callable[..., Any]]) -> Optional[Callable[..., None]]:
+        """
+        Wrap a callback so worker threads can invoke it on the event loop.
+        
+        Must be called from the event loop thread.
+        
+        Args:
+            callback: Callback to run on the event loop, or None
+            
+        Returns:
+            Thread-safe wrapper, or None if no callback was given
+        """
+        if callback is None:
+            return None
+            
+        loop = asyncio.get_running_loop()
+        
+        def _schedule(*args: Any) -> None:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(callback, *args)
+                
+        return _schedule
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shut down all pools.
+        
+        Args:
+            wait: Whether to wait for running calls to finish
+        """
+        with self._lock:
+            pools, self._pools = self._pools, {}
+            
+        for pool in pools.values():
+            pool.shutdown(wait=wait)
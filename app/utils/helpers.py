@@ -6,11 +6,15 @@ import logging
 import sys
 import re
 import os
+import hashlib
+import sqlite3
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict, Iterable, List, Tuple
 from datetime import datetime
 
 from app.config.settings import Settings
+from app.utils.exceptions import ValidationError
+from app.utils.validators import validate_youtube_url
 
 def setup_logging(settings: Settings) -> logging.Logger:
     """
@@ -106,6 +110,113 @@ def get_video_path(
         return directory / "temp" / filename
     return directory / filename
 
+def connect_database(db_path: Path) -> sqlite3.Connection:
+    """
+    Open a SQLite database for local state, creating it if needed.
+    
+    The connection uses WAL journaling so readers never block the writer
+    and may be shared between threads (callers serialize writes).
+    
+    Args:
+        db_path: Path to the database file
+        
+    Returns:
+        Open connection with rows accessible by column name
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+def file_checksum(file_path: Path, algorithm: str = 'sha256', block_size: int = 1024 * 1024) -> str:
+    """
+    Compute the hex digest of a file, reading it in blocks.
+    
+    Args:
+        file_path: Path to the file
+        algorithm: hashlib algorithm name
+        block_size: Bytes read per iteration
+        
+    Returns:
+        Hex digest string
+    """
+    return file_digests(file_path, (algorithm,), block_size)[algorithm]
+
+def file_digests(
+    file_path: Path,
+    algorithms: Iterable[str] = ('sha256', 'md5'),
+    block_size: int = 1024 * 1024
+) -> Dict[str, str]:
+    """
+    Compute several hex digests of a file in a single read.
+    
+    Args:
+        file_path: Path to the file
+        algorithms: hashlib algorithm names
+        block_size: Bytes read per iteration
+        
+    Returns:
+        Hex digest keyed by algorithm name
+    """
+    digests = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            for digest in digests.values():
+                digest.update(block)
+    return {algorithm: digest.hexdigest() for algorithm, digest in digests.items()}
+
+def normalize_video_urls(
+    lines: Iterable[str]
+) -> Tuple[List[str], Dict[str, float], List[str]]:
+    """
+    Normalize a list of YouTube URLs or video IDs into unique watch URLs.
+    
+    A URL may be followed by a positive bandwidth weight, e.g.
+    ``https://youtu.be/abcdefghijk 2``. Blank lines and lines starting with
+    '#' are ignored. Order of first appearance is preserved, and a repeated
+    video keeps its first weight.
+    
+    Args:
+        lines: URLs or bare video IDs, one per item
+        
+    Returns:
+        Tuple of (canonical watch URLs, weights of the URLs that have one,
+        lines that are not valid video URLs)
+    """
+    seen = set()
+    urls = []
+    priorities = {}
+    invalid = []
+    
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+            
+        fields = line.split()
+        try:
+            if len(fields) > 2:
+                raise ValidationError(f"Unexpected text after URL: {line}")
+            video_id = validate_youtube_url(fields[0])
+            priority = float(fields[1]) if len(fields) == 2 else None
+            if priority is not None and not priority > 0:
+                raise ValidationError(f"Weight must be positive: {line}")
+        except (ValidationError, ValueError):
+            invalid.append(line)
+            continue
+            
+        if video_id not in seen:
+            seen.add(video_id)
+            url = f"https://www.youtube.com/watch?v={video_id}"
+            urls.append(url)
+            if priority is not None:
+                priorities[url] = priority
+            
+    return urls, priorities, invalid
+
 def format_size(size_bytes: int) -> str:
     """
     Format file size in human-readable format.
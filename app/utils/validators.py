@@ -70,6 +70,45 @@ def validate_youtube_url(url: str) -> str:
             "Invalid YouTube URL. Please provide a valid YouTube video URL."
         )
 
+def validate_youtube_playlist_url(url: str) -> str:
+    """
+    Validate and extract playlist ID from YouTube playlist URL.
+    
+    Args:
+        url: YouTube playlist URL or bare playlist ID
+    
+    Returns:
+        YouTube playlist ID
+    
+    Raises:
+        ValidationError: If URL is invalid
+    """
+    try:
+        url = url.strip()
+        
+        # Handle direct playlist IDs (PL..., UU..., OL..., etc.)
+        if re.match(r'^[A-Z]{2}[a-zA-Z0-9_-]{10,}$', url):
+            return url
+        
+        parsed_url = urlparse(url)
+        
+        if parsed_url.hostname in ['www.youtube.com', 'youtube.com', 'm.youtube.com', 'youtu.be']:
+            playlist_id = parse_qs(parsed_url.query).get('list', [None])[0]
+        else:
+            playlist_id = None
+        
+        if playlist_id and re.match(r'^[a-zA-Z0-9_-]+$', playlist_id):
+            return playlist_id
+        
+        raise ValidationError("Could not extract valid playlist ID from URL")
+    
+    except Exception as e:
+        if isinstance(e, ValidationError):
+            raise
+        raise ValidationError(
+            "Invalid YouTube playlist URL. Please provide a valid YouTube playlist URL."
+        )
+
 def validate_file_exists(path: Path) -> None:
     """
     Validate that a file exists.
@@ -3,10 +3,13 @@ YouTube Video Manager
 A professional tool for downloading and managing YouTube videos with Google Drive integration.
 """
 
+import argparse
 import asyncio
 import logging
 import sys
+import time
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 # Add project root to Python path to ensure imports work in any context
 project_root = Path(__file__).parent
@@ -14,12 +17,27 @@ sys.path.append(str(project_root))
 
 from app.core.processor import VideoProcessor
 from app.config.settings import Settings
-from app.utils.helpers import setup_logging
-from app.utils.exceptions import YouTubeManagerError
+from app.utils.helpers import setup_logging, normalize_video_urls, format_size, format_duration
+from app.utils.exceptions import YouTubeManagerError, ValidationError
+from app.utils.validators import validate_youtube_url, validate_youtube_playlist_url
 
 # Global logger instance
 logger = None
 
+def _is_playlist_url(url: str) -> bool:
+    """Return True if the URL names a playlist rather than a single video."""
+    try:
+        validate_youtube_url(url)
+        return False
+    except ValidationError:
+        pass
+    
+    try:
+        validate_youtube_playlist_url(url)
+        return True
+    except ValidationError:
+        return False
+
 async def process_videos(processor: VideoProcessor):
     """Process videos in a loop until user quits."""
     global logger
@@ -35,6 +53,16 @@ async def process_videos(processor: VideoProcessor):
                 print("URL cannot be empty!")
                 continue
             
+            if _is_playlist_url(url):
+                print("\nProcessing playlist... Please wait.")
+                results = await processor.process_playlist(url)
+                succeeded = sum(1 for r in results if r['status'] == 'succeeded')
+                print(f"\nPlaylist processed: {succeeded}/{len(results)} videos succeeded.")
+                for result in results:
+                    if result['status'] != 'succeeded':
+                        print(f"  [{result['status']}] {result['url']}: {result['error']}")
+                continue
+            
             print("\nProcessing video... Please wait.")
             await processor.process_video(url)
             print("\nVideo processed successfully!")
@@ -51,21 +79,159 @@ async def process_videos(processor: VideoProcessor):
             print(f"\nUnexpected error: {str(e)}")
             logger.error(f"Unexpected error: {str(e)}", exc_info=True)
 
+def read_batch_input(source: str) -> List[str]:
+    """
+    Read URLs or video IDs from a file, or from stdin when source is '-'.
+    
+    Args:
+        source: Path to a text file with one URL or ID per line, or '-'
+        
+    Returns:
+        Raw input lines
+    """
+    if source == '-':
+        return sys.stdin.read().splitlines()
+    with open(source, encoding='utf-8') as f:
+        return f.read().splitlines()
+
+def print_summary(
+    results: List[Dict[str, Any]],
+    elapsed: float,
+    bandwidth: Optional[Dict[str, Dict[str, Any]]] = None,
+    retention: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Print and log throughput statistics for a finished batch.
+    
+    Args:
+        results: Batch results from the processor
+        elapsed: Wall-clock duration of the batch in seconds
+        bandwidth: Achieved and allowed rates from BandwidthGovernor.stats()
+        retention: Kept file usage from ProcessedRetention.stats()
+    """
+    succeeded = [r for r in results if r['status'] == 'succeeded']
+    failed = [r for r in results if r['status'] == 'failed']
+    skipped = [r for r in results if r['status'] == 'skipped']
+    total_bytes = sum(r['file_size'] for r in succeeded)
+    elapsed = max(elapsed, 1e-6)
+    
+    lines = [
+        f"Processed {len(results)} videos in {format_duration(int(elapsed))}",
+        f"  Succeeded: {len(succeeded)}  Failed: {len(failed)}  Skipped: {len(skipped)}",
+        f"  Throughput: {len(succeeded) / elapsed * 60:.2f} videos/min, "
+        f"{format_size(total_bytes / elapsed)}/s ({format_size(total_bytes)} total)"
+    ]
+    for direction, stats in (bandwidth or {}).items():
+        allowed = f"{format_size(stats['allowed'])}/s" if stats['allowed'] else "unlimited"
+        lines.append(
+            f"  {direction.capitalize()}: {format_size(stats['achieved'])}/s achieved, {allowed} allowed"
+        )
+    if retention:
+        limit = format_size(retention['max_bytes']) if retention['max_bytes'] else "unlimited"
+        lines.append(
+            f"  Kept files: {retention['files']} using {format_size(retention['bytes'])} of {limit} "
+            f"({retention['hits']} reused, {retention['misses']} missed, {retention['evictions']} evicted)"
+        )
+    for result in failed + skipped:
+        lines.append(f"  [{result['status']}] {result['url']}: {result['error']}")
+        
+    print("\n" + "\n".join(lines))
+    for line in lines:
+        logger.info(line)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Download YouTube videos and upload them to Google Drive."
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        '--batch',
+        metavar='FILE',
+        help="Process URLs or video IDs listed in FILE, one per line ('-' reads stdin)"
+    )
+    source.add_argument(
+        '--playlist',
+        metavar='URL',
+        help="Process every video in a YouTube playlist"
+    )
+    source.add_argument(
+        '--resume',
+        action='store_true',
+        help="Resume jobs interrupted or failed in earlier runs"
+    )
+    parser.add_argument(
+        '-c', '--concurrency',
+        type=int,
+        help="Number of videos processed at once (default: MAX_CONCURRENT_VIDEOS)"
+    )
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        default=None,
+        help="Use the staged download/upload pipeline (default: PIPELINE_MODE)"
+    )
+    return parser.parse_args(argv)
+
 def main():
     """Main entry point."""
     global logger
     
+    args = parse_args()
+    exit_code = 0
+    
     try:
         # Initialize settings and logging
         settings = Settings()
         logger = setup_logging(settings)
         logger.info("Starting YouTube Video Manager...")
         
+        # Read the batch before connecting to any service so bad input fails fast
+        urls = None
+        if args.batch:
+            urls, priorities, invalid = normalize_video_urls(read_batch_input(args.batch))
+            for line in invalid:
+                logger.warning(f"Ignoring invalid YouTube URL: {line}")
+            logger.info(f"Loaded {len(urls)} unique videos ({len(invalid)} invalid lines)")
+            
         # Initialize processor once
         processor = VideoProcessor(settings)
         
         # Run the async event loop
-        asyncio.run(process_videos(processor))
+        try:
+            if urls is not None or args.playlist or args.resume:
+                started = time.monotonic()
+                if args.resume:
+                    batch = processor.resume_incomplete(
+                        max_workers=args.concurrency,
+                        pipeline=args.pipeline
+                    )
+                elif args.playlist:
+                    batch = processor.process_playlist(
+                        args.playlist,
+                        max_workers=args.concurrency,
+                        pipeline=args.pipeline
+                    )
+                else:
+                    batch = processor.process_batch(
+                        urls,
+                        max_workers=args.concurrency,
+                        pipeline=args.pipeline,
+                        priorities=priorities
+                    )
+                results = asyncio.run(batch)
+                print_summary(
+                    results,
+                    time.monotonic() - started,
+                    processor.bandwidth.stats(),
+                    processor.retention.stats()
+                )
+                if any(r['status'] == 'failed' for r in results):
+                    exit_code = 1
+            else:
+                asyncio.run(process_videos(processor))
+        finally:
+            processor.close()
         
     except Exception as e:
         print(f"\nFatal error: {str(e)}")
@@ -75,5 +241,7 @@ def main():
         if logger:
             logger.info("Application shutdown complete.")
 
+    sys.exit(exit_code)
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Settings refuses to load without these
+os.environ.setdefault("SPREADSHEET_ID", "test-spreadsheet")
+os.environ.setdefault("DRIVE_FOLDER_ID", "test-folder")
+
+from app.config.settings import Settings
+
+@pytest.fixture
+def settings(tmp_path: Path) -> Settings:
+    """Settings with every storage path inside a temporary directory."""
+    settings = Settings()
+    settings.STORAGE_DIR = tmp_path / "storage"
+    settings.VIDEO_DIR = settings.STORAGE_DIR / "videos"
+    settings.TEMP_DIR = settings.VIDEO_DIR / "temp"
+    settings.PROCESSED_DIR = settings.VIDEO_DIR / "processed"
+    settings.LOG_DIR = settings.STORAGE_DIR / "logs"
+    settings.CREDENTIALS_DIR = settings.STORAGE_DIR / "credentials"
+    settings.STATE_DIR = settings.STORAGE_DIR / "state"
+    settings.METADATA_CACHE_PATH = settings.STATE_DIR / "metadata_cache.db"
+    settings.JOB_DB_PATH = settings.STATE_DIR / "jobs.db"
+    settings.LEDGER_DB_PATH = settings.STATE_DIR / "ledger.db"
+    settings.RETENTION_DB_PATH = settings.STATE_DIR / "retention.db"
+    settings.SHEETS_JOURNAL_PATH = settings.STATE_DIR / "sheets_journal.jsonl"
+    settings.DRIVE_INDEX_PATH = settings.STATE_DIR / "drive_index.db"
+    settings.SHARED_CACHE_DIR = None
+    for path in (settings.TEMP_DIR, settings.PROCESSED_DIR, settings.LOG_DIR,
+                 settings.CREDENTIALS_DIR, settings.STATE_DIR):
+        path.mkdir(parents=True, exist_ok=True)
+    return settings
+
+def _fmt(format_id, ext, height=None, vcodec='none', acodec='none', tbr=1000):
+    return {
+        'format_id': format_id,
+        'url': f"https://example.invalid/{format_id}",
+        'ext': ext,
+        'protocol': 'https',
+        'height': height,
+        'vcodec': vcodec,
+        'acodec': acodec,
+        'tbr': tbr
+    }
+
+@pytest.fixture
+def video_info():
+    """Info dict of a video as extracted by yt-dlp, with a few formats."""
+    return {
+        'id': 'abcdefghijk',
+        'title': 'Test video',
+        'extractor': 'youtube',
+        'extractor_key': 'Youtube',
+        'webpage_url': 'https://www.youtube.com/watch?v=abcdefghijk',
+        'formats': [
+            _fmt('140', 'm4a', acodec='mp4a.40.2', tbr=128),
+            _fmt('251', 'webm', acodec='opus', tbr=160),
+            _fmt('137', 'mp4', height=1080, vcodec='avc1.640028', tbr=4000),
+            _fmt('313', 'webm', height=2160, vcodec='vp9', tbr=18000)
+        ]
+    }
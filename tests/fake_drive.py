@@ -0,0 +1,135 @@
+"""
+Local HTTP server speaking the Drive resumable upload protocol.
+"""
+
+import hashlib
+import itertools
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+_CONTENT_RANGE = re.compile(r'bytes (?:(\d+)-(\d+)|\*)/(\d+|\*)')
+
+class FakeDrive:
+    """
+    Drive stand-in holding upload sessions and finished files in memory.
+    
+    Sessions answer chunk PUTs with 308 and a Range header, or 200 with
+    the file resource once every byte has arrived, exactly like Drive.
+    """
+    
+    def __init__(self):
+        """Start the server on a free local port."""
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.requests: List[Dict[str, Any]] = []
+        self.expired = set()
+        self.expired_status = 404
+        self.corrupt = False
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        
+        drive = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+            
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            
+            def _reply(self, status: int, body: Optional[Dict[str, Any]] = None,
+                       headers: Optional[Dict[str, str]] = None) -> None:
+                payload = json.dumps(body).encode() if body is not None else b''
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def do_POST(self) -> None:
+                body = self._body()
+                with drive._lock:
+                    session = f"session-{next(drive._ids)}"
+                    drive.sessions[session] = {
+                        'metadata': json.loads(body or b'{}'),
+                        'data': bytearray()
+                    }
+                    drive.requests.append({'method': 'POST', 'path': self.path})
+                self._reply(200, headers={'Location': drive.url(f"/upload/{session}")})
+            
+            def do_PUT(self) -> None:
+                body = self._body()
+                session_id = urlparse(self.path).path.rsplit('/', 1)[-1]
+                match = _CONTENT_RANGE.match(self.headers.get('Content-Range', ''))
+                with drive._lock:
+                    drive.requests.append({
+                        'method': 'PUT',
+                        'path': self.path,
+                        'range': self.headers.get('Content-Range'),
+                        'length': len(body)
+                    })
+                    session = drive.sessions.get(session_id)
+                    if session is None or session_id in drive.expired:
+                        status = drive.expired_status
+                        self._reply(status, {'error': {'code': status, 'message': 'Session expired'}})
+                        return
+                    if 'file' in session:
+                        self._reply(200, session['file'])
+                        return
+                    if match and match.group(1) is not None:
+                        start = int(match.group(1))
+                        if start != len(session['data']):
+                            self._reply(400, {'error': {'code': 400, 'message': 'Bad offset'}})
+                            return
+                        session['data'] += body
+                    total = match.group(3) if match else '*'
+                    received = len(session['data'])
+                    if total != '*' and received == int(total):
+                        file_id = f"file-{next(drive._ids)}"
+                        data = bytes(session['data'])
+                        md5 = hashlib.md5(b'corrupt' if drive.corrupt else data).hexdigest()
+                        session['file'] = {'id': file_id, 'md5Checksum': md5}
+                        drive.files[file_id] = {'data': data, 'md5Checksum': md5,
+                                                'metadata': session['metadata']}
+                        self._reply(200, session['file'])
+                        return
+                headers = {'Range': f"bytes=0-{received - 1}"} if received else {}
+                self._reply(308, headers=headers)
+            
+            def do_GET(self) -> None:
+                file_id = urlparse(self.path).path.rsplit('/', 1)[-1]
+                with drive._lock:
+                    file = drive.files.get(file_id)
+                if file is None:
+                    self._reply(404, {'error': {'code': 404, 'message': 'Not found'}})
+                else:
+                    self._reply(200, {'id': file_id, 'md5Checksum': file['md5Checksum']})
+            
+            def do_DELETE(self) -> None:
+                file_id = urlparse(self.path).path.rsplit('/', 1)[-1]
+                with drive._lock:
+                    drive.files.pop(file_id, None)
+                self._reply(204)
+                
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+    
+    def url(self, path: str = '/') -> str:
+        """Absolute URL of a path on the server."""
+        return f"http://127.0.0.1:{self.server.server_port}{path}"
+    
+    def chunk_puts(self) -> List[Dict[str, Any]]:
+        """Chunk uploads received, excluding status queries."""
+        return [r for r in self.requests if r['method'] == 'PUT' and not r['range'].startswith('bytes */')]
+    
+    def close(self) -> None:
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
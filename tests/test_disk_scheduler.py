@@ -0,0 +1,85 @@
+"""
+Tests for DiskSpaceScheduler with a simulated amount of free space.
+"""
+
+import asyncio
+import os
+import shutil
+
+import pytest
+
+from app.core.disk_scheduler import DiskSpaceScheduler
+from app.utils.exceptions import DownloadError
+
+MB = 1024 * 1024
+
+class FakeDisk:
+    """Reports a settable amount of free space for every directory."""
+    
+    def __init__(self, free):
+        self.free = free
+    
+    def __call__(self, path):
+        return shutil._ntuple_diskusage(100 * self.free, 100 * self.free - self.free, self.free)
+
+@pytest.fixture
+def disk(monkeypatch):
+    fake = FakeDisk(10 * MB)
+    monkeypatch.setattr('app.core.disk_scheduler.shutil.disk_usage', fake)
+    return fake
+
+@pytest.fixture
+def scheduler(settings):
+    settings.DISK_MIN_FREE = 0
+    settings.DISK_MERGE_MARGIN = 0
+    settings.DISK_POLL_INTERVAL = 0.01
+    settings.DISK_WAIT_TIMEOUT = 5
+    return DiskSpaceScheduler(settings)
+
+def _write(settings, video_id, size):
+    path = settings.TEMP_DIR / f"Title_{video_id}.mp4.part"
+    with open(path, 'ab') as f:
+        f.write(os.urandom(size))
+    return path
+
+def test_written_bytes_no_longer_count_against_reservation(scheduler, disk, settings):
+    async def run():
+        async with scheduler.reserve('aaaaaaaaaaa', 8 * MB):
+            # Half of the first video is on disk and has left the free space
+            _write(settings, 'aaaaaaaaaaa', 4 * MB)
+            disk.free -= 4 * MB
+            assert scheduler.stats()['reserved'] == 4 * MB
+            
+            async with scheduler.reserve('bbbbbbbbbbb', 2 * MB):
+                assert scheduler.stats()['active'] == 2
+                
+    asyncio.run(asyncio.wait_for(run(), 1))
+
+def test_lone_download_waits_for_space_to_be_freed(scheduler, disk):
+    disk.free = 1 * MB
+    
+    async def run():
+        admitted = asyncio.ensure_future(_admit())
+        await asyncio.sleep(0.05)
+        assert not admitted.done()
+        disk.free = 20 * MB
+        await asyncio.wait_for(admitted, 1)
+    
+    async def _admit():
+        async with scheduler.reserve('aaaaaaaaaaa', 8 * MB):
+            pass
+            
+    asyncio.run(run())
+    assert scheduler.stats() == {'active': 0, 'waiting': 0, 'reserved': 0}
+
+def test_wait_gives_up_after_timeout(scheduler, disk, settings):
+    settings.DISK_WAIT_TIMEOUT = 0.1
+    disk.free = 1 * MB
+    
+    async def run():
+        async with scheduler.reserve('aaaaaaaaaaa', 8 * MB):
+            pass
+            
+    with pytest.raises(DownloadError):
+        asyncio.run(run())
+    assert scheduler.stats()['waiting'] == 0
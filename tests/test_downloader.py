@@ -0,0 +1,82 @@
+"""
+Tests for YouTubeDownloader's use of the shared media cache.
+"""
+
+import pytest
+
+from app.core.downloader import YouTubeDownloader
+
+class FakeFetch:
+    """Stands in for _fetch_video, reporting a chosen downloaded format."""
+    
+    def __init__(self, processed_dir):
+        self.processed_dir = processed_dir
+        self.downloaded = None
+        self.calls = 0
+    
+    def __call__(self, video_url, metadata, progress_callback=None, format_plan=None, priority=1.0):
+        self.calls += 1
+        path = self.processed_dir / f"{metadata['id']}-{self.calls}.mp4"
+        path.write_bytes(b'video')
+        return path, self.downloaded
+
+@pytest.fixture
+def downloader(settings, tmp_path):
+    settings.FFMPEG_PATH = tmp_path / 'ffmpeg'
+    settings.FFPROBE_PATH = tmp_path / 'ffprobe'
+    settings.FFMPEG_PATH.touch()
+    settings.FFPROBE_PATH.touch()
+    settings.SHARED_CACHE_DIR = tmp_path / 'shared'
+    settings.SHARED_CACHE_POLL_INTERVAL = 0.01
+    downloader = YouTubeDownloader(settings)
+    yield downloader
+    downloader.close()
+
+@pytest.fixture
+def fetch(downloader, monkeypatch):
+    fake = FakeFetch(downloader.settings.PROCESSED_DIR)
+    monkeypatch.setattr(downloader, '_fetch_video', fake)
+    return fake
+
+def _download(downloader, video_info, plan=None):
+    downloader._remember_extraction(dict(video_info))
+    metadata = {'id': video_info['id'], 'title': video_info['title']}
+    return downloader._download_video(video_info['webpage_url'], metadata, format_plan=plan)
+
+def test_entry_is_keyed_by_selected_formats(downloader, fetch, video_info):
+    fetch.downloaded = '313+251'
+    
+    _download(downloader, video_info)
+    
+    cache = downloader.shared_cache
+    assert cache.entry_path(video_info['id'], '313+251').is_file()
+    assert not cache.entry_path(video_info['id'], 'default').exists()
+
+def test_planned_formats_are_served_from_cache(downloader, fetch, video_info):
+    plan = {'format': '137+140', 'container': 'mp4'}
+    fetch.downloaded = '137+140'
+    
+    _download(downloader, video_info, plan)
+    _download(downloader, video_info, plan)
+    
+    assert fetch.calls == 1
+    assert downloader.shared_cache.stats()['hits'] == 1
+
+def test_other_formats_are_not_served_from_cache(downloader, fetch, video_info):
+    fetch.downloaded = '137+140'
+    _download(downloader, video_info, {'format': '137+140', 'container': 'mp4'})
+    
+    fetch.downloaded = '313+251'
+    _download(downloader, video_info)
+    
+    assert fetch.calls == 2
+
+def test_entry_uses_format_actually_downloaded(downloader, fetch, video_info):
+    # yt-dlp fell back to other streams than the resolved ones
+    fetch.downloaded = '137+251'
+    
+    _download(downloader, video_info, {'format': '137+140', 'container': 'mp4'})
+    
+    cache = downloader.shared_cache
+    assert cache.entry_path(video_info['id'], '137+251').is_file()
+    assert not cache.entry_path(video_info['id'], '137+140').exists()
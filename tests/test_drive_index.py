@@ -0,0 +1,188 @@
+"""
+Tests for DriveFolderIndex against an in-memory fake Drive service.
+"""
+
+import sqlite3
+
+import pytest
+
+from app.services.drive_index import DriveFolderIndex
+
+class _Call:
+    def __init__(self, result):
+        self.result = result
+    
+    def execute(self):
+        return self.result
+
+class FakeDriveService:
+    """Just enough of the Drive v3 files and changes resources for the index."""
+    
+    def __init__(self):
+        self.files_by_id = {}
+        self.changes_log = []
+        self.list_calls = 0
+        self.change_calls = 0
+    
+    def add(self, file_id, folder, size=100, md5='m', video_id=None, record=True):
+        file = {
+            'id': file_id,
+            'name': f"{file_id}.mp4",
+            'size': str(size),
+            'md5Checksum': md5,
+            'parents': [folder],
+            'trashed': False,
+            'appProperties': {'video_id': video_id} if video_id else {}
+        }
+        self.files_by_id[file_id] = file
+        if record:
+            self.changes_log.append({'fileId': file_id, 'removed': False, 'file': dict(file)})
+        return file
+    
+    def change(self, file_id, removed=False, **fields):
+        file = self.files_by_id.get(file_id)
+        if file is not None:
+            file.update(fields)
+        self.changes_log.append({
+            'fileId': file_id,
+            'removed': removed,
+            'file': None if removed else dict(file)
+        })
+    
+    def files(self):
+        return self
+    
+    def changes(self):
+        return self
+    
+    def getStartPageToken(self):
+        return _Call({'startPageToken': str(len(self.changes_log))})
+    
+    def list(self, q=None, fields=None, pageSize=None, pageToken=None):
+        if q is not None:
+            self.list_calls += 1
+            folder = q.split("'")[1]
+            files = [f for f in self.files_by_id.values() if folder in f['parents'] and not f['trashed']]
+            # Two files per page to exercise paging
+            start = int(pageToken or 0)
+            response = {'files': [dict(f) for f in files[start:start + 2]]}
+            if start + 2 < len(files):
+                response['nextPageToken'] = str(start + 2)
+            return _Call(response)
+            
+        self.change_calls += 1
+        start = int(pageToken)
+        return _Call({
+            'changes': self.changes_log[start:],
+            'newStartPageToken': str(len(self.changes_log))
+        })
+
+@pytest.fixture
+def drive():
+    return FakeDriveService()
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / 'drive_index.db'
+
+def _index(db_path, folder='A'):
+    return DriveFolderIndex(db_path, folder, refresh_interval=3600)
+
+def test_first_refresh_lists_whole_folder(drive, db_path):
+    for n in range(5):
+        drive.add(f"f{n}", 'A', md5=f"m{n}", record=False)
+    drive.add('other', 'B', md5='m0', record=False)
+    index = _index(db_path)
+    
+    index.refresh(drive)
+    
+    assert drive.list_calls == 3
+    assert [index.find(100, f"m{n}") for n in range(5)] == [f"f{n}" for n in range(5)]
+    assert index.find(100, 'm0') == 'f0'
+    assert index.find(101, 'm0') is None
+
+def test_refresh_is_rate_limited(drive, db_path):
+    index = _index(db_path)
+    index.refresh(drive)
+    index.refresh(drive)
+    assert drive.change_calls == 0
+    
+    index.refresh(drive, force=True)
+    assert drive.change_calls == 1
+    assert drive.list_calls == 1
+
+def test_changes_feed_updates_index(drive, db_path):
+    for file_id in ('kept', 'removed', 'trashed', 'moved'):
+        drive.add(file_id, 'A', md5=file_id, record=False)
+    index = _index(db_path)
+    index.refresh(drive)
+    listed = drive.list_calls
+    
+    drive.change('removed', removed=True)
+    drive.change('trashed', trashed=True)
+    drive.change('moved', parents=['B'])
+    drive.add('new', 'A', md5='new')
+    drive.add('elsewhere', 'B', md5='elsewhere')
+    index.refresh(drive, force=True)
+    
+    assert index.find(100, 'kept') == 'kept'
+    assert index.find(100, 'new') == 'new'
+    for md5 in ('removed', 'trashed', 'moved', 'elsewhere'):
+        assert index.find(100, md5) is None
+    assert drive.list_calls == listed
+
+def test_folders_keep_their_own_rows(drive, db_path):
+    drive.add('a1', 'A', md5='shared', record=False)
+    drive.add('b1', 'B', md5='shared', record=False)
+    
+    index = _index(db_path, 'A')
+    index.refresh(drive)
+    index.close()
+    
+    index = _index(db_path, 'B')
+    index.refresh(drive)
+    assert index.find(100, 'shared') == 'b1'
+    index.close()
+    
+    # Switching back continues from A's token with A's rows intact
+    index = _index(db_path, 'A')
+    index.refresh(drive)
+    assert index.find(100, 'shared') == 'a1'
+    assert drive.list_calls == 2
+    assert drive.change_calls == 1
+
+def test_index_without_folder_column_is_rebuilt(drive, db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE drive_files (file_id TEXT PRIMARY KEY, name TEXT, size INTEGER, md5 TEXT, video_id TEXT)"
+    )
+    conn.execute("CREATE TABLE drive_index_state (folder_id TEXT PRIMARY KEY, page_token TEXT)")
+    conn.execute("INSERT INTO drive_files VALUES ('gone', 'gone.mp4', 100, 'old', NULL)")
+    conn.execute("INSERT INTO drive_index_state VALUES ('A', '0')")
+    conn.commit()
+    conn.close()
+    drive.add('a1', 'A', md5='m', record=False)
+    
+    index = _index(db_path)
+    index.refresh(drive)
+    
+    assert drive.list_calls == 1
+    assert index.find(100, 'm') == 'a1'
+    assert index.find(100, 'old') is None
+
+def test_find_prefers_file_tagged_with_video(drive, db_path):
+    drive.add('plain', 'A', md5='same', record=False)
+    drive.add('tagged', 'A', md5='same', video_id='vid', record=False)
+    index = _index(db_path)
+    index.refresh(drive)
+    
+    assert index.find(100, 'same', 'vid') == 'tagged'
+    assert index.find(100, 'same', 'other') in ('plain', 'tagged')
+
+def test_added_upload_is_found_before_change_feed(drive, db_path):
+    index = _index(db_path)
+    index.refresh(drive)
+    
+    index.add('up', 'up.mp4', 200, 'md5', 'vid')
+    
+    assert index.find(200, 'md5', 'vid') == 'up'
@@ -0,0 +1,97 @@
+"""
+Tests for resumable uploads in GoogleDriveService against a local fake Drive.
+"""
+
+import asyncio
+import functools
+import hashlib
+import os
+
+import pytest
+from google.auth.credentials import AnonymousCredentials
+
+import app.services.google_drive as google_drive
+from app.services.google_drive import GoogleDriveService
+from tests.fake_drive import FakeDrive
+
+CHUNK = 256 * 1024
+
+@pytest.fixture
+def drive():
+    fake = FakeDrive()
+    yield fake
+    fake.close()
+
+def _local_http(build_http):
+    """Wrap build_http so the https upload URLs of the discovery document reach the fake."""
+    def build():
+        http = build_http()
+        request = http.request
+        http.request = lambda uri, *args, **kwargs: request(
+            uri.replace('https://127.0.0.1', 'http://127.0.0.1'), *args, **kwargs
+        )
+        return http
+    return build
+
+@pytest.fixture
+def service(settings, drive, monkeypatch):
+    monkeypatch.setattr(
+        google_drive.Credentials,
+        'from_service_account_file',
+        lambda *args, **kwargs: AnonymousCredentials()
+    )
+    monkeypatch.setattr(
+        google_drive,
+        'build',
+        functools.partial(google_drive.build, client_options={'api_endpoint': drive.url('/drive/v3/')})
+    )
+    monkeypatch.setattr(google_drive, 'build_http', _local_http(google_drive.build_http))
+    settings.CHUNK_SIZE = CHUNK
+    settings.UPLOAD_CHUNK_MIN = CHUNK
+    settings.UPLOAD_CHUNK_MAX = CHUNK
+    settings.DRIVE_DEDUPLICATE = False
+    settings.MAX_RETRIES = 0
+    service = GoogleDriveService(settings)
+    yield service
+    service.close()
+
+def _video(tmp_path, size):
+    path = tmp_path / 'video.mp4'
+    path.write_bytes(os.urandom(size))
+    return path, hashlib.md5(path.read_bytes()).hexdigest()
+
+def test_multi_chunk_upload_follows_308_responses(service, drive, tmp_path):
+    path, md5 = _video(tmp_path, 4 * CHUNK + 1000)
+    progress = []
+    
+    file_id = asyncio.run(service.upload_file(path, progress_callback=progress.append, md5=md5))
+    
+    assert drive.files[file_id]['data'] == path.read_bytes()
+    assert [put['length'] for put in drive.chunk_puts()] == [CHUNK] * 4 + [1000]
+    assert progress and progress == sorted(progress)
+    assert not service.sessions.state_path(path).exists()
+
+def test_interrupted_upload_resumes_from_saved_session(service, drive, tmp_path):
+    path, md5 = _video(tmp_path, 3 * CHUNK + 10)
+    data = path.read_bytes()
+    
+    # A previous run sent the first two chunks before dying
+    drive.sessions['session-old'] = {'metadata': {}, 'data': bytearray(data[:2 * CHUNK])}
+    service.sessions.save(path, drive.url('/upload/session-old'), 2 * CHUNK)
+    
+    file_id = asyncio.run(service.upload_file(path, md5=md5))
+    
+    assert drive.files[file_id]['data'] == data
+    assert [put['length'] for put in drive.chunk_puts()] == [CHUNK, 10]
+    assert not any(request['method'] == 'POST' for request in drive.requests)
+
+def test_expired_session_starts_over(service, drive, tmp_path):
+    path, md5 = _video(tmp_path, CHUNK + 10)
+    drive.sessions['session-old'] = {'metadata': {}, 'data': bytearray(path.read_bytes()[:CHUNK])}
+    drive.expired.add('session-old')
+    service.sessions.save(path, drive.url('/upload/session-old'), CHUNK)
+    
+    file_id = asyncio.run(service.upload_file(path, md5=md5))
+    
+    assert drive.files[file_id]['data'] == path.read_bytes()
+    assert sum(request['method'] == 'POST' for request in drive.requests) == 1
@@ -0,0 +1,24 @@
+"""
+Tests for batch input parsing helpers.
+"""
+
+from app.utils.helpers import normalize_video_urls
+
+def test_batch_lines_carry_optional_weights():
+    urls, priorities, invalid = normalize_video_urls([
+        '# comment',
+        'https://youtu.be/abcdefghijk 3',
+        'bcdefghijkl',
+        '',
+        'https://www.youtube.com/watch?v=abcdefghijk 0.5',
+        'cdefghijklm 0',
+        'defghijklmn fast',
+        'efghijklmno 1 2'
+    ])
+    
+    assert urls == [
+        'https://www.youtube.com/watch?v=abcdefghijk',
+        'https://www.youtube.com/watch?v=bcdefghijkl'
+    ]
+    assert priorities == {'https://www.youtube.com/watch?v=abcdefghijk': 3.0}
+    assert invalid == ['cdefghijklm 0', 'defghijklmn fast', 'efghijklmno 1 2']
@@ -0,0 +1,23 @@
+"""
+Tests for JobStore's view of unfinished jobs.
+"""
+
+from app.core.job_store import STAGES, JobStore
+
+def test_old_failures_drop_out_of_incomplete_when_asked(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('app.core.job_store.time.time', lambda: now[0])
+    jobs = JobStore(tmp_path / 'jobs.db')
+    for video_id in ('interrupted', 'old_failure', 'new_failure', 'finished'):
+        jobs.start(video_id, f"https://youtu.be/{video_id}")
+    jobs.fail('old_failure', 'boom')
+    jobs.advance('finished', STAGES[-1])
+    
+    now[0] += 500
+    jobs.fail('new_failure', 'boom')
+    
+    def ids(**kwargs):
+        return [job['video_id'] for job in jobs.incomplete(**kwargs)]
+        
+    assert ids() == ['interrupted', 'old_failure', 'new_failure']
+    assert ids(failed_since=1200.0) == ['interrupted', 'new_failure']
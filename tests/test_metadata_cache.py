@@ -0,0 +1,81 @@
+"""
+Tests for MetadataCache expiry, eviction and use from get_video_info.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.downloader import YouTubeDownloader
+from app.core.metadata_cache import MetadataCache
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / 'metadata_cache.db'
+
+def _rows(cache):
+    return cache._conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+
+def test_expired_entries_are_swept_once_per_interval(db_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('app.core.metadata_cache.time.time', lambda: now[0])
+    cache = MetadataCache(db_path, ttl=10, expire_interval=3600)
+    cache.put('a', {'id': 'a'})
+    
+    now[0] += 20
+    cache.put('b', {'id': 'b'})
+    # Not swept yet, but never served
+    assert _rows(cache) == 2
+    assert cache.get('a') is None
+    assert cache.get('b') == {'id': 'b'}
+    
+    cache._next_expiry = 0
+    now[0] += 20
+    cache.put('c', {'id': 'c'})
+    assert _rows(cache) == 1
+    assert cache.stats()['entries'] == 1
+
+def test_least_recently_used_entries_are_evicted(db_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('app.core.metadata_cache.time.time', lambda: now[0])
+    cache = MetadataCache(db_path, ttl=3600, max_entries=40)
+    for n in range(40):
+        now[0] += 1
+        cache.put(f"v{n}", {'n': n})
+    now[0] += 1
+    cache.get('v0')
+    
+    for n in range(40, 79):
+        now[0] += 1
+        cache.put(f"v{n}", {'n': n})
+        
+    assert cache.get('v0') == {'n': 0}
+    assert cache.get('v1') is None
+    assert cache.stats()['entries'] == _rows(cache) == 40
+    cache.close()
+    
+    # Totals are recounted when the database is reopened
+    assert MetadataCache(db_path, ttl=3600).stats()['entries'] == 40
+
+def test_get_video_info_uses_cache_off_the_event_loop(settings, tmp_path):
+    settings.FFMPEG_PATH = tmp_path / 'ffmpeg'
+    settings.FFPROBE_PATH = tmp_path / 'ffprobe'
+    settings.FFMPEG_PATH.touch()
+    settings.FFPROBE_PATH.touch()
+    downloader = YouTubeDownloader(settings)
+    cache = downloader.metadata_cache
+    cache.put('abcdefghijk', {'id': 'abcdefghijk'})
+    
+    threads = []
+    get = cache.get
+    cache.get = lambda video_id: threads.append(threading.current_thread()) or get(video_id)
+    
+    async def run():
+        return await downloader.get_video_info('https://www.youtube.com/watch?v=abcdefghijk')
+        
+    try:
+        assert asyncio.run(run()) == {'id': 'abcdefghijk'}
+    finally:
+        downloader.close()
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,146 @@
+"""
+Tests for RangedDownloader against a local HTTP server.
+"""
+
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.ranged_downloader import RangedDownloader
+from app.utils.exceptions import DownloadError
+
+BLOB = os.urandom(100 * 1024 + 123)
+SEGMENT = 16 * 1024
+
+class MediaServer:
+    """Serves BLOB, honouring Range unless told otherwise."""
+    
+    def __init__(self):
+        self.honour_ranges = True
+        self.cut_once = set()
+        self.served = 0
+        self.requests = []
+        self._lock = threading.Lock()
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def log_message(self, *args):
+                pass
+            
+            def do_GET(self):
+                match = re.match(r'bytes=(\d+)-(\d+)', self.headers.get('Range') or '')
+                with server._lock:
+                    server.requests.append(self.headers.get('Range'))
+                if match and server.honour_ranges:
+                    first, last = int(match.group(1)), min(int(match.group(2)), len(BLOB) - 1)
+                    body = BLOB[first:last + 1]
+                    self.send_response(206)
+                    self.send_header('Content-Range', f"bytes {first}-{last}/{len(BLOB)}")
+                else:
+                    first, body = 0, BLOB
+                    self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                
+                with server._lock:
+                    cut = first in server.cut_once and len(body) > 1
+                    if cut:
+                        server.cut_once.discard(first)
+                if cut:
+                    # Drop the connection halfway through the body
+                    body = body[:len(body) // 2]
+                self.wfile.write(body)
+                with server._lock:
+                    server.served += len(body)
+                self.close_connection = True
+                
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/video"
+    
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+@pytest.fixture
+def server():
+    server = MediaServer()
+    yield server
+    server.close()
+
+@pytest.fixture
+def downloader(monkeypatch):
+    monkeypatch.setattr('app.core.ranged_downloader.time.sleep', lambda seconds: None)
+    return RangedDownloader(connections=4, segment_size=SEGMENT, retries=3,
+                            block_size=1024, checkpoint_bytes=4096)
+
+def test_ranged_download(server, downloader, tmp_path):
+    dest = tmp_path / 'video.mp4'
+    progress = []
+    
+    size = downloader.download(server.url, dest, progress_callback=lambda done, total: progress.append(done))
+    
+    assert size == len(BLOB)
+    assert dest.read_bytes() == BLOB
+    assert progress[-1] == len(BLOB)
+    assert sum(1 for r in server.requests if r and r != 'bytes=0-0') == -(-len(BLOB) // SEGMENT)
+    assert not downloader.state_path(dest).exists()
+
+def test_server_ignoring_range_is_read_whole(server, downloader, tmp_path):
+    server.honour_ranges = False
+    dest = tmp_path / 'video.mp4'
+    
+    assert downloader.probe(server.url) == (len(BLOB), False)
+    assert downloader.download(server.url, dest) == len(BLOB)
+    assert dest.read_bytes() == BLOB
+
+def test_range_cut_short_is_retried_from_last_byte(server, downloader, tmp_path):
+    server.cut_once = {SEGMENT, 3 * SEGMENT}
+    dest = tmp_path / 'video.mp4'
+    
+    downloader.download(server.url, dest)
+    
+    assert dest.read_bytes() == BLOB
+    # Each cut range continued where the connection dropped
+    assert f"bytes={SEGMENT + SEGMENT // 2}-{2 * SEGMENT - 1}" in server.requests
+    assert server.served == len(BLOB) + 1
+
+def test_range_failing_every_attempt_fails_download(server, downloader, tmp_path):
+    dest = tmp_path / 'video.mp4'
+    downloader.retries = 1
+    server.cut_once = {0}
+    
+    with pytest.raises(DownloadError):
+        downloader.download(server.url, dest)
+    assert downloader.state_path(dest).exists()
+
+def test_resume_from_ranges_sidecar(server, downloader, tmp_path):
+    dest = tmp_path / 'video.mp4'
+    # An earlier run finished the first range and half of the second
+    positions = {0: SEGMENT, SEGMENT: SEGMENT + SEGMENT // 2}
+    with open(dest, 'wb') as f:
+        f.truncate(len(BLOB))
+        f.write(BLOB[:SEGMENT + SEGMENT // 2])
+    downloader.state_path(dest).write_text(json.dumps({'total': len(BLOB), 'positions': positions}))
+    
+    downloader.download(server.url, dest)
+    
+    assert dest.read_bytes() == BLOB
+    assert server.served == len(BLOB) - (SEGMENT + SEGMENT // 2) + 1
+    assert f"bytes=0-{SEGMENT - 1}" not in server.requests
+    assert not downloader.state_path(dest).exists()
+
+def test_finished_file_is_not_downloaded_again(server, downloader, tmp_path):
+    dest = tmp_path / 'video.mp4'
+    dest.write_bytes(BLOB)
+    
+    downloader.download(server.url, dest)
+    
+    assert server.requests == ['bytes=0-0']
@@ -0,0 +1,115 @@
+"""
+Tests for SharedMediaCache in a temporary directory.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from app.core.shared_cache import SharedMediaCache
+
+@pytest.fixture
+def cache(tmp_path):
+    return SharedMediaCache(tmp_path / 'cache', stale_after=5, poll_interval=0.01)
+
+def _lock_path(cache, video_id='vid', video_format='137+140'):
+    entry = cache.entry_path(video_id, video_format)
+    return entry.with_name(entry.name + '.lock')
+
+def _make_stale(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('dead-host:1')
+    old = time.time() - 3600
+    os.utime(path, (old, old))
+
+def test_store_then_fetch(cache, tmp_path):
+    source = tmp_path / 'video.mp4'
+    source.write_bytes(b'video')
+    dest = tmp_path / 'out' / 'video.mp4'
+    
+    assert not cache.fetch('vid', '137+140', dest)
+    cache.store('vid', '137+140', source)
+    
+    assert cache.fetch('vid', '137+140', dest)
+    assert dest.read_bytes() == b'video'
+    assert not cache.fetch('vid', '313+251', dest)
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'stores': 1}
+
+def test_second_worker_waits_and_reuses_download(tmp_path):
+    downloads = []
+    
+    def worker(name):
+        cache = SharedMediaCache(tmp_path / 'cache', stale_after=5, poll_interval=0.01)
+        dest = tmp_path / name / 'video.mp4'
+        with cache.lock('vid', '137+140'):
+            if cache.fetch('vid', '137+140', dest):
+                return
+            time.sleep(0.1)
+            dest.parent.mkdir(parents=True)
+            dest.write_bytes(b'video')
+            downloads.append(name)
+            cache.store('vid', '137+140', dest)
+            
+    threads = [threading.Thread(target=worker, args=(name,)) for name in ('a', 'b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+        
+    assert len(downloads) == 1
+    assert (tmp_path / 'a' / 'video.mp4').read_bytes() == (tmp_path / 'b' / 'video.mp4').read_bytes()
+
+def test_stale_lock_is_broken(cache):
+    lock_path = _lock_path(cache)
+    _make_stale(lock_path)
+    
+    with cache.lock('vid', '137+140'):
+        assert lock_path.read_text() != 'dead-host:1'
+    assert not lock_path.exists()
+
+def test_stale_lock_is_taken_by_only_one_waiter(cache):
+    _make_stale(_lock_path(cache))
+    start = threading.Barrier(8)
+    holders = []
+    overlaps = []
+    
+    def waiter():
+        start.wait()
+        with cache.lock('vid', '137+140'):
+            holders.append(threading.get_ident())
+            if len(holders) > 1:
+                overlaps.append(len(holders))
+            time.sleep(0.02)
+            holders.remove(threading.get_ident())
+            
+    threads = [threading.Thread(target=waiter) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+        
+    assert overlaps == []
+
+def test_fresh_lock_taken_meanwhile_is_put_back(cache):
+    lock_path = _lock_path(cache)
+    lock_path.parent.mkdir(parents=True)
+    lock_path.write_text('live-host:2')
+    inode = lock_path.stat().st_ino
+    
+    # A waiter that saw an older, stale lock file at the same path
+    cache._break_lock(lock_path, inode + 1, 3600)
+    
+    assert lock_path.stat().st_ino == inode
+    assert lock_path.read_text() == 'live-host:2'
+    assert list(lock_path.parent.glob('*.broken')) == []
+
+def test_release_keeps_lock_of_another_holder(cache):
+    lock_path = _lock_path(cache)
+    with cache.lock('vid', '137+140'):
+        # Lock wrongly broken and taken over by another host while held
+        lock_path.unlink()
+        lock_path.write_text('other-host:3')
+        
+    assert lock_path.read_text() == 'other-host:3'
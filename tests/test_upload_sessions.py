@@ -0,0 +1,72 @@
+"""
+Tests for UploadSessionStore against a local fake Drive.
+"""
+
+import os
+
+import pytest
+from googleapiclient.http import build_http
+
+from app.services.upload_sessions import UploadSessionStore
+from app.utils.exceptions import GoogleDriveError
+from tests.fake_drive import FakeDrive
+
+@pytest.fixture
+def drive():
+    fake = FakeDrive()
+    yield fake
+    fake.close()
+
+@pytest.fixture
+def store():
+    return UploadSessionStore()
+
+def test_query_returns_offset_from_range_header(drive, store):
+    drive.sessions['s'] = {'metadata': {}, 'data': bytearray(1000)}
+    
+    assert store.query(build_http(), drive.url('/upload/s'), 5000) == (1000, None)
+
+def test_query_without_range_header_restarts_at_zero(drive, store):
+    drive.sessions['s'] = {'metadata': {}, 'data': bytearray()}
+    
+    assert store.query(build_http(), drive.url('/upload/s'), 5000) == (0, None)
+
+@pytest.mark.parametrize('status', [404, 410])
+def test_query_reports_expired_session(drive, store, status):
+    drive.sessions['s'] = {'metadata': {}, 'data': bytearray(1000)}
+    drive.expired.add('s')
+    drive.expired_status = status
+    
+    assert store.query(build_http(), drive.url('/upload/s'), 5000) == (None, None)
+
+def test_query_returns_resource_of_finished_upload(drive, store):
+    drive.sessions['s'] = {'metadata': {}, 'data': bytearray(), 'file': {'id': 'f1', 'md5Checksum': 'abc'}}
+    
+    assert store.query(build_http(), drive.url('/upload/s'), 5000) == (5000, {'id': 'f1', 'md5Checksum': 'abc'})
+
+def test_query_rejects_unexpected_status(drive, store):
+    drive.expired.add('s')
+    drive.expired_status = 500
+    drive.sessions['s'] = {'metadata': {}, 'data': bytearray()}
+    
+    with pytest.raises(GoogleDriveError):
+        store.query(build_http(), drive.url('/upload/s'), 5000)
+
+def test_saved_session_is_loaded(tmp_path, store):
+    path = tmp_path / 'video.mp4'
+    path.write_bytes(b'x' * 100)
+    store.save(path, 'https://upload/s', 50)
+    
+    state = store.load(path)
+    
+    assert (state['uri'], state['offset']) == ('https://upload/s', 50)
+
+def test_session_of_changed_file_is_discarded(tmp_path, store):
+    path = tmp_path / 'video.mp4'
+    path.write_bytes(b'x' * 100)
+    store.save(path, 'https://upload/s', 50)
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    
+    assert store.load(path) is None
+    assert not store.state_path(path).exists()
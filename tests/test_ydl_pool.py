@@ -0,0 +1,35 @@
+"""
+Tests for YoutubeDLPool.
+"""
+
+import pytest
+
+from app.core.ydl_pool import YoutubeDLPool
+
+@pytest.fixture
+def pool():
+    pool = YoutubeDLPool(lambda: {
+        'format': 'bestvideo*+bestaudio/best',
+        'quiet': True,
+        'no_warnings': True,
+        'outtmpl': '%(id)s.%(ext)s'
+    })
+    yield pool
+    pool.close()
+
+def _selected(ydl, info):
+    return ydl.process_ie_result(dict(info), download=False)['format_id']
+
+def test_job_format_is_used_for_selection(pool, video_info):
+    with pool.acquire(params={'format': '137+140'}) as ydl:
+        assert _selected(ydl, video_info) == '137+140'
+
+def test_base_format_is_restored_after_release(pool, video_info):
+    with pool.acquire() as ydl:
+        default = _selected(ydl, video_info)
+    with pool.acquire(params={'format': '137+251'}) as ydl:
+        assert _selected(ydl, video_info) == '137+251'
+    with pool.acquire() as ydl:
+        assert _selected(ydl, video_info) == default
+        assert ydl.params['format'] == 'bestvideo*+bestaudio/best'
+    assert default == '313+251'